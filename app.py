@@ -7,23 +7,28 @@ Streamlit tabanlı kullanıcı arayüzü.
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-import io
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
+from dataclasses import replace
 
 # Yerel modüller
-from models import Ayarlar, Personel, EslesmeTercihi, AylikPlan, Alan, KidemGrubu, VardiyaTipi, HAZIR_VARDIYALAR
+from models import Ayarlar, AylikPlan, VardiyaTipi, HAZIR_VARDIYALAR
 from utils import (
     ay_gun_sayisi, resmi_tatiller, gun_parse, 
-    hafta_gunu_adi, tum_hafta_gunleri, hafta_gunu_numarasi
+    hafta_gunu_adi, tum_hafta_gunleri
 )
 from storage import (
-    ayarlari_kaydet, ayarlari_yukle_veya_varsayilan,
+    ayarlari_kaydet, ayarlari_ertelenmis_kaydet, ayarlari_yukle_veya_varsayilan,
     aylik_plani_kaydet, aylik_plani_yukle_veya_yeni,
     kayitli_planlari_listele, ayarlari_json_olarak_export,
-    ayarlari_json_dan_import
+    ayarlari_json_dan_import, ipucu_plani_bul, aylik_plani_yukle,
+    onbellekten_oku, onbellege_yaz
 )
-from solver import NobetSolver, SolverInput, SolverConfig, AlanTanimi, VardiyaTanimi, cozum_bulunamadi_teshis
+from solver import (
+    NobetSolver, cozum_bulunamadi_teshis,
+    girdi_parmak_izi
+)
+from ayristirma import ayristirarak_coz, bilesenleri_bul
+from cikti import cizelge_satirlari, xlsx_bayt
+from girdi import ARAC_SURE_POLITIKASI, config_olustur, durumdan_ayarlar, durumdan_aylik_plan, solver_input_olustur
 
 # Demo senaryo modülü
 from streamlit_integration import (
@@ -104,8 +109,14 @@ def init_session_state():
         return
     
     if "initialized" not in st.session_state:
-        # Kayıtlı ayarları yükle
-        ayarlar = ayarlari_yukle_veya_varsayilan()
+        # Kayıtlı ayarları yükle; okunamazsa varsayılanlarla açılır ama otomatik
+        # kayıt kapalı kalır (bozuk kaydın üzerine varsayılanlar yazılmasın)
+        try:
+            ayarlar = ayarlari_yukle_veya_varsayilan()
+            st.session_state.pop("_ayar_yukleme_hatasi", None)
+        except Exception as e:
+            ayarlar = Ayarlar()
+            st.session_state["_ayar_yukleme_hatasi"] = str(e)
         
         # Personel listesi
         if ayarlar.personeller:
@@ -162,10 +173,11 @@ def init_session_state():
         
         # Aşama 1: Alanlar
         st.session_state["alanlar"] = [
-            {"isim": a.isim, "kontenjan": a.gunluk_kontenjan, "max_kontenjan": a.max_kontenjan, "renk": a.renk}
+            {"isim": a.isim, "kontenjan": a.gunluk_kontenjan, "max_kontenjan": a.max_kontenjan, "renk": a.renk,
+             "kidem_kurallari": a.kidem_kurallari, "vardiya_tipleri": a.vardiya_tipleri}
             for a in ayarlar.alanlar
         ] if ayarlar.alanlar else []
-        st.session_state["alan_modu_aktif"] = len(st.session_state["alanlar"]) > 0
+        st.session_state["alan_modu_aktif"] = any(a.aktif for a in ayarlar.alanlar)
         st.session_state["alan_bazli_denklik"] = ayarlar.alan_bazli_denklik
         
         # Personel alan yetkinlikleri
@@ -177,7 +189,8 @@ def init_session_state():
         
         # Kıdem grupları
         st.session_state["kidem_gruplari"] = [
-            {"isim": k.isim, "renk": k.renk, "varsayilan_hedef": k.varsayilan_hedef}
+            {"isim": k.isim, "renk": k.renk, "varsayilan_hedef": k.varsayilan_hedef,
+             "vardiya_hedefleri": k.vardiya_hedefleri}
             for k in ayarlar.kidem_gruplari
         ] if ayarlar.kidem_gruplari else []
         
@@ -219,93 +232,72 @@ def init_session_state():
 
 def session_to_ayarlar() -> Ayarlar:
     """Session state'ten Ayarlar nesnesi oluşturur"""
-    personeller = []
-    for isim in st.session_state.get("personel_list", []):
-        personeller.append(Personel(
-            isim=isim,
-            hedef_nobet=st.session_state.get("personel_targets", {}).get(isim),
-            bloklu_gunler=st.session_state.get("weekday_block_map", {}).get(isim, []),
-            calisabilir_alanlar=st.session_state.get("personel_alan_yetkinlikleri", {}).get(isim, []),
-            kidem_grubu=st.session_state.get("personel_kidem_gruplari", {}).get(isim),
-            calisabilir_vardiyalar=st.session_state.get("personel_vardiya_kisitlari", {}).get(isim, [])
-        ))
-    
-    birlikte_tutma = [
-        EslesmeTercihi(
-            personel_a=item["a"],
-            personel_b=item["b"],
-            min_birlikte=item.get("min", 0)
-        )
-        for item in st.session_state.get("want_pairs_list", [])
-    ]
-    
-    ayri_tutma = [
-        EslesmeTercihi(personel_a=item["a"], personel_b=item["b"])
-        for item in st.session_state.get("no_pairs_list", [])
-    ]
-    
-    esnek_ayri_tutma = [
-        EslesmeTercihi(personel_a=item["a"], personel_b=item["b"], zorunlu=False)
-        for item in st.session_state.get("soft_no_pairs_list", [])
-    ]
-    
-    # Alanlar
-    alanlar = [
-        Alan(
-            isim=a["isim"],
-            gunluk_kontenjan=a.get("kontenjan", 1),
-            max_kontenjan=a.get("max_kontenjan"),
-            renk=a.get("renk", "#808080"),
-            kidem_kurallari=a.get("kidem_kurallari", {})
-        )
-        for a in st.session_state.get("alanlar", [])
-    ]
-    
-    # Kıdem grupları
-    kidem_gruplari = [
-        KidemGrubu(
-            isim=k["isim"], 
-            renk=k.get("renk", "#808080"),
-            varsayilan_hedef=k.get("varsayilan_hedef")
-        )
-        for k in st.session_state.get("kidem_gruplari", [])
-    ]
-    
-    # Vardiya tipleri
-    vardiya_tipleri = [
-        VardiyaTipi(
-            isim=v["isim"],
-            baslangic=v.get("baslangic", "08:00"),
-            bitis=v.get("bitis", "16:00"),
-            renk=v.get("renk", "#808080")
-        )
-        for v in st.session_state.get("vardiya_tipleri", [])
-    ]
-    
-    return Ayarlar(
-        personeller=personeller,
-        varsayilan_hedef=st.session_state.get("varsayilan_hedef", 7),
-        alanlar=alanlar,
-        alan_bazli_denklik=st.session_state.get("alan_bazli_denklik", True),
-        kidem_gruplari=kidem_gruplari,
-        vardiya_tipleri=vardiya_tipleri,
-        saat_bazli_denge=st.session_state.get("saat_bazli_denge", True),
-        birlikte_tutma=birlikte_tutma,
-        ayri_tutma=ayri_tutma,
-        esnek_ayri_tutma=esnek_ayri_tutma,
-        # Kural ayarları
-        ardisik_yasak=st.session_state.get("ardisik_yasak", True),
-        gunasiri_limit_aktif=st.session_state.get("gunasiri_limit_aktif", True),
-        max_gunasiri=st.session_state.get("max_gunasiri", 1),
-        enforce_minimum_staffing=st.session_state.get("enforce_minimum_staffing", True),
-        hafta_sonu_dengesi=st.session_state.get("hafta_sonu_dengesi", True),
-        w_cuma=st.session_state.get("w_cuma", 1000),
-        w_cumartesi=st.session_state.get("w_cumartesi", 1000),
-        w_pazar=st.session_state.get("w_pazar", 1000),
-        tatil_dengesi=st.session_state.get("tatil_dengesi", True),
-        iki_gun_bosluk_aktif=st.session_state.get("iki_gun_bosluk_aktif", True),
-        iki_gun_bosluk_tercihi=st.session_state.get("w_gap3", 300)
+    return durumdan_ayarlar(st.session_state)
+
+
+def sonuc_onizleme_tablosu(sonuc: dict) -> pd.DataFrame:
+    """Herhangi bir sonuç formatını gün bazlı düz bir tabloya çevirir (canlı önizleme için)"""
+    rows = []
+    for gun in sorted(sonuc.keys(), key=int):
+        gun_data = sonuc[gun]
+        row = {"Gün": int(gun)}
+        if isinstance(gun_data, list):
+            row["Nöbetçiler"] = ", ".join(gun_data)
+        else:
+            for anahtar, deger in gun_data.items():
+                if isinstance(deger, dict):
+                    for vardiya_isim, kisiler in deger.items():
+                        row[f"{anahtar} / {vardiya_isim}"] = ", ".join(kisiler)
+                else:
+                    row[anahtar] = ", ".join(deger)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def canli_coz(solver: NobetSolver) -> dict:
+    """
+    Solver'ı akış modunda çalıştırır. Her iyileşen çözümde yakınsama grafiğini
+    ve mevcut en iyi çizelgeyi günceller, nihai çözümü döndürür.
+    
+    Ara çözüm session_state'e yazılır; kullanıcı "kabul et" derse sonraki
+    çalıştırmada bu çözüm kullanılır. Önceki bir aramadan kalan ara çözüm
+    başlangıçta atılır.
+    """
+    st.session_state.pop("_ara_cozum", None)
+    st.button(
+        "✅ Mevcut en iyi çözümü kabul et",
+        key="_ara_cozum_kabul_btn",
+        on_click=lambda: st.session_state.update(_ara_cozum_kabul=True),
+        help="Aramayı durdurur ve o ana kadar bulunan en iyi çizelgeyi kullanır"
     )
+    durum_yeri = st.empty()
+    grafik_yeri = st.empty()
+    tablo_yeri = st.empty()
+    
+    gecmis = []
+    sonuc = None
+    akis = solver.coz_akis()
+    try:
+        for ara in akis:
+            sonuc = ara.sonuc
+            st.session_state["_ara_cozum"] = sonuc
+            gecmis.append({
+                "Süre (sn)": round(ara.gecen_sure, 2),
+                "Amaç": ara.amac_degeri,
+                "En iyi sınır": ara.en_iyi_sinir
+            })
+            durum_yeri.caption(
+                f"Çözüm #{ara.cozum_no} | Amaç: {ara.amac_degeri:,.0f} | "
+                f"Sınır: {ara.en_iyi_sinir:,.0f} | {ara.gecen_sure:.1f} sn"
+            )
+            grafik_yeri.line_chart(pd.DataFrame(gecmis).set_index("Süre (sn)"))
+            tablo_yeri.dataframe(sonuc_onizleme_tablosu(sonuc), use_container_width=True, hide_index=True)
+    finally:
+        # Script yeniden çalıştırılırsa (ör. kabul butonu) aramayı durdur
+        akis.close()
+    
+    st.session_state.pop("_ara_cozum", None)
+    return sonuc
 
 
 init_session_state()
@@ -333,6 +325,22 @@ with st.sidebar:
             st.session_state.clear()
             st.rerun()
     
+    ayar_yukleme_hatasi = st.session_state.get("_ayar_yukleme_hatasi")
+    if ayar_yukleme_hatasi:
+        st.error(
+            f"Kayıtlı ayarlar okunamadı, varsayılanlar gösteriliyor: {ayar_yukleme_hatasi}. "
+            "Bozuk dosyanın kopyası .bozuk uzantısıyla saklandı; otomatik kayıt kapalı."
+        )
+    otomatik_kaydet = st.checkbox(
+        "Otomatik kaydet",
+        key="otomatik_kaydet",
+        disabled=bool(ayar_yukleme_hatasi),
+        help="Her değişiklikte ayarları kaydet (ard arda düzenlemeler birkaç saniye sonra tek seferde yazılır)"
+    )
+    # Demo verisi ve okunamayan kaydın yerine geçen varsayılanlar kayıtlı ayarların üzerine yazılmaz
+    if otomatik_kaydet and not ayar_yukleme_hatasi and not st.session_state.get("_demo_aktif", False):
+        ayarlari_ertelenmis_kaydet(session_to_ayarlar())
+    
     st.divider()
     
     # JSON Export/Import
@@ -1349,192 +1357,104 @@ with tabs[6]:
         meta = get_demo_meta()
         st.success(f"🧪 Demo senaryosu hazır! Zorluk: **{meta.get('difficulty')}** | Seed: `{meta.get('seed')}`")
     
-    if st.button("🚀 Nöbeti Oluştur", type="primary", use_container_width=True):
+    sicak_baslangic = st.checkbox(
+        "♻️ Kayıtlı plandan sıcak başlangıç",
+        value=True,
+        key="sicak_baslangic",
+        help="Bu ayın son çözümü (yoksa önceki ayınki) CP-SAT'a ipucu olarak verilir. "
+             "Küçük değişikliklerden sonra yeniden çözümü hızlandırır."
+    )
+    onarim_modu = st.checkbox(
+        "🔧 Onarım modu (kayıtlı planı koru)",
+        value=False,
+        key="onarim_modu",
+        help="Bu ayın kayıtlı planı varsa yalnızca değişen kişi ve günlerin çevresi yeniden "
+             "planlanır, diğer atamalar sabit kalır. Çözümsüzse komşuluk genişletilir."
+    )
+    onbellek_kullan = st.checkbox(
+        "⚡ Çözüm önbelleğini kullan",
+        value=True,
+        key="onbellek_kullan",
+        help="Aynı girdi ve ayarlarla daha önce çözülmüş bir çizelge varsa yeniden çözmeden getirilir."
+    )
+    st.checkbox(
+        "⏱️ Uyarlanır süre ve erken durma",
+        value=ARAC_SURE_POLITIKASI["uyarlanir_sure"],
+        key="uyarlanir_sure",
+        help="Süre sınırı model boyutundan tahmin edilir (küçük aylar daha kısa, büyük aylar "
+             f"daha uzun çözülür); en iyi çözüm {ARAC_SURE_POLITIKASI['durgunluk_saniye']:g} sn iyileşmezse arama durur."
+    )
+    ayristir = st.checkbox(
+        "🧩 Bağımsız alan gruplarını ayrı çöz",
+        value=False,
+        key="ayristir",
+        help="Personel havuzları ayrık olan alan grupları (ortak personel veya çift kuralı yok) "
+             "ayrı modeller olarak paralel çözülür. Hafta sonu/tatil/saat dengesi grup içinde "
+             "sağlanır; gruplar arası fark raporlanır."
+    )
+    st.checkbox(
+        "🪜 Kademeli amaç (önce kapsama, sonra adalet, sonra tercihler)",
+        value=False,
+        key="kademeli_amac",
+        help="Öncelikler tek ağırlıklı toplam yerine sırayla optimize edilir; her kademenin "
+             "sonucu sonrakinde sabitlenir. Büyük aylarda üst öncelikler çok daha hızlı kanıtlanır."
+    )
+    
+    # Canlı çözüm sırasında "kabul et" tıklandıysa önceki aramanın en iyi ara çözümü kullanılır;
+    # başka bir sebeple yarıda kalan (veya hata veren) aramanın ara çözümü atılır
+    ara_cozum_kabul = (
+        st.session_state.pop("_ara_cozum_kabul", False)
+        and st.session_state.get("_ara_cozum") is not None
+    )
+    if not ara_cozum_kabul:
+        st.session_state.pop("_ara_cozum", None)
+    
+    if st.button("🚀 Nöbeti Oluştur", type="primary", use_container_width=True) or ara_cozum_kabul:
         yil = int(st.session_state["yil"])
         ay = int(st.session_state["ay"])
-        default_target = int(st.session_state.get("varsayilan_hedef", 7))
-        personeller = st.session_state.get("personel_list", [])
         
-        if not personeller:
+        if not st.session_state.get("personel_list", []):
             st.error("Personel listesi boş olamaz.")
             st.stop()
         
-        gun_sayisi = ay_gun_sayisi(yil, ay)
-        
-        # Hedefler - öncelik: kişisel > kıdem grubu > genel varsayılan
-        hedefler = {}  # Toplam nöbet hedefi
-        vardiya_hedefleri = {}  # {kisi: {vardiya: hedef}} - vardiya bazlı hedefler
-        
-        personel_kidem = st.session_state.get("personel_kidem_gruplari", {})
-        kidem_gruplari = st.session_state.get("kidem_gruplari", [])
-        vardiyalar_data = st.session_state.get("vardiya_tipleri", [])
-        
-        # Kıdem grubu hedeflerini dict'e çevir
-        grup_hedefleri = {
-            g["isim"]: g.get("varsayilan_hedef", default_target)
-            for g in kidem_gruplari
-        }
-        
-        # Kıdem grubu vardiya hedeflerini dict'e çevir
-        grup_vardiya_hedefleri = {
-            g["isim"]: g.get("vardiya_hedefleri", {})
-            for g in kidem_gruplari
-        }
-        
-        for p in personeller:
-            # Önce kişisel hedefe bak
-            kisisel_hedef = st.session_state.get("personel_targets", {}).get(p)
-            kidem = personel_kidem.get(p)
-            
-            if kisisel_hedef is not None and kisisel_hedef != default_target:
-                # Kişisel hedef var
-                hedefler[p] = kisisel_hedef
-            elif kidem and kidem in grup_hedefleri:
-                # Kıdem grubunun hedefine bak
-                hedefler[p] = grup_hedefleri[kidem]
-                
-                # Vardiya bazlı hedef var mı?
-                if vardiyalar_data and kidem in grup_vardiya_hedefleri:
-                    v_hedef = grup_vardiya_hedefleri[kidem]
-                    if v_hedef and any(v > 0 for v in v_hedef.values()):
-                        vardiya_hedefleri[p] = v_hedef
-            else:
-                # Genel varsayılan
-                hedefler[p] = default_target
-        
-        # İzinler (set olarak)
-        izinler = {}
-        for p, gunler in st.session_state.get("izin_map", {}).items():
-            izinler[p] = set(gunler) if gunler else set()
-        
-        # Hafta günü bloklarını izinlere ekle
-        for p in personeller:
-            blocked_names = st.session_state.get("weekday_block_map", {}).get(p, [])
-            for gun_adi in blocked_names:
-                wd = hafta_gunu_numarasi(gun_adi)
-                if wd >= 0:
-                    for gun in range(1, gun_sayisi + 1):
-                        if datetime(yil, ay, gun).weekday() == wd:
-                            izinler.setdefault(p, set()).add(gun)
-        
-        # Tercih edilen günler
-        tercih_edilen = {}
-        for p, gunler in st.session_state.get("prefer_map", {}).items():
-            tercih_edilen[p] = set(gunler) if gunler else set()
-        
-        # Tatiller
-        auto_holidays = set(resmi_tatiller(yil, ay).keys())
-        manuel_text = st.session_state.get("manuel_tatiller", "")
-        manuel_holidays = gun_parse(manuel_text, gun_sayisi) if manuel_text.strip() else set()
-        tatiller = auto_holidays | manuel_holidays
-        
-        # Eşleşme kuralları
-        ayri_tut = [
-            (item["a"], item["b"]) 
-            for item in st.session_state.get("no_pairs_list", [])
-        ]
-        birlikte_tut = [
-            (item["a"], item["b"], int(item["min"])) 
-            for item in st.session_state.get("want_pairs_list", [])
-        ]
-        esnek_ayri_tut = [
-            (item["a"], item["b"]) 
-            for item in st.session_state.get("soft_no_pairs_list", [])
-        ]
+        # Arayüz durumu -> Ayarlar + AylikPlan -> SolverInput (girdi.py, Streamlit'e bağlı değil)
+        ayarlar = durumdan_ayarlar(st.session_state)
+        ay_plani = durumdan_aylik_plan(st.session_state, yil, ay)
+        config = replace(
+            config_olustur(ayarlar, arac_politikasi=True),
+            kademeli_amac=st.session_state.get("kademeli_amac", False)
+        )
+        if not st.session_state.get("uyarlanir_sure", config.uyarlanir_sure):
+            config = replace(config, uyarlanir_sure=False, durgunluk_saniye=0.0)
+        solver_input = solver_input_olustur(ayarlar, ay_plani, config=config)
         
-        # Toplam hedef hesapla (feasibility kontrolü için)
+        default_target = ayarlar.varsayilan_hedef
+        gun_sayisi = ay_gun_sayisi(yil, ay)
+        personeller = solver_input.personeller
+        hedefler = solver_input.hedefler
+        vardiya_hedefleri = solver_input.vardiya_hedefleri
+        izinler = solver_input.izinler
+        tercih_edilen = solver_input.tercih_edilen
+        tatiller = solver_input.tatiller
+        manuel_holidays = set(ay_plani.manuel_tatiller)
+        birlikte_tut = solver_input.birlikte_tut
+        ayri_tut = solver_input.ayri_tut
+        alanlar = solver_input.alanlar
+        vardiyalar = solver_input.vardiyalar
+        personel_alan_yetkinlikleri = solver_input.personel_alan_yetkinlikleri
+        personel_vardiya_kisitlari = solver_input.personel_vardiya_kisitlari
+        
+        # Feasibility kontrolü
         toplam_hedef = sum(hedefler.values())
-        
-        # Çoklu alan modu kontrolü
-        alan_modu_aktif = st.session_state.get("alan_modu_aktif", False)
-        alanlar_data = st.session_state.get("alanlar", [])
-        
-        if alan_modu_aktif and alanlar_data:
-            alanlar = [
-                AlanTanimi(
-                    isim=a["isim"], 
-                    gunluk_kontenjan=a.get("kontenjan", 1),
-                    max_kontenjan=a.get("max_kontenjan"),
-                    kidem_kurallari=a.get("kidem_kurallari", {}),
-                    vardiya_tipleri=a.get("vardiya_tipleri", [])
-                )
-                for a in alanlar_data
-            ]
+        if alanlar:
             toplam_kontenjan = sum(a.gunluk_kontenjan for a in alanlar)
             gereken_toplam = toplam_kontenjan * gun_sayisi
-            
             if toplam_hedef < gereken_toplam:
                 st.error(f"İmkânsız: Toplam hedef ({toplam_hedef}) < gereken ({gereken_toplam} = {toplam_kontenjan}/gün x {gun_sayisi} gün)")
                 st.stop()
-        else:
-            alanlar = []
-            if toplam_hedef < gun_sayisi:
-                st.error(f"İmkânsız: Toplam hedef ({toplam_hedef}) < gün sayısı ({gun_sayisi})")
-                st.stop()
-        
-        # Vardiya tipleri
-        vardiyalar_data = st.session_state.get("vardiya_tipleri", [])
-        vardiyalar = [
-            VardiyaTanimi(
-                isim=v["isim"],
-                baslangic=v.get("baslangic", "08:00"),
-                bitis=v.get("bitis", "16:00")
-            )
-            for v in vardiyalar_data
-        ]
-        
-        # Personel alan yetkinlikleri
-        personel_alan_yetkinlikleri = st.session_state.get("personel_alan_yetkinlikleri", {})
-        
-        # Personel vardiya kısıtları
-        personel_vardiya_kisitlari = st.session_state.get("personel_vardiya_kisitlari", {})
-        
-        # Solver config - kullanıcı ayarlarından al
-        config = SolverConfig(
-            # Hard constraints
-            ardisik_yasak=st.session_state.get("ardisik_yasak", True),
-            gunasiri_limit_aktif=st.session_state.get("gunasiri_limit_aktif", True),
-            max_gunasiri_per_kisi=st.session_state.get("max_gunasiri", 1),
-            enforce_minimum_staffing=st.session_state.get("enforce_minimum_staffing", True),
-
-            # Hafta sonu dengesi
-            hafta_sonu_dengesi_aktif=st.session_state.get("hafta_sonu_dengesi", True),
-            w_cuma=st.session_state.get("w_cuma", 1000),
-            w_cumartesi=st.session_state.get("w_cumartesi", 1000),
-            w_pazar=st.session_state.get("w_pazar", 1000),
-            
-            # Tatil dengesi
-            tatil_dengesi_aktif=st.session_state.get("tatil_dengesi", True),
-            
-            # 2 gün boşluk tercihi
-            iki_gun_bosluk_aktif=st.session_state.get("iki_gun_bosluk_aktif", True),
-            w_iki_gun_bosluk=st.session_state.get("w_gap3", 300),
-            
-            # Saat bazlı denge
-            saat_bazli_denge=st.session_state.get("saat_bazli_denge", True)
-        )
-        
-        # Solver input
-        solver_input = SolverInput(
-            yil=yil,
-            ay=ay,
-            personeller=personeller,
-            hedefler=hedefler,
-            vardiya_hedefleri=vardiya_hedefleri,
-            izinler=izinler,
-            tatiller=tatiller,
-            ayri_tut=ayri_tut,
-            birlikte_tut=birlikte_tut,
-            esnek_ayri_tut=esnek_ayri_tut,
-            tercih_edilen=tercih_edilen,
-            alanlar=alanlar,
-            personel_alan_yetkinlikleri=personel_alan_yetkinlikleri,
-            alan_bazli_denklik=st.session_state.get("alan_bazli_denklik", True),
-            personel_kidem_gruplari=st.session_state.get("personel_kidem_gruplari", {}),
-            vardiyalar=vardiyalar,
-            personel_vardiya_kisitlari=personel_vardiya_kisitlari,
-            config=config
-        )
+        elif toplam_hedef < gun_sayisi:
+            st.error(f"İmkânsız: Toplam hedef ({toplam_hedef}) < gün sayısı ({gun_sayisi})")
+            st.stop()
         
         mod_bilgi = []
         if alanlar:
@@ -1547,8 +1467,73 @@ with tabs[6]:
         st.info(f"Solver çalıştırılıyor...{mod_str}")
         
         try:
-            solver = NobetSolver(solver_input)
-            schedule = solver.coz()
+            mevcut_plan = aylik_plani_yukle(yil, ay) if onarim_modu else None
+            onarim_yapilacak = mevcut_plan is not None and bool(mevcut_plan.sonuc)
+            
+            # Onarım sonucu eski plana bağlı olduğu için önbelleğe girmez
+            onbellek_anahtari = girdi_parmak_izi(solver_input)
+            onbellek_kaydi = None
+            if onbellek_kullan and not ara_cozum_kabul and not onarim_yapilacak:
+                onbellek_kaydi = onbellekten_oku(onbellek_anahtari)
+            
+            if ara_cozum_kabul:
+                solver = None
+                schedule = st.session_state.pop("_ara_cozum")
+                st.caption("⏹️ Arama durduruldu, o ana kadarki en iyi çözüm kullanılıyor.")
+            elif onbellek_kaydi is not None:
+                solver = None
+                schedule = onbellek_kaydi["sonuc"]
+                st.caption(
+                    f"⚡ Önbellekten getirildi | Amaç: {onbellek_kaydi['amac_degeri']:,.0f} | "
+                    f"Durum: {onbellek_kaydi['durum']} | İlk çözüm süresi: {onbellek_kaydi['sure_saniye']} sn"
+                )
+            elif onarim_yapilacak:
+                solver = NobetSolver(solver_input)
+                with st.spinner("Kayıtlı plan onarılıyor..."):
+                    schedule = solver.onar(mevcut_plan.sonuc)
+                ist = solver.rapor.onarim_istatistikleri
+                st.caption(
+                    f"🔧 Onarım: +{ist['eklenen_atama']} / -{ist['kaldirilan_atama']} atama, "
+                    f"{len(ist['denemeler'])} deneme, {ist['toplam_sure_saniye']} sn"
+                )
+            elif ayristir and len(bilesenleri_bul(solver_input)) > 1:
+                solver = None
+                ipucu_plan = ipucu_plani_bul(yil, ay) if sicak_baslangic else None
+                with st.spinner("Bağımsız alan grupları ayrı ayrı çözülüyor..."):
+                    ayrisik = ayristirarak_coz(solver_input, ipucu_sonuc=ipucu_plan.sonuc if ipucu_plan else None)
+                if ayrisik.sonuc is None:
+                    hatali = [", ".join(b.alanlar) for b in ayrisik.bilesenler if b.sonuc is None]
+                    raise ValueError(f"Çözülemeyen alan grupları: {'; '.join(hatali)}")
+                schedule = ayrisik.sonuc
+                st.caption(
+                    f"🧩 {len(ayrisik.bilesenler)} bağımsız grup | Durum: {ayrisik.durum} | "
+                    f"{ayrisik.sure_saniye:.1f} sn"
+                )
+                for etiket, fark in ayrisik.bilesenler_arasi_adalet.items():
+                    if fark["genel_fark"] > fark["bilesen_ici_fark"]:
+                        st.caption(
+                            f"⚖️ {etiket}: gruplar arası fark {fark['genel_fark']} "
+                            f"(grup içi en fazla {fark['bilesen_ici_fark']})"
+                        )
+                onbellege_yaz(
+                    onbellek_anahtari, schedule,
+                    amac_degeri=ayrisik.amac_degeri,
+                    durum=ayrisik.durum,
+                    sure_saniye=ayrisik.sure_saniye
+                )
+            else:
+                ipucu_plan = ipucu_plani_bul(yil, ay) if sicak_baslangic else None
+                solver = NobetSolver(solver_input, ipucu_sonuc=ipucu_plan.sonuc if ipucu_plan else None)
+                if ipucu_plan is not None:
+                    st.caption(f"♻️ İpucu: {ipucu_plan.yil}-{ipucu_plan.ay:02d} planı")
+                schedule = canli_coz(solver)
+                if solver.son_cozum is not None:
+                    onbellege_yaz(
+                        onbellek_anahtari, schedule,
+                        amac_degeri=solver.son_cozum.amac_degeri,
+                        durum=solver.son_cozum.durum,
+                        sure_saniye=solver.son_cozum.gecen_sure
+                    )
             
             # Planı kaydet
             plan = AylikPlan(
@@ -1561,12 +1546,20 @@ with tabs[6]:
                 sonuc={str(k): v for k, v in schedule.items()},
                 sonuc_alanlı=bool(alanlar)
             )
-            aylik_plani_kaydet(plan)
+            aylik_plani_kaydet(plan, aciklama="onarım" if onarim_yapilacak else "arayüzden çözüm")
             
         except Exception as e:
             st.error("❌ Çözüm bulunamadı.")
             st.caption(str(e))
             
+            # Çelişen hard kuralların minimal kümesi (CP-SAT varsayım çekirdeği)
+            with st.spinner("Çelişen kurallar aranıyor..."):
+                cekirdek = NobetSolver(solver_input).catisma_cekirdegi()
+            if cekirdek:
+                st.warning(f"🧩 **Birlikte sağlanamayan {len(cekirdek)} kural** (herhangi biri gevşetilirse bu çelişki çözülür):")
+                for t in cekirdek:
+                    st.markdown(f"- {t.mesaj}")
+            
             # Gelişmiş teşhis
             from solver import gelismis_teshis, teshis_ozeti, TeshisSonucu
             
@@ -1608,9 +1601,6 @@ with tabs[6]:
             st.stop()
         
         # Sonuç tablosu - mod'a göre farklı gösterim
-        weekdays_tr = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
-        
-        # Mod tespiti
         has_alanlar = bool(alanlar)
         has_vardiyalar = bool(vardiyalar)
         
@@ -1619,29 +1609,7 @@ with tabs[6]:
             alan_isimleri = [a.isim for a in alanlar]
             vardiya_isimleri = [v.isim for v in vardiyalar]
             
-            rows = []
-            for gun in range(1, gun_sayisi + 1):
-                dt = datetime(yil, ay, gun)
-                wd = weekdays_tr[dt.weekday()]
-                gun_data = schedule.get(gun, {})
-                
-                row = {
-                    "Gün": gun,
-                    "Tarih": f"{gun:02d}/{ay:02d}/{yil}",
-                    "Hafta Günü": wd,
-                    "Tatil": "Evet" if gun in tatiller else "",
-                }
-                
-                # Her alan-vardiya kombinasyonu için sütun
-                for alan_isim in alan_isimleri:
-                    alan_data = gun_data.get(alan_isim, {})
-                    for vardiya_isim in vardiya_isimleri:
-                        kisiler = alan_data.get(vardiya_isim, [])
-                        col_name = f"{alan_isim} / {vardiya_isim}"
-                        row[col_name] = ", ".join(kisiler) if kisiler else "-"
-                
-                rows.append(row)
-            
+            rows = cizelge_satirlari(schedule, yil, ay, tatiller, alan_isimleri, vardiya_isimleri)
             df_schedule = pd.DataFrame(rows)
             
             st.success("🎉 Çözüm bulundu! (Çoklu Alan + Vardiya)")
@@ -1679,26 +1647,7 @@ with tabs[6]:
             # SADECE VARDİYA MODU - {gun: {vardiya: [kişiler]}}
             vardiya_isimleri = [v.isim for v in vardiyalar]
             
-            rows = []
-            for gun in range(1, gun_sayisi + 1):
-                dt = datetime(yil, ay, gun)
-                wd = weekdays_tr[dt.weekday()]
-                gun_data = schedule.get(gun, {})
-                
-                row = {
-                    "Gün": gun,
-                    "Tarih": f"{gun:02d}/{ay:02d}/{yil}",
-                    "Hafta Günü": wd,
-                    "Tatil": "Evet" if gun in tatiller else "",
-                }
-                
-                # Her vardiya için sütun
-                for vardiya_isim in vardiya_isimleri:
-                    kisiler = gun_data.get(vardiya_isim, [])
-                    row[vardiya_isim] = ", ".join(kisiler) if kisiler else "-"
-                
-                rows.append(row)
-            
+            rows = cizelge_satirlari(schedule, yil, ay, tatiller, vardiya_isimleri=vardiya_isimleri)
             df_schedule = pd.DataFrame(rows)
             
             st.success("🎉 Çözüm bulundu! (Vardiya Modu)")
@@ -1730,26 +1679,7 @@ with tabs[6]:
             # ÇOKLU ALAN MODU - sonuç formatı: {gun: {alan: [kişiler]}}
             alan_isimleri = [a.isim for a in alanlar]
             
-            rows = []
-            for gun in range(1, gun_sayisi + 1):
-                dt = datetime(yil, ay, gun)
-                wd = weekdays_tr[dt.weekday()]
-                gun_data = schedule.get(gun, {})
-                
-                row = {
-                    "Gün": gun,
-                    "Tarih": f"{gun:02d}/{ay:02d}/{yil}",
-                    "Hafta Günü": wd,
-                    "Tatil": "Evet" if gun in tatiller else "",
-                }
-                
-                # Her alan için sütun
-                for alan_isim in alan_isimleri:
-                    kisiler = gun_data.get(alan_isim, [])
-                    row[alan_isim] = ", ".join(kisiler) if kisiler else "-"
-                
-                rows.append(row)
-            
+            rows = cizelge_satirlari(schedule, yil, ay, tatiller, alan_isimleri=alan_isimleri)
             df_schedule = pd.DataFrame(rows)
             
             st.success("🎉 Çözüm bulundu! (Çoklu Alan Modu)")
@@ -1776,26 +1706,7 @@ with tabs[6]:
             
         else:
             # TEK ALAN MODU - eski format: {gun: [kişiler]}
-            max_kisi = max((len(v) for v in schedule.values() if isinstance(v, list)), default=1)
-        
-            rows = []
-            for gun in range(1, gun_sayisi + 1):
-                dt = datetime(yil, ay, gun)
-                wd = weekdays_tr[dt.weekday()]
-                isimler = schedule.get(gun, [])
-                if not isinstance(isimler, list):
-                    isimler = []
-                row = {
-                    "Gün": gun,
-                    "Tarih": f"{gun:02d}/{ay:02d}/{yil}",
-                    "Hafta Günü": wd,
-                    "Kişi Sayısı": len(isimler),
-                    "Tatil": "Evet" if gun in tatiller else "",
-                }
-                for i in range(max_kisi):
-                    row[f"Nöbetçi {i+1}"] = isimler[i] if i < len(isimler) else ""
-                rows.append(row)
-            
+            rows = cizelge_satirlari(schedule, yil, ay, tatiller)
             df_schedule = pd.DataFrame(rows)
             
             st.success("🎉 Çözüm bulundu!")
@@ -1828,50 +1739,69 @@ with tabs[6]:
         )
         
         # Excel indirme
-        xlsx_buf = io.BytesIO()
-        wb = Workbook()
-        ws = wb.active
-        ws.title = f"Nöbet {ay:02d}-{yil}"
-        
-        header_fill = PatternFill(start_color="1F4788", end_color="1F4788", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF")
-        center = Alignment(horizontal="center", vertical="center")
-        
-        fieldnames = list(rows[0].keys())
-        for c, h in enumerate(fieldnames, start=1):
-            cell = ws.cell(row=1, column=c, value=h)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = center
-        
-        fill_weekend = PatternFill(start_color="FFF4E6", end_color="FFF4E6", fill_type="solid")
-        fill_holiday = PatternFill(start_color="FFE0E0", end_color="FFE0E0", fill_type="solid")
-        
-        for r_i, row in enumerate(rows, start=2):
-            dt = datetime(yil, ay, row["Gün"])
-            is_weekend = weekdays_tr[dt.weekday()] in ["Cuma", "Cumartesi", "Pazar"]
-            is_holiday = row["Gün"] in tatiller
-            
-            for c_i, h in enumerate(fieldnames, start=1):
-                cell = ws.cell(row=r_i, column=c_i, value=row.get(h, ""))
-                if c_i <= 5:
-                    cell.alignment = center
-                
-                if is_holiday:
-                    cell.fill = fill_holiday
-                elif is_weekend:
-                    cell.fill = fill_weekend
-        
-        for col in ws.columns:
-            maxlen = max(len(str(cell.value or "")) for cell in col)
-            ws.column_dimensions[col[0].column_letter].width = min(maxlen + 2, 30)
-        
-        wb.save(xlsx_buf)
-        xlsx_buf.seek(0)
-        
         st.download_button(
             "⬇️ Excel İndir (XLSX)",
-            data=xlsx_buf.getvalue(),
+            data=xlsx_bayt(rows, yil, ay, tatiller),
             file_name=f"nobet_{ay:02d}_{yil}.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
+        
+        # Model inşa raporu - hangi kısıt ailesi ne kadar süre/model boyutu ekliyor
+        if solver is not None:
+            with st.expander("⏱️ Model İnşa Raporu", expanded=False):
+                rapor = solver.rapor
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Değişken", rapor.toplam_degisken)
+                with col2:
+                    st.metric("Kısıt", rapor.toplam_kisit)
+                with col3:
+                    st.metric("Amaç Terimi", rapor.toplam_amac_terimi)
+                with col4:
+                    st.metric("İnşa Süresi", f"{rapor.insa_suresi_saniye:.2f} sn")
+            
+                st.dataframe(
+                    pd.DataFrame([a.to_dict() for a in rapor.aileler]),
+                    use_container_width=True,
+                    hide_index=True
+                )
+                st.code(rapor.cp_sat_model_istatistikleri, language=None)
+                
+                if rapor.cozum is not None:
+                    st.markdown("**Çözüm Raporu**")
+                    col1, col2, col3, col4 = st.columns(4)
+                    with col1:
+                        st.metric("Durum", rapor.cozum.durum)
+                    with col2:
+                        st.metric("Boşluk (gap)", f"%{rapor.cozum.bosluk * 100:.1f}")
+                    with col3:
+                        st.metric("Dal", f"{rapor.cozum.dal_sayisi:,}")
+                    with col4:
+                        st.metric("Çatışma", f"{rapor.cozum.catisma_sayisi:,}")
+                    st.caption(
+                        f"Amaç: {rapor.cozum.amac_degeri:,.0f} | En iyi sınır: {rapor.cozum.en_iyi_sinir:,.0f} | "
+                        f"Süre: {rapor.cozum.sure_saniye:.1f} / {rapor.cozum.sure_butcesi_saniye:.0f} sn | "
+                        f"Durma nedeni: {rapor.cozum.durma_nedeni}"
+                    )
+                    if rapor.cozum.aile_maliyetleri:
+                        st.dataframe(
+                            pd.DataFrame(
+                                [{"Aile": isim, "Maliyet": maliyet}
+                                 for isim, maliyet in rapor.cozum.aile_maliyetleri.items()]
+                            ).sort_values("Maliyet", ascending=False),
+                            use_container_width=True,
+                            hide_index=True
+                        )
+                    else:
+                        st.caption("Amaç ailesi maliyeti yok.")
+                    if rapor.cozum.kademeler:
+                        st.markdown("**Kademeler**")
+                        st.dataframe(
+                            pd.DataFrame([
+                                {"Kademe": k.isim, "Durum": k.durum, "Amaç": k.amac_degeri,
+                                 "Sınır": k.en_iyi_sinir, "Süre (sn)": round(k.sure_saniye, 2)}
+                                for k in rapor.cozum.kademeler
+                            ]),
+                            use_container_width=True,
+                            hide_index=True
+                        )
@@ -0,0 +1,287 @@
+"""
+Nöbet Planlayıcı - Bağımsız Alt Problemlere Ayrıştırma
+
+Çok alanlı modda bazı bölümler birbirinden tamamen ayrı personel havuzlarıyla
+çalışır. Bu durumda tek büyük model yerine her havuz ayrı bir model olarak
+(paralel) çözülür ve sonuçlar olağan sonuç formatında birleştirilir.
+
+Etkileşim grafiği: düğümler personel ve alanlardır. Personel, çalışabildiği
+alanlara (yetkinlik + vardiya uyumu) ve ayrı/birlikte/esnek ayrı tutma
+kurallarıyla bağlı olduğu kişilere bağlanır. Kıdem kuralları alan bazlı
+olduğundan bileşen sınırını aşmaz.
+
+Tüm personeli kapsayan adalet terimleri (hafta sonu/tatil dengesi, saat
+dengesi) bileşen içinde uygulanır; bileşenler arası fark çözümden sonra
+hesaplanıp raporlanır.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple
+
+from girdi import ADALET_ETIKETLERI
+from solver import NobetSolver, SolverInput, sonuc_atamalari
+from utils import gunleri_weekday_ile_filtrele
+
+
+@dataclass
+class BilesenSonucu:
+    """Tek bir bağımsız alt problemin çözümü"""
+    personeller: List[str]
+    alanlar: List[str]
+    sonuc: Optional[Dict] = None
+    durum: str = ""
+    amac_degeri: Optional[float] = None
+    sure_saniye: float = 0.0
+    hata: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "personeller": self.personeller,
+            "alanlar": self.alanlar,
+            "durum": self.durum,
+            "amac_degeri": self.amac_degeri,
+            "sure_saniye": round(self.sure_saniye, 3),
+            "hata": self.hata
+        }
+
+
+@dataclass
+class AyristirmaSonucu:
+    """Ayrıştırılarak çözülen ayın birleştirilmiş sonucu"""
+    sonuc: Optional[Dict]
+    durum: str
+    amac_degeri: Optional[float]  # Bileşen amaçlarının toplamı
+    bilesenler: List[BilesenSonucu] = field(default_factory=list)
+    # {etiket: {"genel_fark": tüm personelde max-min, "bilesen_ici_fark": bileşenlerdeki en büyük max-min}}
+    bilesenler_arasi_adalet: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    sure_saniye: float = 0.0
+
+
+def _alan_calisabilir(solver_input: SolverInput, isim: str, alan) -> bool:
+    """Kişi bu alanda en az bir vardiyada çalışabiliyor mu"""
+    yetkin = solver_input.personel_alan_yetkinlikleri.get(isim, [])
+    if yetkin and alan.isim not in yetkin:
+        return False
+    if not solver_input.vardiya_modu:
+        return True
+    alan_vardiyalari = set(alan.vardiya_tipleri or [v.isim for v in solver_input.vardiyalar])
+    kisi_vardiyalari = set(solver_input.personel_vardiya_kisitlari.get(isim, [])
+                           or [v.isim for v in solver_input.vardiyalar])
+    return bool(alan_vardiyalari & kisi_vardiyalari)
+
+
+def bilesenleri_bul(solver_input: SolverInput) -> List[Tuple[List[str], List[str]]]:
+    """
+    Personel-alan etkileşim grafiğinin bağlı bileşenlerini bulur.
+
+    Returns:
+        (personel isimleri, alan isimleri) listesi; girdi sırası korunur.
+        Tek alanlı modda veya tek bileşen varsa tek eleman döner. Hiçbir alanda
+        çalışamayan personel ilk bileşene eklenir (çözümsüzlük korunur).
+    """
+    personeller = solver_input.personeller
+    alanlar = solver_input.alanlar
+    if not solver_input.coklu_alan_modu:
+        return [(list(personeller), [])]
+
+    # Union-find: 0..n-1 personel, n.. alanlar
+    n = len(personeller)
+    ebeveyn = list(range(n + len(alanlar)))
+
+    def kok(i: int) -> int:
+        while ebeveyn[i] != i:
+            ebeveyn[i] = ebeveyn[ebeveyn[i]]
+            i = ebeveyn[i]
+        return i
+
+    def birlestir(i: int, j: int):
+        ebeveyn[kok(i)] = kok(j)
+
+    idx = {isim: i for i, isim in enumerate(personeller)}
+    for p, isim in enumerate(personeller):
+        for a, alan in enumerate(alanlar):
+            if _alan_calisabilir(solver_input, isim, alan):
+                birlestir(p, n + a)
+
+    ciftler = (
+        [(a, b) for a, b in solver_input.ayri_tut]
+        + [(a, b) for a, b, _ in solver_input.birlikte_tut]
+        + [(a, b) for a, b in solver_input.esnek_ayri_tut]
+    )
+    for a, b in ciftler:
+        if a in idx and b in idx:
+            birlestir(idx[a], idx[b])
+
+    gruplar: Dict[int, Tuple[List[str], List[str]]] = {}
+    for a, alan in enumerate(alanlar):
+        gruplar.setdefault(kok(n + a), ([], []))[1].append(alan.isim)
+    for p, isim in enumerate(personeller):
+        if kok(p) in gruplar:
+            gruplar[kok(p)][0].append(isim)
+
+    bilesenler = list(gruplar.values())
+    # Alansız personel (ve onlara çift kuralıyla bağlı olanlar) ilk bileşende çözülür
+    atanmis = {isim for kisiler, _ in bilesenler for isim in kisiler}
+    bilesenler[0][0].extend(isim for isim in personeller if isim not in atanmis)
+    return bilesenler
+
+
+def _alt_girdi(solver_input: SolverInput, personeller: List[str], alan_isimleri: List[str]) -> SolverInput:
+    """Bir bileşenin personel ve alanlarıyla sınırlandırılmış SolverInput"""
+    kisiler = set(personeller)
+
+    def kisi_sozlugu(sozluk: Dict) -> Dict:
+        return {k: v for k, v in sozluk.items() if k in kisiler}
+
+    return replace(
+        solver_input,
+        personeller=list(personeller),
+        hedefler=kisi_sozlugu(solver_input.hedefler),
+        hedefler_saat=kisi_sozlugu(solver_input.hedefler_saat),
+        vardiya_hedefleri=kisi_sozlugu(solver_input.vardiya_hedefleri),
+        izinler=kisi_sozlugu(solver_input.izinler),
+        ayri_tut=[(a, b) for a, b in solver_input.ayri_tut if a in kisiler and b in kisiler],
+        birlikte_tut=[(a, b, k) for a, b, k in solver_input.birlikte_tut if a in kisiler and b in kisiler],
+        esnek_ayri_tut=[(a, b) for a, b in solver_input.esnek_ayri_tut if a in kisiler and b in kisiler],
+        tercih_edilen=kisi_sozlugu(solver_input.tercih_edilen),
+        alanlar=[a for a in solver_input.alanlar if a.isim in alan_isimleri],
+        personel_alan_yetkinlikleri=kisi_sozlugu(solver_input.personel_alan_yetkinlikleri),
+        personel_kidem_gruplari=kisi_sozlugu(solver_input.personel_kidem_gruplari),
+        personel_vardiya_kisitlari=kisi_sozlugu(solver_input.personel_vardiya_kisitlari),
+        adalet_devri={tag: kisi_sozlugu(d) for tag, d in solver_input.adalet_devri.items()}
+    )
+
+
+def _bilesen_coz(is_tanimi: tuple) -> BilesenSonucu:
+    """Process havuzunda tek bir bileşeni çözer (modül seviyesinde olmalı: pickle)"""
+    personeller, alan_isimleri, solver_input, ipucu_sonuc = is_tanimi
+    baslangic = time.perf_counter()
+    try:
+        solver = NobetSolver(solver_input, ipucu_sonuc=ipucu_sonuc)
+        sonuc = solver.coz()
+        return BilesenSonucu(
+            personeller=personeller,
+            alanlar=alan_isimleri,
+            sonuc=sonuc,
+            durum=solver.son_cozum.durum,
+            amac_degeri=solver.son_cozum.amac_degeri,
+            sure_saniye=time.perf_counter() - baslangic
+        )
+    except Exception as e:
+        return BilesenSonucu(
+            personeller=personeller,
+            alanlar=alan_isimleri,
+            durum="HATA",
+            sure_saniye=time.perf_counter() - baslangic,
+            hata=str(e)
+        )
+
+
+def _adalet_sayimlari(solver_input: SolverInput, sonuc: Dict) -> Dict[str, Dict[str, int]]:
+    """Birleşik sonuçta kişi bazında hafta sonu/tatil gün sayıları (devir dahil) ve saatler"""
+    yil, ay = solver_input.yil, solver_input.ay
+    etiket_gunleri = {etiket: set(gunleri_weekday_ile_filtrele(yil, ay, wd))
+                      for etiket, wd in ADALET_ETIKETLERI.items()}
+    etiket_gunleri["tatil"] = set(solver_input.tatiller)
+    sayimlar = {
+        etiket: {p: solver_input.adalet_devri.get(etiket, {}).get(p, 0) for p in solver_input.personeller}
+        for etiket in etiket_gunleri
+    }
+    saatler = {v.isim: v.saat for v in solver_input.vardiyalar}
+    atamalar = sonuc_atamalari(sonuc, [a.isim for a in solver_input.alanlar])
+    for gun, isim in {(gun, isim) for gun, _, _, isim in atamalar}:
+        for etiket, gunler in etiket_gunleri.items():
+            if gun in gunler and isim in sayimlar[etiket]:
+                sayimlar[etiket][isim] += 1
+    if solver_input.vardiya_modu:
+        sayimlar["saat"] = {p: 0 for p in solver_input.personeller}
+        for _, _, vardiya, isim in atamalar:
+            if isim in sayimlar["saat"]:
+                sayimlar["saat"][isim] += saatler.get(vardiya, 24)
+    return sayimlar
+
+
+def _bilesenler_arasi_adalet(
+    solver_input: SolverInput, sonuc: Dict, bilesenler: List[BilesenSonucu]
+) -> Dict[str, Dict[str, int]]:
+    """Her adalet etiketi için tüm personeldeki fark ile bileşen içi en büyük farkı karşılaştırır"""
+    rapor = {}
+    for etiket, sayim in _adalet_sayimlari(solver_input, sonuc).items():
+        if len(sayim) < 2:
+            continue
+        bilesen_ici = 0
+        for b in bilesenler:
+            degerler = [sayim[p] for p in b.personeller if p in sayim]
+            if len(degerler) > 1:
+                bilesen_ici = max(bilesen_ici, max(degerler) - min(degerler))
+        rapor[etiket] = {
+            "genel_fark": max(sayim.values()) - min(sayim.values()),
+            "bilesen_ici_fark": bilesen_ici
+        }
+    return rapor
+
+
+def ayristirarak_coz(
+    solver_input: SolverInput,
+    isci_sayisi: Optional[int] = None,
+    ipucu_sonuc: Optional[Dict] = None
+) -> AyristirmaSonucu:
+    """
+    Girdiyi bağımsız bileşenlerine ayırır, her birini ayrı modelde çözer ve birleştirir.
+
+    Args:
+        solver_input: Çözülecek girdi
+        isci_sayisi: Process sayısı (varsayılan: min(CPU sayısı, bileşen sayısı)).
+            1 ise bileşenler aynı process'te sırayla çözülür.
+        ipucu_sonuc: Tüm ay için hint; her bileşen kendi personelini kullanır
+
+    Returns:
+        AyristirmaSonucu. Bileşenlerden biri çözülemezse sonuc None olur; hangi
+        bileşenin çözülemediği bilesenler listesinde görülür.
+    """
+    baslangic = time.perf_counter()
+    gruplar = bilesenleri_bul(solver_input)
+    cpu = os.cpu_count() or 1
+    isci_sayisi = isci_sayisi or min(cpu, len(gruplar))
+    thread_sayisi = max(1, min(solver_input.config.thread_sayisi, cpu // isci_sayisi))
+
+    isler = []
+    for personeller, alan_isimleri in gruplar:
+        alt = _alt_girdi(solver_input, personeller, alan_isimleri)
+        if len(gruplar) > 1:
+            alt.config = replace(alt.config, thread_sayisi=thread_sayisi)
+        isler.append((personeller, alan_isimleri, alt, ipucu_sonuc))
+
+    if isci_sayisi > 1 and len(isler) > 1:
+        with ProcessPoolExecutor(max_workers=isci_sayisi) as havuz:
+            bilesenler = list(havuz.map(_bilesen_coz, isler))
+    else:
+        bilesenler = [_bilesen_coz(is_tanimi) for is_tanimi in isler]
+
+    if any(b.sonuc is None for b in bilesenler):
+        return AyristirmaSonucu(
+            sonuc=None, durum="INFEASIBLE_VEYA_BILINMIYOR", amac_degeri=None,
+            bilesenler=bilesenler, sure_saniye=time.perf_counter() - baslangic
+        )
+
+    if len(bilesenler) == 1:
+        sonuc = bilesenler[0].sonuc
+    else:
+        # Her alan tek bir bileşene aittir: günleri alan sırasıyla birleştir
+        sahip = {alan: b for b in bilesenler for alan in b.alanlar}
+        sonuc = {
+            g: {alan.isim: sahip[alan.isim].sonuc[g][alan.isim] for alan in solver_input.alanlar}
+            for g in bilesenler[0].sonuc
+        }
+
+    return AyristirmaSonucu(
+        sonuc=sonuc,
+        durum="OPTIMAL" if all(b.durum == "OPTIMAL" for b in bilesenler) else "FEASIBLE",
+        amac_degeri=sum(b.amac_degeri for b in bilesenler),
+        bilesenler=bilesenler,
+        bilesenler_arasi_adalet=_bilesenler_arasi_adalet(solver_input, sonuc, bilesenler),
+        sure_saniye=time.perf_counter() - baslangic
+    )
@@ -0,0 +1,406 @@
+"""
+Nöbet Planlayıcı - Performans Ölçümü
+
+scenarios.ScenarioGenerator ile tohumlanmış örnekler üretir (zorluk x personel
+sayısı x ay x tohum), her örneği ayrı bir process'te çözer ve model inşa
+süresi, çözüm süresi, durum, amaç, sınır ve tepe bellek kullanımını JSON/CSV
+dosyasına yazar. karsilastir komutu sonuçları kayıtlı bir temel (baseline)
+dosyayla eşleştirip gerilemeleri listeler.
+
+Her örnek yeni bir process'te çalışır (max_tasks_per_child=1); tepe bellek
+process'in en yüksek RSS değeridir ve örnekler birbirini etkilemez.
+
+Kullanım:
+    python benchmark.py calistir -o temel.json
+    python benchmark.py calistir --zorluk easy,normal --personel 12,20 --aylar 2026-2,2026-3 \\
+        --tohum 1-3 --sure 20 -o yeni.csv
+    python benchmark.py calistir --hazir minimal,hafta_sonu_krizi -o hazir.json
+    python benchmark.py karsilastir temel.json yeni.json --sure-toleransi 0.25
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields, replace
+from typing import List, Optional, Tuple
+
+from scenarios import ScenarioGenerator, HazirSenaryolar, ZORLUK_PROFILLERI
+from girdi import senaryodan_solver_input
+from solver import NobetSolver
+from utils import gun_parse
+
+
+HAZIR_ONEKI = "hazir:"
+
+
+@dataclass
+class BenchmarkOrnegi:
+    """Tek bir ölçüm örneği: senaryo bu alanlardan tekrar üretilebilir"""
+    senaryo: str  # Zorluk ("easy", "normal", ...) veya "hazir:<HazirSenaryolar metodu>"
+    personel: int
+    yil: int
+    ay: int
+    tohum: int
+
+    @property
+    def anahtar(self) -> str:
+        if self.senaryo.startswith(HAZIR_ONEKI):
+            return f"{self.senaryo}-t{self.tohum}"
+        return f"{self.senaryo}-p{self.personel}-{self.yil}-{self.ay:02d}-t{self.tohum}"
+
+    def senaryo_uret(self) -> dict:
+        if self.senaryo.startswith(HAZIR_ONEKI):
+            return getattr(HazirSenaryolar, self.senaryo[len(HAZIR_ONEKI):])(seed=self.tohum)
+        return ScenarioGenerator(seed=self.tohum).generate(
+            difficulty=self.senaryo, yil=self.yil, ay=self.ay, num_personel=self.personel
+        )
+
+
+@dataclass
+class BenchmarkSonucu:
+    """Bir örneğin ölçüm sonucu"""
+    anahtar: str
+    senaryo: str
+    personel: int
+    yil: int
+    ay: int
+    tohum: int
+    durum: str = ""  # CP-SAT durumu; çözüm yoksa "COZUMSUZ", beklenmeyen hata "HATA"
+    durma_nedeni: str = ""
+    amac_degeri: Optional[float] = None
+    en_iyi_sinir: Optional[float] = None
+    bosluk: Optional[float] = None
+    insa_suresi_saniye: float = 0.0
+    cozum_suresi_saniye: float = 0.0
+    tepe_bellek_mb: float = 0.0
+    degisken_sayisi: int = 0
+    kisit_sayisi: int = 0
+    hata: Optional[str] = None
+
+    @property
+    def cozuldu(self) -> bool:
+        return self.amac_degeri is not None
+
+    def to_dict(self) -> dict:
+        d = asdict(self)
+        for k in ("insa_suresi_saniye", "cozum_suresi_saniye", "tepe_bellek_mb"):
+            d[k] = round(d[k], 3)
+        return d
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BenchmarkSonucu":
+        """JSON'dan veya CSV'den (tüm değerler string, boş hücre = None) okur"""
+        alanlar = {f.name for f in fields(cls)}
+        degerler = {}
+        for k, v in data.items():
+            if k not in alanlar:
+                continue
+            if v == "" and k in _BOS_OLABILIR:
+                v = None
+            elif isinstance(v, str) and k in _TAM_SAYI_ALANLARI:
+                v = int(v)
+            elif isinstance(v, str) and k in _ONDALIK_ALANLAR:
+                v = float(v)
+            degerler[k] = v
+        return cls(**degerler)
+
+
+_TAM_SAYI_ALANLARI = {"personel", "yil", "ay", "tohum", "degisken_sayisi", "kisit_sayisi"}
+_ONDALIK_ALANLAR = {
+    "amac_degeri", "en_iyi_sinir", "bosluk", "insa_suresi_saniye", "cozum_suresi_saniye", "tepe_bellek_mb"
+}
+_BOS_OLABILIR = {"amac_degeri", "en_iyi_sinir", "bosluk", "hata"}
+
+
+@dataclass
+class Gerileme:
+    """Temel sonuca göre kötüleşen bir ölçüt"""
+    anahtar: str
+    olcut: str
+    temel: object
+    yeni: object
+    aciklama: str
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def ornekleri_uret(
+    zorluklar: List[str],
+    personel_sayilari: List[int],
+    aylar: List[Tuple[int, int]],
+    tohumlar: List[int],
+    hazir: Optional[List[str]] = None
+) -> List[BenchmarkOrnegi]:
+    """
+    Zorluk x personel x ay x tohum taraması (+ isteğe bağlı hazır senaryolar).
+    Profili personel_sayisi veren zorluklar (ör. xl) yalnızca o sayıyla üretilir.
+    """
+    ornekler = [
+        BenchmarkOrnegi(senaryo=z, personel=p, yil=yil, ay=ay, tohum=t)
+        for z in zorluklar
+        for p in ([ZORLUK_PROFILLERI[z]["personel_sayisi"]] if "personel_sayisi" in ZORLUK_PROFILLERI[z]
+                  else personel_sayilari)
+        for yil, ay in aylar
+        for t in tohumlar
+    ]
+    for isim in hazir or []:
+        if not hasattr(HazirSenaryolar, isim):
+            raise ValueError(f"Bilinmeyen hazır senaryo: {isim}")
+        for t in tohumlar:
+            ornekler.append(BenchmarkOrnegi(senaryo=f"{HAZIR_ONEKI}{isim}", personel=0, yil=0, ay=0, tohum=t))
+    return ornekler
+
+
+def _ornek_coz(is_tanimi: tuple) -> BenchmarkSonucu:
+    """Process havuzunda tek bir örneği çözer (modül seviyesinde olmalı: pickle)"""
+    ornek, max_sure_saniye, thread_sayisi = is_tanimi
+    senaryo = ornek.senaryo_uret()
+    meta = senaryo.get("_meta", {})
+    sonuc = BenchmarkSonucu(
+        anahtar=ornek.anahtar,
+        senaryo=ornek.senaryo,
+        personel=len(senaryo.get("personel_list", [])),
+        yil=meta.get("yil", ornek.yil),
+        ay=meta.get("ay", ornek.ay),
+        tohum=ornek.tohum
+    )
+    solver = None
+    baslangic = time.perf_counter()
+    try:
+        solver_input = senaryodan_solver_input(senaryo)
+        solver_input.config = replace(
+            solver_input.config,
+            max_sure_saniye=max_sure_saniye,
+            thread_sayisi=thread_sayisi,
+            uyarlanir_sure=False,
+            durgunluk_saniye=0.0
+        )
+        solver = NobetSolver(solver_input)
+        solver.coz()
+        cozum = solver.rapor.cozum
+        sonuc.durum = cozum.durum
+        sonuc.durma_nedeni = cozum.durma_nedeni
+        sonuc.amac_degeri = cozum.amac_degeri
+        sonuc.en_iyi_sinir = cozum.en_iyi_sinir
+        sonuc.bosluk = cozum.bosluk
+    except ValueError as e:
+        sonuc.durum = "COZUMSUZ"
+        sonuc.hata = str(e)
+    except Exception as e:
+        sonuc.durum = "HATA"
+        sonuc.hata = f"{type(e).__name__}: {e}"
+    toplam = time.perf_counter() - baslangic
+
+    if solver is not None:
+        sonuc.insa_suresi_saniye = solver.rapor.insa_suresi_saniye
+        sonuc.degisken_sayisi = solver.rapor.toplam_degisken
+        sonuc.kisit_sayisi = solver.rapor.toplam_kisit
+    sonuc.cozum_suresi_saniye = max(0.0, toplam - sonuc.insa_suresi_saniye)
+    # Linux'ta ru_maxrss KB cinsindendir
+    sonuc.tepe_bellek_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return sonuc
+
+
+def calistir(
+    ornekler: List[BenchmarkOrnegi],
+    max_sure_saniye: float = 30.0,
+    isci_sayisi: Optional[int] = None,
+    thread_sayisi: Optional[int] = None,
+    ilerleme=None
+) -> List[BenchmarkSonucu]:
+    """
+    Örnekleri ayrı process'lerde çözer.
+
+    Args:
+        ornekler: ornekleri_uret çıktısı
+        max_sure_saniye: Örnek başına sabit süre sınırı (uyarlanır süre kapalı)
+        isci_sayisi: Aynı anda çalışan process sayısı (varsayılan: 1; paralel
+            çalışma süre ölçümlerini birbirine karıştırır)
+        thread_sayisi: Örnek başına CP-SAT thread sayısı (varsayılan: CPU / işçi)
+        ilerleme: Her örnek bitince BenchmarkSonucu ile çağrılır
+    """
+    isci_sayisi = isci_sayisi or 1
+    thread_sayisi = thread_sayisi or max(1, (os.cpu_count() or 1) // isci_sayisi)
+    isler = [(o, max_sure_saniye, thread_sayisi) for o in ornekler]
+    sonuclar = []
+    # spawn: her örnek temiz bir process'te başlar, tepe bellek ölçümü örneğe aittir
+    with ProcessPoolExecutor(
+        max_workers=isci_sayisi,
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=1
+    ) as havuz:
+        for sonuc in havuz.map(_ornek_coz, isler):
+            sonuclar.append(sonuc)
+            if ilerleme is not None:
+                ilerleme(sonuc)
+    return sonuclar
+
+
+def sonuclari_yaz(sonuclar: List[BenchmarkSonucu], yol: str):
+    """Uzantıya göre JSON veya CSV yazar"""
+    satirlar = [s.to_dict() for s in sonuclar]
+    if yol.lower().endswith(".csv"):
+        with open(yol, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=[fl.name for fl in fields(BenchmarkSonucu)])
+            writer.writeheader()
+            writer.writerows(satirlar)
+    else:
+        with open(yol, "w", encoding="utf-8") as f:
+            json.dump(satirlar, f, ensure_ascii=False, indent=2)
+
+
+def sonuclari_oku(yol: str) -> List[BenchmarkSonucu]:
+    with open(yol, "r", encoding="utf-8", newline="") as f:
+        if yol.lower().endswith(".csv"):
+            return [BenchmarkSonucu.from_dict(r) for r in csv.DictReader(f)]
+        return [BenchmarkSonucu.from_dict(r) for r in json.load(f)]
+
+
+def karsilastir(
+    temel: List[BenchmarkSonucu],
+    yeni: List[BenchmarkSonucu],
+    sure_toleransi: float = 0.25,
+    bellek_toleransi: float = 0.20,
+    amac_toleransi: float = 0.0,
+    min_sure_farki_saniye: float = 0.5
+) -> List[Gerileme]:
+    """
+    Aynı anahtarlı örnekleri karşılaştırıp gerilemeleri döndürür.
+
+    - Çözüm kaybı: temelde çözülen örnek artık çözülemiyor
+    - Optimallik kaybı: temelde OPTIMAL olan örnek artık kanıtlanamıyor
+    - Amaç: iki tarafta da çözüm varken amaç göreli olarak amac_toleransi'ndan fazla kötüleşti
+    - Süre: çözüm süresi yalnızca iki tarafta da OPTIMAL iken karşılaştırılır (aksi halde
+      iki süre de süre sınırına eşittir); inşa süresi her zaman
+    - Bellek: tepe bellek bellek_toleransi'ndan fazla arttı
+
+    Süre gerilemesi için hem göreli (sure_toleransi) hem mutlak (min_sure_farki_saniye)
+    eşik aşılmalıdır; kısa örneklerdeki ölçüm gürültüsü raporlanmaz.
+    """
+    temel_map = {s.anahtar: s for s in temel}
+    gerilemeler = []
+
+    def sure_geriledi(t: float, y: float) -> bool:
+        return y - t > min_sure_farki_saniye and y > t * (1 + sure_toleransi)
+
+    for y in yeni:
+        t = temel_map.get(y.anahtar)
+        if t is None:
+            continue
+        if t.cozuldu and not y.cozuldu:
+            gerilemeler.append(Gerileme(y.anahtar, "durum", t.durum, y.durum, "Çözüm bulunamadı"))
+            continue
+        if t.durum == "OPTIMAL" and y.durum != "OPTIMAL":
+            gerilemeler.append(Gerileme(y.anahtar, "durum", t.durum, y.durum, "Optimallik kanıtlanamadı"))
+        if t.cozuldu and y.cozuldu:
+            esik = abs(t.amac_degeri) * amac_toleransi
+            if y.amac_degeri > t.amac_degeri + esik:
+                gerilemeler.append(Gerileme(
+                    y.anahtar, "amac_degeri", t.amac_degeri, y.amac_degeri,
+                    f"Amaç {y.amac_degeri - t.amac_degeri:+,.0f} kötüleşti"
+                ))
+        if t.durum == "OPTIMAL" and y.durum == "OPTIMAL" and sure_geriledi(t.cozum_suresi_saniye, y.cozum_suresi_saniye):
+            gerilemeler.append(Gerileme(
+                y.anahtar, "cozum_suresi_saniye", t.cozum_suresi_saniye, y.cozum_suresi_saniye,
+                f"Çözüm süresi x{y.cozum_suresi_saniye / max(t.cozum_suresi_saniye, 1e-9):.2f}"
+            ))
+        if sure_geriledi(t.insa_suresi_saniye, y.insa_suresi_saniye):
+            gerilemeler.append(Gerileme(
+                y.anahtar, "insa_suresi_saniye", t.insa_suresi_saniye, y.insa_suresi_saniye,
+                f"İnşa süresi x{y.insa_suresi_saniye / max(t.insa_suresi_saniye, 1e-9):.2f}"
+            ))
+        if t.tepe_bellek_mb and y.tepe_bellek_mb > t.tepe_bellek_mb * (1 + bellek_toleransi):
+            gerilemeler.append(Gerileme(
+                y.anahtar, "tepe_bellek_mb", t.tepe_bellek_mb, y.tepe_bellek_mb,
+                f"Tepe bellek x{y.tepe_bellek_mb / t.tepe_bellek_mb:.2f}"
+            ))
+    return gerilemeler
+
+
+def _aylari_coz(metin: str) -> List[Tuple[int, int]]:
+    """'2026-2,2026-3' -> [(2026, 2), (2026, 3)]"""
+    aylar = []
+    for parca in metin.split(","):
+        yil, ay = parca.strip().split("-")
+        aylar.append((int(yil), int(ay)))
+    return aylar
+
+
+def _calistir_komutu(args) -> int:
+    zorluklar = [z.strip() for z in args.zorluk.split(",") if z.strip()]
+    for z in zorluklar:
+        if z not in ZORLUK_PROFILLERI:
+            raise SystemExit(f"Bilinmeyen zorluk: {z} ({', '.join(ZORLUK_PROFILLERI)})")
+    ornekler = ornekleri_uret(
+        zorluklar,
+        [int(p) for p in args.personel.split(",")],
+        _aylari_coz(args.aylar),
+        sorted(gun_parse(args.tohum, 10 ** 6)),
+        hazir=[h.strip() for h in args.hazir.split(",") if h.strip()] if args.hazir else None
+    )
+    print(f"{len(ornekler)} örnek, örnek başına {args.sure:g} sn")
+
+    def ilerleme(s: BenchmarkSonucu):
+        amac = f"{s.amac_degeri:,.0f}" if s.cozuldu else "-"
+        print(f"{s.anahtar}: {s.durum} | amaç {amac} | inşa {s.insa_suresi_saniye:.2f} sn | "
+              f"çözüm {s.cozum_suresi_saniye:.2f} sn | {s.tepe_bellek_mb:.0f} MB")
+
+    sonuclar = calistir(ornekler, args.sure, args.isci, args.thread, ilerleme=ilerleme)
+    sonuclari_yaz(sonuclar, args.cikti)
+    print(f"Yazıldı: {args.cikti}")
+    return 0
+
+
+def _karsilastir_komutu(args) -> int:
+    temel = sonuclari_oku(args.temel)
+    yeni = sonuclari_oku(args.yeni)
+    ortak = {s.anahtar for s in temel} & {s.anahtar for s in yeni}
+    gerilemeler = karsilastir(
+        temel, yeni,
+        sure_toleransi=args.sure_toleransi,
+        bellek_toleransi=args.bellek_toleransi,
+        amac_toleransi=args.amac_toleransi
+    )
+    print(f"{len(ortak)} ortak örnek, {len(gerilemeler)} gerileme")
+    for g in gerilemeler:
+        print(f"  {g.anahtar} [{g.olcut}] {g.temel} -> {g.yeni}: {g.aciklama}")
+    return 1 if gerilemeler else 0
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Solver performans ölçümü ve gerileme kontrolü.")
+    alt = parser.add_subparsers(dest="komut", required=True)
+
+    c = alt.add_parser("calistir", help="Örnekleri çöz ve sonuçları yaz")
+    c.add_argument("--zorluk", default="easy,normal,tight", help="Virgülle ayrılmış zorluklar")
+    c.add_argument("--personel", default="12,20",
+                   help="Virgülle ayrılmış baz personel sayıları (sabit sayılı profillerde, ör. xl, yok sayılır)")
+    c.add_argument("--aylar", default="2026-2,2026-3", help="Virgülle ayrılmış YIL-AY listesi")
+    c.add_argument("--tohum", default="1-3", help="Tohumlar, ör. '1-5' veya '1, 7'")
+    c.add_argument("--hazir", default="", help="Ek HazirSenaryolar metotları, ör. 'minimal,cift_catismasi'")
+    c.add_argument("--sure", type=float, default=30.0, help="Örnek başına süre sınırı (saniye)")
+    c.add_argument("--isci", type=int, default=None, help="Aynı anda çalışan process sayısı (varsayılan: 1)")
+    c.add_argument("--thread", type=int, default=None, help="Örnek başına CP-SAT thread sayısı")
+    c.add_argument("-o", "--cikti", default="benchmark.json", help="Sonuç dosyası (.json veya .csv)")
+
+    k = alt.add_parser("karsilastir", help="Sonuçları temel dosyayla karşılaştır")
+    k.add_argument("temel", help="Temel sonuç dosyası")
+    k.add_argument("yeni", help="Yeni sonuç dosyası")
+    k.add_argument("--sure-toleransi", type=float, default=0.25, help="Göreli süre artış toleransı")
+    k.add_argument("--bellek-toleransi", type=float, default=0.20, help="Göreli bellek artış toleransı")
+    k.add_argument("--amac-toleransi", type=float, default=0.0, help="Göreli amaç kötüleşme toleransı")
+
+    args = parser.parse_args(argv)
+    if args.komut == "calistir":
+        return _calistir_komutu(args)
+    return _karsilastir_komutu(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
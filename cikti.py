@@ -0,0 +1,140 @@
+"""
+Nöbet Planlayıcı - Çizelge Çıktıları
+
+Çözüm sonucunu gün bazlı tablo satırlarına ve CSV/XLSX dosyalarına çevirir.
+Streamlit'e bağlı değildir; arayüzdeki indirme butonları ve komut satırı
+(nobet_solve.py) aynı fonksiyonları kullanır.
+"""
+
+import csv
+import io
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from openpyxl import Workbook
+from openpyxl.styles import Font, PatternFill, Alignment
+
+from utils import ay_gun_sayisi
+
+
+HAFTA_GUNLERI_TR = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
+
+
+def _gun_verisi(sonuc: Dict, gun: int, varsayilan):
+    """Sonuç anahtarları int (solver) veya str (JSON'dan yüklenen plan) olabilir"""
+    if gun in sonuc:
+        return sonuc[gun]
+    return sonuc.get(str(gun), varsayilan)
+
+
+def cizelge_satirlari(
+    sonuc: Dict,
+    yil: int,
+    ay: int,
+    tatiller: Iterable[int],
+    alan_isimleri: Optional[List[str]] = None,
+    vardiya_isimleri: Optional[List[str]] = None
+) -> List[dict]:
+    """
+    Sonucu gün bazlı satırlara çevirir (mod'a göre sütunlar).
+
+    - Alan + vardiya: "Alan / Vardiya" sütunları
+    - Sadece vardiya / sadece alan: vardiya veya alan başına bir sütun
+    - Tek alan: "Kişi Sayısı" + "Nöbetçi 1..n" sütunları
+    """
+    tatiller = set(tatiller)
+    gun_sayisi = ay_gun_sayisi(yil, ay)
+    tek_alan = not alan_isimleri and not vardiya_isimleri
+    if tek_alan:
+        max_kisi = max((len(v) for v in sonuc.values() if isinstance(v, list)), default=1)
+
+    rows = []
+    for gun in range(1, gun_sayisi + 1):
+        dt = datetime(yil, ay, gun)
+        row = {
+            "Gün": gun,
+            "Tarih": f"{gun:02d}/{ay:02d}/{yil}",
+            "Hafta Günü": HAFTA_GUNLERI_TR[dt.weekday()],
+        }
+
+        if tek_alan:
+            isimler = _gun_verisi(sonuc, gun, [])
+            if not isinstance(isimler, list):
+                isimler = []
+            row["Kişi Sayısı"] = len(isimler)
+            row["Tatil"] = "Evet" if gun in tatiller else ""
+            for i in range(max_kisi):
+                row[f"Nöbetçi {i+1}"] = isimler[i] if i < len(isimler) else ""
+            rows.append(row)
+            continue
+
+        row["Tatil"] = "Evet" if gun in tatiller else ""
+        gun_data = _gun_verisi(sonuc, gun, {})
+        if alan_isimleri and vardiya_isimleri:
+            for alan_isim in alan_isimleri:
+                alan_data = gun_data.get(alan_isim, {})
+                for vardiya_isim in vardiya_isimleri:
+                    kisiler = alan_data.get(vardiya_isim, [])
+                    row[f"{alan_isim} / {vardiya_isim}"] = ", ".join(kisiler) if kisiler else "-"
+        else:
+            for isim in (alan_isimleri or vardiya_isimleri):
+                kisiler = gun_data.get(isim, [])
+                row[isim] = ", ".join(kisiler) if kisiler else "-"
+        rows.append(row)
+
+    return rows
+
+
+def csv_bayt(rows: List[dict]) -> bytes:
+    """Satırları Excel uyumlu (BOM'lu UTF-8) CSV'ye çevirir"""
+    buf = io.StringIO()
+    if rows:
+        writer = csv.DictWriter(buf, fieldnames=list(rows[0].keys()), lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+    return buf.getvalue().encode("utf-8-sig")
+
+
+def xlsx_bayt(rows: List[dict], yil: int, ay: int, tatiller: Iterable[int]) -> bytes:
+    """Satırları biçimlendirilmiş XLSX'e çevirir (hafta sonu ve tatil satırları renkli)"""
+    tatiller = set(tatiller)
+    xlsx_buf = io.BytesIO()
+    wb = Workbook()
+    ws = wb.active
+    ws.title = f"Nöbet {ay:02d}-{yil}"
+
+    header_fill = PatternFill(start_color="1F4788", end_color="1F4788", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF")
+    center = Alignment(horizontal="center", vertical="center")
+
+    fieldnames = list(rows[0].keys()) if rows else []
+    for c, h in enumerate(fieldnames, start=1):
+        cell = ws.cell(row=1, column=c, value=h)
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = center
+
+    fill_weekend = PatternFill(start_color="FFF4E6", end_color="FFF4E6", fill_type="solid")
+    fill_holiday = PatternFill(start_color="FFE0E0", end_color="FFE0E0", fill_type="solid")
+
+    for r_i, row in enumerate(rows, start=2):
+        dt = datetime(yil, ay, row["Gün"])
+        is_weekend = HAFTA_GUNLERI_TR[dt.weekday()] in ["Cuma", "Cumartesi", "Pazar"]
+        is_holiday = row["Gün"] in tatiller
+
+        for c_i, h in enumerate(fieldnames, start=1):
+            cell = ws.cell(row=r_i, column=c_i, value=row.get(h, ""))
+            if c_i <= 5:
+                cell.alignment = center
+
+            if is_holiday:
+                cell.fill = fill_holiday
+            elif is_weekend:
+                cell.fill = fill_weekend
+
+    for col in ws.columns:
+        maxlen = max(len(str(cell.value or "")) for cell in col)
+        ws.column_dimensions[col[0].column_letter].width = min(maxlen + 2, 30)
+
+    wb.save(xlsx_buf)
+    return xlsx_buf.getvalue()
@@ -0,0 +1,315 @@
+"""
+Nöbet Planlayıcı - Solver Girdisi
+
+Kalıcı Ayarlar ve bir AylikPlan'dan SolverInput oluşturur. Streamlit'e bağlı
+değildir; toplu (çok aylı) çözüm ve komut satırı gibi arayüz dışı akışlarda
+kullanılır.
+
+Arayüz durumu (st.session_state) ve senaryo JSON'ları aynı anahtarları
+kullanır; durumdan_ayarlar / durumdan_aylik_plan bu sözlük biçimini modellere
+çevirir.
+"""
+
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, Iterable, Mapping, Optional
+
+from models import Ayarlar, AylikPlan, Personel, EslesmeTercihi, Alan, KidemGrubu, VardiyaTipi
+from solver import SolverInput, SolverConfig, AlanTanimi, VardiyaTanimi, sonuc_atamalari
+from utils import (
+    ay_gun_sayisi, resmi_tatiller, gunleri_weekday_ile_filtrele, hafta_gunu_numarasi, gun_parse
+)
+
+
+# _adalet_ekle etiketleri ile aynı
+ADALET_ETIKETLERI = {"cuma": 4, "cts": 5, "paz": 6}
+
+
+# Arayüz, nobet_solve.py ve toplu.py'nin süre politikası: uyarlanır süre + durgunlukta
+# erken durma. SolverConfig varsayılanı (kütüphane kullanımı) sabit max_sure_saniye'dir.
+ARAC_SURE_POLITIKASI = {"uyarlanir_sure": True, "durgunluk_saniye": 20.0}
+
+
+def config_olustur(ayarlar: Ayarlar, arac_politikasi: bool = False) -> SolverConfig:
+    """
+    Ayarlar'daki kural ayarlarından SolverConfig oluşturur.
+    arac_politikasi True ise ARAC_SURE_POLITIKASI uygulanır.
+    """
+    config = SolverConfig(
+        ardisik_yasak=ayarlar.ardisik_yasak,
+        gunasiri_limit_aktif=ayarlar.gunasiri_limit_aktif,
+        max_gunasiri_per_kisi=ayarlar.max_gunasiri,
+        enforce_minimum_staffing=ayarlar.enforce_minimum_staffing,
+        hafta_sonu_dengesi_aktif=ayarlar.hafta_sonu_dengesi,
+        w_cuma=ayarlar.w_cuma,
+        w_cumartesi=ayarlar.w_cumartesi,
+        w_pazar=ayarlar.w_pazar,
+        tatil_dengesi_aktif=ayarlar.tatil_dengesi,
+        iki_gun_bosluk_aktif=ayarlar.iki_gun_bosluk_aktif,
+        w_iki_gun_bosluk=ayarlar.iki_gun_bosluk_tercihi,
+        saat_bazli_denge=ayarlar.saat_bazli_denge
+    )
+    return replace(config, **ARAC_SURE_POLITIKASI) if arac_politikasi else config
+
+
+def plan_tatilleri(plan: AylikPlan) -> set:
+    """Resmi tatiller + planın manuel tatilleri"""
+    return set(resmi_tatiller(plan.yil, plan.ay).keys()) | set(plan.manuel_tatiller)
+
+
+def solver_input_olustur(
+    ayarlar: Ayarlar,
+    plan: AylikPlan,
+    config: Optional[SolverConfig] = None,
+    onceki_plan: Optional[AylikPlan] = None,
+    adalet_devri: Optional[Dict[str, Dict[str, int]]] = None
+) -> SolverInput:
+    """
+    Ayarlar + aylık plandan SolverInput oluşturur.
+
+    Hedef önceliği: planın hedef_override'ı > kişisel hedef > kıdem grubu > genel varsayılan.
+
+    Args:
+        ayarlar: Kalıcı ayarlar
+        plan: Çözülecek ayın planı (izinler, tercihler, manuel tatiller)
+        config: Verilmezse ayarlardan oluşturulur
+        onceki_plan: Önceki ayın çözülmüş planı; ardışık gün yasağı aktifse son
+            gününde nöbet tutanlar 1. gün için izinli sayılır (ay sınırı sürekliliği)
+        adalet_devri: Önceki aylardan devreden hafta sonu/tatil sayıları
+    """
+    yil, ay = plan.yil, plan.ay
+    gun_sayisi = ay_gun_sayisi(yil, ay)
+    default_target = ayarlar.varsayilan_hedef
+    personeller = ayarlar.personel_isimleri()
+
+    grup_hedefleri = {
+        k.isim: k.varsayilan_hedef if k.varsayilan_hedef is not None else default_target
+        for k in ayarlar.kidem_gruplari
+    }
+    grup_vardiya_hedefleri = {k.isim: k.vardiya_hedefleri for k in ayarlar.kidem_gruplari}
+
+    hedefler = {}
+    vardiya_hedefleri = {}
+    for p in ayarlar.personeller:
+        if p.isim in plan.hedef_override:
+            hedefler[p.isim] = plan.hedef_override[p.isim]
+        elif p.hedef_nobet is not None and p.hedef_nobet != default_target:
+            hedefler[p.isim] = p.hedef_nobet
+        elif p.kidem_grubu and p.kidem_grubu in grup_hedefleri:
+            hedefler[p.isim] = grup_hedefleri[p.kidem_grubu]
+            v_hedef = grup_vardiya_hedefleri.get(p.kidem_grubu)
+            if ayarlar.vardiya_tipleri and v_hedef and any(v > 0 for v in v_hedef.values()):
+                vardiya_hedefleri[p.isim] = v_hedef
+        else:
+            hedefler[p.isim] = default_target
+
+    # İzinler + hafta günü blokları
+    izinler = {p: set(gunler) for p, gunler in plan.izinler.items()}
+    for p in ayarlar.personeller:
+        for gun_adi in p.bloklu_gunler:
+            wd = hafta_gunu_numarasi(gun_adi)
+            if wd >= 0:
+                for gun in range(1, gun_sayisi + 1):
+                    if datetime(yil, ay, gun).weekday() == wd:
+                        izinler.setdefault(p.isim, set()).add(gun)
+
+    # Ay sınırı: önceki ayın son günü nöbetçi olan 1. gün tutamaz
+    if onceki_plan is not None and onceki_plan.sonuc and ayarlar.ardisik_yasak:
+        son_gun = ay_gun_sayisi(onceki_plan.yil, onceki_plan.ay)
+        for gun, _, _, isim in sonuc_atamalari(onceki_plan.sonuc):
+            if gun == son_gun and isim in hedefler:
+                izinler.setdefault(isim, set()).add(1)
+
+    alanlar = [
+        AlanTanimi(
+            isim=a.isim,
+            gunluk_kontenjan=a.gunluk_kontenjan,
+            max_kontenjan=a.max_kontenjan,
+            kidem_kurallari=a.kidem_kurallari,
+            vardiya_tipleri=a.vardiya_tipleri
+        )
+        for a in ayarlar.alanlar if a.aktif
+    ]
+    vardiyalar = [
+        VardiyaTanimi(isim=v.isim, baslangic=v.baslangic, bitis=v.bitis)
+        for v in ayarlar.vardiya_tipleri
+    ]
+
+    return SolverInput(
+        yil=yil,
+        ay=ay,
+        personeller=personeller,
+        hedefler=hedefler,
+        vardiya_hedefleri=vardiya_hedefleri,
+        izinler=izinler,
+        tatiller=plan_tatilleri(plan),
+        ayri_tut=[(e.personel_a, e.personel_b) for e in ayarlar.ayri_tutma],
+        birlikte_tut=[(e.personel_a, e.personel_b, int(e.min_birlikte)) for e in ayarlar.birlikte_tutma],
+        esnek_ayri_tut=[(e.personel_a, e.personel_b) for e in ayarlar.esnek_ayri_tutma],
+        tercih_edilen={p: set(g) for p, g in plan.tercih_edilen_gunler.items()},
+        alanlar=alanlar,
+        personel_alan_yetkinlikleri={
+            p.isim: p.calisabilir_alanlar for p in ayarlar.personeller if p.calisabilir_alanlar
+        },
+        alan_bazli_denklik=ayarlar.alan_bazli_denklik,
+        personel_kidem_gruplari={
+            p.isim: p.kidem_grubu for p in ayarlar.personeller if p.kidem_grubu
+        },
+        vardiyalar=vardiyalar,
+        personel_vardiya_kisitlari={
+            p.isim: p.calisabilir_vardiyalar for p in ayarlar.personeller if p.calisabilir_vardiyalar
+        },
+        adalet_devri=adalet_devri or {},
+        config=config or config_olustur(ayarlar)
+    )
+
+
+def durumdan_ayarlar(durum: Mapping) -> Ayarlar:
+    """
+    Arayüz durumu / senaryo sözlüğünden Ayarlar oluşturur.
+
+    Alan modu kapalıysa alanlar silinmez, pasif (aktif=False) olarak taşınır.
+    """
+    personel_targets = durum.get("personel_targets", {})
+    weekday_block_map = durum.get("weekday_block_map", {})
+    alan_yetkinlikleri = durum.get("personel_alan_yetkinlikleri", {})
+    kidem_atamalari = durum.get("personel_kidem_gruplari", {})
+    vardiya_kisitlari = durum.get("personel_vardiya_kisitlari", {})
+
+    personeller = [
+        Personel(
+            isim=isim,
+            hedef_nobet=personel_targets.get(isim),
+            bloklu_gunler=weekday_block_map.get(isim, []),
+            calisabilir_alanlar=alan_yetkinlikleri.get(isim, []),
+            kidem_grubu=kidem_atamalari.get(isim),
+            calisabilir_vardiyalar=vardiya_kisitlari.get(isim, [])
+        )
+        for isim in durum.get("personel_list", [])
+    ]
+
+    alanlar_data = durum.get("alanlar", [])
+    alan_modu_aktif = durum.get("alan_modu_aktif", bool(alanlar_data))
+    alanlar = [
+        Alan(
+            isim=a["isim"],
+            gunluk_kontenjan=a.get("kontenjan", 1),
+            max_kontenjan=a.get("max_kontenjan"),
+            renk=a.get("renk", "#808080"),
+            aktif=bool(alan_modu_aktif and a.get("aktif", True)),
+            kidem_kurallari=a.get("kidem_kurallari", {}),
+            vardiya_tipleri=a.get("vardiya_tipleri", [])
+        )
+        for a in alanlar_data
+    ]
+
+    kidem_gruplari = [
+        KidemGrubu(
+            isim=k["isim"],
+            renk=k.get("renk", "#808080"),
+            varsayilan_hedef=k.get("varsayilan_hedef"),
+            vardiya_hedefleri=k.get("vardiya_hedefleri", {})
+        )
+        for k in durum.get("kidem_gruplari", [])
+    ]
+
+    vardiya_tipleri = [
+        VardiyaTipi(
+            isim=v["isim"],
+            baslangic=v.get("baslangic", "08:00"),
+            bitis=v.get("bitis", "16:00"),
+            renk=v.get("renk", "#808080")
+        )
+        for v in durum.get("vardiya_tipleri", [])
+    ]
+
+    return Ayarlar(
+        personeller=personeller,
+        varsayilan_hedef=int(durum.get("varsayilan_hedef", 7)),
+        alanlar=alanlar,
+        alan_bazli_denklik=durum.get("alan_bazli_denklik", True),
+        kidem_gruplari=kidem_gruplari,
+        vardiya_tipleri=vardiya_tipleri,
+        saat_bazli_denge=durum.get("saat_bazli_denge", True),
+        birlikte_tutma=[
+            EslesmeTercihi(personel_a=e["a"], personel_b=e["b"], min_birlikte=e.get("min", 0))
+            for e in durum.get("want_pairs_list", [])
+        ],
+        ayri_tutma=[
+            EslesmeTercihi(personel_a=e["a"], personel_b=e["b"])
+            for e in durum.get("no_pairs_list", [])
+        ],
+        esnek_ayri_tutma=[
+            EslesmeTercihi(personel_a=e["a"], personel_b=e["b"], zorunlu=False)
+            for e in durum.get("soft_no_pairs_list", [])
+        ],
+        # Kural ayarları
+        ardisik_yasak=durum.get("ardisik_yasak", True),
+        gunasiri_limit_aktif=durum.get("gunasiri_limit_aktif", True),
+        max_gunasiri=durum.get("max_gunasiri", 1),
+        enforce_minimum_staffing=durum.get("enforce_minimum_staffing", True),
+        hafta_sonu_dengesi=durum.get("hafta_sonu_dengesi", True),
+        w_cuma=durum.get("w_cuma", 1000),
+        w_cumartesi=durum.get("w_cumartesi", 1000),
+        w_pazar=durum.get("w_pazar", 1000),
+        tatil_dengesi=durum.get("tatil_dengesi", True),
+        iki_gun_bosluk_aktif=durum.get("iki_gun_bosluk_aktif", True),
+        iki_gun_bosluk_tercihi=durum.get("w_gap3", 300)
+    )
+
+
+def durumdan_aylik_plan(durum: Mapping, yil: int, ay: int) -> AylikPlan:
+    """Arayüz durumu / senaryo sözlüğündeki ay'a özel verilerden (izin, tercih, manuel tatil) AylikPlan oluşturur"""
+    manuel = durum.get("manuel_tatiller", "")
+    if isinstance(manuel, str):
+        manuel = gun_parse(manuel, ay_gun_sayisi(yil, ay))
+    return AylikPlan(
+        yil=yil,
+        ay=ay,
+        izinler={p: sorted(g) for p, g in durum.get("izin_map", {}).items() if g},
+        tercih_edilen_gunler={p: sorted(g) for p, g in durum.get("prefer_map", {}).items() if g},
+        manuel_tatiller=sorted(manuel)
+    )
+
+
+def senaryodan_solver_input(
+    senaryo: Mapping,
+    yil: Optional[int] = None,
+    ay: Optional[int] = None,
+    config: Optional[SolverConfig] = None
+) -> SolverInput:
+    """
+    Senaryo sözlüğünden (scenarios.ScenarioGenerator / load_scenario) SolverInput oluşturur.
+
+    Yıl ve ay verilmezse senaryonun _meta bilgisinden alınır.
+    """
+    meta = senaryo.get("_meta", {})
+    yil = yil or meta.get("yil")
+    ay = ay or meta.get("ay")
+    if not yil or not ay:
+        raise ValueError("Senaryoda yıl/ay bilgisi yok (_meta); yil ve ay verilmeli")
+    ayarlar = durumdan_ayarlar(senaryo)
+    return solver_input_olustur(ayarlar, durumdan_aylik_plan(senaryo, yil, ay), config=config)
+
+
+def adalet_devri_hesapla(planlar: Iterable[AylikPlan]) -> Dict[str, Dict[str, int]]:
+    """
+    Çözülmüş planlardaki cuma/cumartesi/pazar/tatil nöbetlerini kişi bazında toplar.
+    Çıktı SolverInput.adalet_devri formatındadır.
+    """
+    devir: Dict[str, Dict[str, int]] = {etiket: {} for etiket in (*ADALET_ETIKETLERI, "tatil")}
+    for plan in planlar:
+        if not plan.sonuc:
+            continue
+        etiket_gunleri = {
+            etiket: set(gunleri_weekday_ile_filtrele(plan.yil, plan.ay, wd))
+            for etiket, wd in ADALET_ETIKETLERI.items()
+        }
+        etiket_gunleri["tatil"] = plan_tatilleri(plan)
+        # Kişi-gün bazında say (aynı gün birden fazla vardiya bir kez sayılır)
+        kisi_gunleri = {(gun, isim) for gun, _, _, isim in sonuc_atamalari(plan.sonuc)}
+        for gun, isim in kisi_gunleri:
+            for etiket, gunler in etiket_gunleri.items():
+                if gun in gunler:
+                    devir[etiket][isim] = devir[etiket].get(isim, 0) + 1
+    return devir
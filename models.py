@@ -351,6 +351,146 @@ class Ayarlar:
         return sum(a.gunluk_kontenjan for a in self.alanlar if a.aktif)
 
 
+# Kaydedilen sonucun sütunlu biçim sürümü (biçim değişirse artırın; eski sürümler okunmaya devam etmeli)
+SONUC_BICIM_SURUMU = 1
+
+
+def sonuc_seviyesi(sonuc: Dict) -> int:
+    """
+    İç içe sonucun seviyesi: 0 = {gün: [...]}, 1 = {gün: {anahtar: [...]}},
+    2 = {gün: {alan: {vardiya: [...]}}}. Boş sonuç 0 sayılır.
+    
+    Raises:
+        ValueError: Günler farklı biçimdeyse
+    """
+    gun_degerleri = list(sonuc.values())
+    if all(isinstance(d, list) for d in gun_degerleri):
+        return 0
+    if all(isinstance(d, dict) for d in gun_degerleri):
+        return 2 if any(isinstance(v, dict) for d in gun_degerleri for v in d.values()) else 1
+    raise ValueError("Sonuç günleri farklı biçimlerde")
+
+
+def sonucu_sutunlara_cevir(sonuc: Dict, sonuc_alanli: bool = False) -> dict:
+    """
+    İç içe sonucu sütunlu biçime çevirir: isim sözlükleri + tamsayı sütunları.
+    
+    Hücre = (alan, vardiya) çifti; hücre şablonu "hucre_alan"/"hucre_vardiya"
+    sütunlarında bir kez tutulur (-1 = yok). Her günün hücreleri şablon
+    sırasındaysa "gun_hucreleri" None, değilse gün başına şablon indeksleri.
+    "sayi" gün × hücre sırasıyla kişi sayısı, "kisi" kişi indeksleri art arda.
+    Boş gün/hücreler ve sözlük sırası korunur; sutunlardan_sonuc aynı iç içe
+    yapıyı (str gün anahtarlarıyla) geri üretir. Tek seviyeli sözlükte anahtar
+    sonuc_alanli ise alan, değilse vardiya sayılır.
+    
+    Raises:
+        ValueError: Günler farklı biçimdeyse veya yapı tanınmıyorsa
+    """
+    seviye = sonuc_seviyesi(sonuc)
+    
+    isimler: Dict[str, int] = {}
+    alanlar: Dict[str, int] = {}
+    vardiyalar: Dict[str, int] = {}
+    hucreler: Dict[tuple, int] = {}
+    gunler, gun_hucreleri, sayi, kisi = [], [], [], []
+    
+    def indeks(sozluk: dict, anahtar) -> int:
+        return sozluk.setdefault(anahtar, len(sozluk))
+    
+    for gun_anahtar, gun_data in sonuc.items():
+        gun = int(gun_anahtar)
+        if str(gun) != str(gun_anahtar):
+            raise ValueError(f"Gün anahtarı tamsayı değil: {gun_anahtar!r}")
+        gunler.append(gun)
+        
+        # Günün (hücre, kişiler) listesi
+        if seviye == 0:
+            gun_hucre = [((-1, -1), gun_data)]
+        elif seviye == 1:
+            gun_hucre = [
+                ((indeks(alanlar, k), -1) if sonuc_alanli else (-1, indeks(vardiyalar, k)), kisiler)
+                for k, kisiler in gun_data.items()
+            ]
+        else:
+            gun_hucre = []
+            for alan_isim, alan_data in gun_data.items():
+                if not isinstance(alan_data, dict):
+                    raise ValueError(f"{gun}. gün, {alan_isim}: vardiya sözlüğü bekleniyordu")
+                a = indeks(alanlar, alan_isim)
+                if not alan_data:
+                    gun_hucre.append(((a, -1), []))  # vardiyası olmayan alan da korunur
+                gun_hucre.extend(((a, indeks(vardiyalar, v)), kisiler) for v, kisiler in alan_data.items())
+        
+        satir = []
+        for hucre, kisiler in gun_hucre:
+            if not isinstance(kisiler, list):
+                raise ValueError(f"{gun}. gün: kişi listesi bekleniyordu")
+            satir.append(indeks(hucreler, hucre))
+            sayi.append(len(kisiler))
+            kisi.extend(indeks(isimler, isim) for isim in kisiler)
+        gun_hucreleri.append(satir)
+    
+    tam_sablon = list(range(len(hucreler)))
+    return {
+        "bicim": "sutunlu",
+        "surum": SONUC_BICIM_SURUMU,
+        "seviye": seviye,
+        "isimler": list(isimler),
+        "alanlar": list(alanlar),
+        "vardiyalar": list(vardiyalar),
+        "gunler": gunler,
+        "hucre_alan": [a for a, _ in hucreler],
+        "hucre_vardiya": [v for _, v in hucreler],
+        "gun_hucreleri": None if all(s == tam_sablon for s in gun_hucreleri) else gun_hucreleri,
+        "sayi": sayi,
+        "kisi": kisi
+    }
+
+
+def sonuc_sutunlu_mu(veri) -> bool:
+    """Kaydedilmiş sonuç sütunlu biçimde mi (eski iç içe biçimin anahtarları gün numaralarıdır)"""
+    return isinstance(veri, dict) and veri.get("bicim") == "sutunlu"
+
+
+def sutunlardan_sonuc(veri: dict) -> Dict:
+    """
+    sonucu_sutunlara_cevir çıktısını iç içe sonuca geri çevirir.
+    
+    Raises:
+        ValueError: Bilinmeyen biçim sürümü
+    """
+    surum = veri.get("surum")
+    if surum != SONUC_BICIM_SURUMU:
+        raise ValueError(f"Desteklenmeyen sonuç biçimi sürümü: {surum}")
+    
+    seviye = veri["seviye"]
+    isimler, alanlar, vardiyalar = veri["isimler"], veri["alanlar"], veri["vardiyalar"]
+    hucreler = list(zip(veri["hucre_alan"], veri["hucre_vardiya"]))
+    gun_hucreleri = veri["gun_hucreleri"] or [range(len(hucreler))] * len(veri["gunler"])
+    kisiler = [isimler[i] for i in veri["kisi"]]
+    sayilar = iter(veri["sayi"])
+    
+    sonuc = {}
+    bas = 0
+    for gun, satir in zip(veri["gunler"], gun_hucreleri):
+        gun_data = [] if seviye == 0 else {}
+        for h in satir:
+            n = next(sayilar)
+            liste = kisiler[bas:bas + n]
+            bas += n
+            a, v = hucreler[h]
+            if seviye == 0:
+                gun_data.extend(liste)
+            elif seviye == 1:
+                gun_data[alanlar[a] if a >= 0 else vardiyalar[v]] = liste
+            else:
+                alan_data = gun_data.setdefault(alanlar[a], {})
+                if v >= 0:
+                    alan_data[vardiyalar[v]] = liste
+        sonuc[str(gun)] = gun_data
+    return sonuc
+
+
 @dataclass 
 class AylikPlan:
     """
@@ -371,12 +511,20 @@ class AylikPlan:
     # Sonuç - iki format destekleniyor:
     # Eski format (tek alan): {1: ["Dr. A", "Dr. B"], 2: [...]}
     # Yeni format (çoklu alan): {1: {"Yeşil": ["Dr. A"], "Kırmızı": ["Dr. B"]}, ...}
+    # Bellekte hep iç içe; to_dict sütunlu biçimde yazar (sonucu_sutunlara_cevir),
+    # from_dict iki biçimi de okur.
     sonuc: Optional[Dict] = None
     sonuc_alanlı: bool = False  # True ise yeni format kullanılıyor
     
     olusturma_tarihi: Optional[str] = None
     
     def to_dict(self) -> dict:
+        sonuc = self.sonuc
+        if sonuc and not sonuc_sutunlu_mu(sonuc):
+            try:
+                sonuc = sonucu_sutunlara_cevir(sonuc, self.sonuc_alanlı)
+            except ValueError:
+                pass  # Tanınmayan yapı olduğu gibi yazılır
         return {
             "yil": self.yil,
             "ay": self.ay,
@@ -384,13 +532,16 @@ class AylikPlan:
             "tercih_edilen_gunler": self.tercih_edilen_gunler,
             "manuel_tatiller": self.manuel_tatiller,
             "hedef_override": self.hedef_override,
-            "sonuc": self.sonuc,
+            "sonuc": sonuc,
             "sonuc_alanlı": self.sonuc_alanlı,
             "olusturma_tarihi": self.olusturma_tarihi
         }
     
     @classmethod
     def from_dict(cls, data: dict) -> "AylikPlan":
+        sonuc = data.get("sonuc")
+        if sonuc_sutunlu_mu(sonuc):
+            sonuc = sutunlardan_sonuc(sonuc)
         return cls(
             yil=data["yil"],
             ay=data["ay"],
@@ -398,7 +549,7 @@ class AylikPlan:
             tercih_edilen_gunler=data.get("tercih_edilen_gunler", {}),
             manuel_tatiller=data.get("manuel_tatiller", []),
             hedef_override=data.get("hedef_override", {}),
-            sonuc=data.get("sonuc"),
+            sonuc=sonuc,
             sonuc_alanlı=data.get("sonuc_alanlı", False),
             olusturma_tarihi=data.get("olusturma_tarihi")
         )
@@ -0,0 +1,171 @@
+"""
+Nöbet Planlayıcı - Komut Satırından Çözüm
+
+Streamlit olmadan tek bir ayı çözer: ayarlar JSON'u (veya kayıtlı ayarlar) +
+aylık plan ya da bir senaryo JSON'u okunur, çözülür ve plan JSON/CSV/XLSX
+olarak yazılır. Gece çalışan toplu işler için; arayüz bağımlılıklarını
+yüklemez.
+
+Kullanım:
+    python nobet_solve.py --yil 2026 --ay 3 -o mart.xlsx
+    python nobet_solve.py --ayarlar ayarlar.json --plan plan.json -o plan.json -o plan.csv
+    python nobet_solve.py --senaryo senaryo.json --sure 60 --uyarlanir -o sonuc.csv
+
+Python'dan:
+    from nobet_solve import plani_coz
+    plan, solver = plani_coz(ayarlar, ay_plani)
+"""
+
+import argparse
+import os
+import time
+from dataclasses import replace
+from typing import List, Optional, Tuple
+
+from models import Ayarlar, AylikPlan
+from solver import NobetSolver, SolverConfig
+from storage import (
+    ayarlari_yukle_veya_varsayilan, aylik_plani_yukle_veya_yeni, aylik_plani_kaydet,
+    ayarlari_json_dan_import, plani_json_dan_import, plani_json_olarak_export
+)
+from girdi import ARAC_SURE_POLITIKASI, config_olustur, solver_input_olustur, durumdan_ayarlar, durumdan_aylik_plan, plan_tatilleri
+from cikti import cizelge_satirlari, csv_bayt, xlsx_bayt
+from scenarios import load_scenario
+
+
+CIKTI_BICIMLERI = (".json", ".csv", ".xlsx")
+
+
+def plani_coz(
+    ayarlar: Ayarlar,
+    plan: AylikPlan,
+    config: Optional[SolverConfig] = None,
+    ipucu_sonuc: Optional[dict] = None
+) -> Tuple[AylikPlan, NobetSolver]:
+    """
+    Ayarlar + aylık planı çözer.
+
+    Returns:
+        (sonucu doldurulmuş plan kopyası, NobetSolver) - rapor ve son_cozum solver üzerinde
+
+    Raises:
+        ValueError: Çözüm bulunamazsa (NobetSolver.coz)
+    """
+    solver_input = solver_input_olustur(ayarlar, plan, config=config)
+    solver = NobetSolver(solver_input, ipucu_sonuc=ipucu_sonuc)
+    sonuc = solver.coz()
+    cozulmus = replace(
+        plan,
+        sonuc={str(k): v for k, v in sonuc.items()},
+        sonuc_alanlı=bool(solver_input.alanlar),
+        olusturma_tarihi=None
+    )
+    return cozulmus, solver
+
+
+def plani_yaz(plan: AylikPlan, ayarlar: Ayarlar, yol: str):
+    """Planı uzantıya göre JSON (AylikPlan), CSV veya XLSX (gün bazlı çizelge) olarak yazar"""
+    uzanti = os.path.splitext(yol)[1].lower()
+    if uzanti == ".json":
+        with open(yol, "w", encoding="utf-8") as f:
+            f.write(plani_json_olarak_export(plan))
+        return
+
+    alanlar = [a.isim for a in ayarlar.alanlar if a.aktif]
+    vardiyalar = [v.isim for v in ayarlar.vardiya_tipleri]
+    tatiller = plan_tatilleri(plan)
+    rows = cizelge_satirlari(plan.sonuc, plan.yil, plan.ay, tatiller, alanlar or None, vardiyalar or None)
+    veri = csv_bayt(rows) if uzanti == ".csv" else xlsx_bayt(rows, plan.yil, plan.ay, tatiller)
+    with open(yol, "wb") as f:
+        f.write(veri)
+
+
+def _json_oku(yol: str) -> str:
+    with open(yol, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Bir ayın nöbet planını arayüz olmadan çözer.")
+    kaynak = parser.add_mutually_exclusive_group()
+    kaynak.add_argument("--ayarlar", help="Ayarlar JSON dosyası (varsayılan: kayıtlı ayarlar)")
+    kaynak.add_argument("--senaryo", help="Senaryo JSON dosyası (scenarios.save_scenario biçimi)")
+    parser.add_argument("--plan", help="Aylık plan JSON dosyası (izinler, tercihler, manuel tatiller)")
+    parser.add_argument("--yil", type=int, default=None, help="Yıl (senaryo/plan verilmişse oradan alınır)")
+    parser.add_argument("--ay", type=int, default=None, help="Ay (senaryo/plan verilmişse oradan alınır)")
+    parser.add_argument("-o", "--cikti", action="append", default=[],
+                        help="Çıktı dosyası; biçim uzantıdan: .json, .csv, .xlsx (birden fazla verilebilir)")
+    parser.add_argument("--kaydet", action="store_true", help="Planı aylik_plani_kaydet ile veri dizinine yaz")
+    parser.add_argument("--sure", type=float, default=None, help="Süre sınırı (saniye)")
+    parser.add_argument("--uyarlanir", action=argparse.BooleanOptionalAction, default=None,
+                        help="Süreyi model boyutundan tahmin et (--sure üst sınır olur; varsayılan: "
+                             f"{'açık' if ARAC_SURE_POLITIKASI['uyarlanir_sure'] else 'kapalı'})")
+    parser.add_argument("--bosluk", type=float, default=0.0, help="Göreli boşluk eşiğinde dur, ör. 0.01")
+    parser.add_argument("--durgunluk", type=float, default=None,
+                        help="En iyi çözüm bu kadar saniye iyileşmezse dur "
+                             f"(0: kapalı; varsayılan: {ARAC_SURE_POLITIKASI['durgunluk_saniye']:g})")
+    parser.add_argument("--kademeli", action="store_true",
+                        help="Kademeli amaç: önce kapsama, sonra adalet, sonra tercihler")
+    args = parser.parse_args(argv)
+
+    for yol in args.cikti:
+        if os.path.splitext(yol)[1].lower() not in CIKTI_BICIMLERI:
+            parser.error(f"Desteklenmeyen çıktı biçimi: {yol} ({', '.join(CIKTI_BICIMLERI)})")
+
+    # Girdi: senaryo (ayarlar + ay verisi tek dosyada) veya ayarlar + plan
+    if args.senaryo:
+        senaryo = load_scenario(args.senaryo)
+        meta = senaryo.get("_meta", {})
+        yil, ay = args.yil or meta.get("yil"), args.ay or meta.get("ay")
+        if not yil or not ay:
+            parser.error("Senaryoda _meta yıl/ay bilgisi yok; --yil ve --ay verin")
+        ayarlar = durumdan_ayarlar(senaryo)
+        plan = durumdan_aylik_plan(senaryo, yil, ay)
+    else:
+        try:
+            ayarlar = ayarlari_json_dan_import(_json_oku(args.ayarlar)) if args.ayarlar else ayarlari_yukle_veya_varsayilan()
+        except Exception as e:
+            print(f"Kayıtlı ayarlar okunamadı: {e}")
+            return 2
+        if ayarlar is None:
+            return 2
+        if args.plan:
+            plan = plani_json_dan_import(_json_oku(args.plan))
+            if plan is None:
+                return 2
+        else:
+            if not args.yil or not args.ay:
+                parser.error("--plan verilmediğinde --yil ve --ay gerekli")
+            plan = aylik_plani_yukle_veya_yeni(args.yil, args.ay)
+
+    config = replace(config_olustur(ayarlar, arac_politikasi=True), kademeli_amac=args.kademeli, bosluk_esigi=args.bosluk)
+    if args.uyarlanir is not None:
+        config = replace(config, uyarlanir_sure=args.uyarlanir)
+    if args.durgunluk is not None:
+        config = replace(config, durgunluk_saniye=args.durgunluk)
+    if args.sure is not None:
+        config = replace(config, max_sure_saniye=args.sure)
+        if config.uyarlanir_sure:
+            config = replace(config, uyarlanir_ust_sure_saniye=args.sure)
+
+    baslangic = time.perf_counter()
+    try:
+        plan, solver = plani_coz(ayarlar, plan, config=config)
+    except ValueError as e:
+        print(f"{plan.yil}-{plan.ay:02d}: ÇÖZÜLEMEDİ | {e}")
+        return 1
+
+    cozum = solver.rapor.cozum
+    print(f"{plan.yil}-{plan.ay:02d}: {cozum.durum} ({cozum.durma_nedeni}) | amaç {cozum.amac_degeri:,.0f} | "
+          f"{time.perf_counter() - baslangic:.1f} sn")
+
+    for yol in args.cikti:
+        plani_yaz(plan, ayarlar, yol)
+        print(f"Yazıldı: {yol}")
+    if args.kaydet and not aylik_plani_kaydet(plan, aciklama="komut satırından çözüm"):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
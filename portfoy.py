@@ -0,0 +1,197 @@
+"""
+Nöbet Planlayıcı - Portföy Çözümü
+
+Aynı SolverInput'u farklı tohum ve CP-SAT parametreleriyle ayrı process'lerde
+yarıştırır, süre sonunda en iyi çizelgeyi döndürür.
+
+Process'ler arasında arama sırasında paylaşım yapılamadığı için süre turlara
+bölünür: her turun sonunda en iyi çözüm bir sonraki turda tüm işçilere hint,
+amaç değeri de üst sınır (cutoff) olarak verilir.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple
+
+from solver import NobetSolver, SolverInput
+
+
+# (isim, CP-SAT parametreleri) - işçi sayısı fazlaysa farklı tohumlarla tekrarlanır
+VARSAYILAN_PORTFOY: List[Tuple[str, Dict[str, object]]] = [
+    ("varsayilan", {}),
+    ("dogrusal_2", {"linearization_level": 2}),
+    ("cekirdek", {"optimize_with_core": True}),
+    ("rastgele", {"randomize_search": True}),
+    ("simetri", {"symmetry_level": 4}),
+    ("amac_kaydirma", {"use_objective_shaving_search": True}),
+]
+
+
+@dataclass
+class IsciIstatistigi:
+    """Bir portföy işçisinin tüm turlardaki özeti"""
+    isim: str
+    parametreler: Dict[str, object]
+    tohum: int
+    son_durum: str = ""
+    en_iyi_amac: Optional[float] = None
+    en_iyi_sinir: Optional[float] = None
+    toplam_sure_saniye: float = 0.0
+    dal_sayisi: int = 0
+    catisma_sayisi: int = 0
+    kazandigi_tur: int = 0
+    hata: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "isim": self.isim,
+            "parametreler": self.parametreler,
+            "tohum": self.tohum,
+            "son_durum": self.son_durum,
+            "en_iyi_amac": self.en_iyi_amac,
+            "en_iyi_sinir": self.en_iyi_sinir,
+            "toplam_sure_saniye": round(self.toplam_sure_saniye, 3),
+            "dal_sayisi": self.dal_sayisi,
+            "catisma_sayisi": self.catisma_sayisi,
+            "kazandigi_tur": self.kazandigi_tur,
+            "hata": self.hata
+        }
+
+
+@dataclass
+class PortfoySonucu:
+    """Portföy çözümünün sonucu"""
+    sonuc: Optional[Dict]
+    amac_degeri: Optional[float]
+    en_iyi_sinir: Optional[float]
+    durum: str
+    kazanan: Optional[str]
+    isciler: List[IsciIstatistigi] = field(default_factory=list)
+    tur_sayisi: int = 0
+    sure_saniye: float = 0.0
+
+
+def _isci_coz(is_tanimi: tuple) -> dict:
+    """Process havuzunda tek bir işçiyi çalıştırır (modül seviyesinde olmalı: pickle)"""
+    sira, solver_input, ipucu_sonuc, ust_sinir = is_tanimi
+    try:
+        solver = NobetSolver(solver_input, ipucu_sonuc=ipucu_sonuc, amac_ust_siniri=ust_sinir)
+        sonuc = solver.coz()
+        cozum = solver.rapor.cozum
+        return {
+            "sira": sira, "sonuc": sonuc, "durum": cozum.durum, "amac": cozum.amac_degeri,
+            "sinir": cozum.en_iyi_sinir, "sure": cozum.sure_saniye, "dal": cozum.dal_sayisi,
+            "catisma": cozum.catisma_sayisi, "hata": None
+        }
+    except Exception as e:
+        return {"sira": sira, "sonuc": None, "durum": "HATA", "amac": None,
+                "sinir": None, "sure": 0.0, "dal": 0, "catisma": 0, "hata": str(e)}
+
+
+def portfoy_coz(
+    solver_input: SolverInput,
+    isci_sayisi: Optional[int] = None,
+    toplam_sure_saniye: Optional[float] = None,
+    tur_sayisi: int = 2,
+    yapilandirmalar: Optional[List[Tuple[str, Dict[str, object]]]] = None,
+    ipucu_sonuc: Optional[Dict] = None
+) -> PortfoySonucu:
+    """
+    Portföy çözümü çalıştırır.
+
+    Args:
+        solver_input: Çözülecek girdi
+        isci_sayisi: Process sayısı (varsayılan: min(CPU sayısı, portföy boyu))
+        toplam_sure_saniye: Toplam süre (varsayılan: config.max_sure_saniye)
+        tur_sayisi: Sürenin bölündüğü tur sayısı; turlar arasında en iyi çözüm paylaşılır
+        yapilandirmalar: (isim, CP-SAT parametreleri) listesi (varsayılan: VARSAYILAN_PORTFOY)
+        ipucu_sonuc: İlk tur için isteğe bağlı hint
+    """
+    baslangic = time.perf_counter()
+    yapilandirmalar = yapilandirmalar or VARSAYILAN_PORTFOY
+    cpu = os.cpu_count() or 1
+    isci_sayisi = isci_sayisi or min(cpu, len(yapilandirmalar))
+    thread_sayisi = max(1, cpu // isci_sayisi)
+    toplam_sure = toplam_sure_saniye or solver_input.config.max_sure_saniye
+    tur_suresi = toplam_sure / max(tur_sayisi, 1)
+
+    isciler = []
+    girdiler = []
+    for i in range(isci_sayisi):
+        isim, parametreler = yapilandirmalar[i % len(yapilandirmalar)]
+        tohum = i
+        if i >= len(yapilandirmalar):
+            isim = f"{isim}_{i // len(yapilandirmalar)}"
+        isciler.append(IsciIstatistigi(isim=isim, parametreler=dict(parametreler), tohum=tohum))
+        config = replace(
+            solver_input.config,
+            max_sure_saniye=tur_suresi,
+            uyarlanir_sure=False,  # Tur süresi sabit, turlar arası paylaşım buna göre planlanır
+            durgunluk_saniye=0.0,
+            thread_sayisi=thread_sayisi,
+            cp_sat_parametreleri={**solver_input.config.cp_sat_parametreleri, **parametreler, "random_seed": tohum}
+        )
+        girdiler.append(replace(solver_input, config=config))
+
+    en_iyi = None  # (amac, sonuc, isci sırası)
+    en_iyi_sinir = None
+    durum = "UNKNOWN"
+    tamamlanan_tur = 0
+
+    with ProcessPoolExecutor(max_workers=isci_sayisi) as havuz:
+        for tur in range(max(tur_sayisi, 1)):
+            ipucu = en_iyi[1] if en_iyi else ipucu_sonuc
+            ust_sinir = int(en_iyi[0]) if en_iyi else None
+            isler = [(i, girdi, ipucu, ust_sinir) for i, girdi in enumerate(girdiler)]
+            tur_en_iyi = None
+            for sonuc in havuz.map(_isci_coz, isler):
+                ist = isciler[sonuc["sira"]]
+                ist.son_durum = sonuc["durum"]
+                ist.toplam_sure_saniye += sonuc["sure"]
+                ist.dal_sayisi += sonuc["dal"]
+                ist.catisma_sayisi += sonuc["catisma"]
+                ist.hata = sonuc["hata"]
+                if sonuc["sonuc"] is None:
+                    continue
+                if ist.en_iyi_amac is None or sonuc["amac"] < ist.en_iyi_amac:
+                    ist.en_iyi_amac = sonuc["amac"]
+                if ist.en_iyi_sinir is None or sonuc["sinir"] > ist.en_iyi_sinir:
+                    ist.en_iyi_sinir = sonuc["sinir"]
+                if en_iyi_sinir is None or sonuc["sinir"] > en_iyi_sinir:
+                    en_iyi_sinir = sonuc["sinir"]
+                if tur_en_iyi is None or sonuc["amac"] < tur_en_iyi["amac"]:
+                    tur_en_iyi = sonuc
+                if sonuc["durum"] == "OPTIMAL":
+                    durum = "OPTIMAL"
+
+            tamamlanan_tur = tur + 1
+            if tur_en_iyi is not None and (en_iyi is None or tur_en_iyi["amac"] < en_iyi[0]):
+                en_iyi = (tur_en_iyi["amac"], tur_en_iyi["sonuc"], tur_en_iyi["sira"])
+                isciler[tur_en_iyi["sira"]].kazandigi_tur += 1
+            # İşçilerin sınırları birleşince en iyi çözüm kanıtlanmış olabilir
+            if en_iyi is not None and en_iyi_sinir is not None and en_iyi_sinir >= en_iyi[0]:
+                durum = "OPTIMAL"
+            if durum == "OPTIMAL":
+                break
+
+    if en_iyi is None:
+        return PortfoySonucu(
+            sonuc=None, amac_degeri=None, en_iyi_sinir=None, durum="INFEASIBLE_VEYA_BILINMIYOR",
+            kazanan=None, isciler=isciler, tur_sayisi=tamamlanan_tur,
+            sure_saniye=time.perf_counter() - baslangic
+        )
+
+    if durum != "OPTIMAL":
+        durum = "FEASIBLE"
+    return PortfoySonucu(
+        sonuc=en_iyi[1],
+        amac_degeri=en_iyi[0],
+        en_iyi_sinir=en_iyi_sinir,
+        durum=durum,
+        kazanan=isciler[en_iyi[2]].isim,
+        isciler=isciler,
+        tur_sayisi=tamamlanan_tur,
+        sure_saniye=time.perf_counter() - baslangic
+    )
@@ -132,6 +132,28 @@ ZORLUK_PROFILLERI = {
         "alan_aktif": True,
         "vardiya_aktif": True,
     },
+    "xl": {
+        "aciklama": "Birleşik hastane: ~320 personel, 10 alan, 6 vardiya tipi (büyük model modu)",
+        # Sabit personel sayısı: num_personel ve personel_carpani yok sayılır
+        "personel_sayisi": 320,
+        "personel_carpani": 1.0,
+        "izin_min": 1,
+        "izin_max": 4,
+        "prefer_min": 0,
+        "prefer_max": 3,
+        # Çift oranları tüm çiftlere göre: 320 kişide ~25 kesin, ~50 esnek çift
+        "no_pairs_oran": 0.0005,
+        "soft_no_pairs_oran": 0.001,
+        "want_pairs_sayi": 10,
+        "weekday_block_oran": 0.05,
+        "alan_aktif": True,
+        "vardiya_aktif": True,
+        # Sabit alan/vardiya sayısı; alan kontenjanı günlük vardiya slotu sayısıdır.
+        # Kişiye toplam hedef verilir, vardiya dağılımı solver'a bırakılır.
+        "alan_sayisi": 10,
+        "vardiya_sayisi": 6,
+        "vardiya_hedefleri": False,
+    },
 }
 
 
@@ -177,10 +199,10 @@ class ScenarioGenerator:
         Tam bir senaryo üret.
         
         Args:
-            difficulty: "easy", "normal", "tight", "nightmare"
+            difficulty: "easy", "normal", "tight", "nightmare", "xl" (büyük model)
             yil: Çizelge yılı
             ay: Çizelge ayı (1-12)
-            num_personel: Baz personel sayısı
+            num_personel: Baz personel sayısı (profil personel_sayisi veriyorsa yok sayılır)
             
         Returns:
             Senin session_state anahtarlarına uygun dict
@@ -191,8 +213,11 @@ class ScenarioGenerator:
         
         profil = ZORLUK_PROFILLERI[difficulty]
         
-        # Personel sayısını zorluğa göre ayarla
-        adjusted_count = max(5, int(num_personel * profil["personel_carpani"]))
+        # Personel sayısını zorluğa göre ayarla (profil sabit sayı verebilir)
+        if "personel_sayisi" in profil:
+            adjusted_count = profil["personel_sayisi"]
+        else:
+            adjusted_count = max(5, int(num_personel * profil["personel_carpani"]))
         
         # Ayın gün sayısı
         _, gun_sayisi = calendar.monthrange(yil, ay)
@@ -227,7 +252,16 @@ class ScenarioGenerator:
         manuel_tatiller = self._uret_manuel_tatiller(yil, ay, gun_sayisi)
         
         # Alan ve vardiya modları
-        if profil["alan_aktif"]:
+        if profil["alan_aktif"] and profil.get("alan_sayisi"):
+            alanlar = self._uret_alanlar_buyuk(
+                profil["alan_sayisi"], self._uret_vardiya_tipleri(profil.get("vardiya_sayisi", 3))
+            )
+            personel_alan_yetkinlikleri = self._uret_alan_yetkinlikleri(
+                personel_list, alanlar
+            )
+            alan_modu_aktif = True
+            alan_bazli_denklik = self.rng.choice([True, False])
+        elif profil["alan_aktif"]:
             alanlar = self._uret_alanlar_sinirli(len(personel_list), gun_sayisi)
             personel_alan_yetkinlikleri = self._uret_alan_yetkinlikleri(
                 personel_list, alanlar
@@ -241,21 +275,34 @@ class ScenarioGenerator:
             alan_bazli_denklik = False
         
         if profil["vardiya_aktif"]:
-            vardiya_tipleri = self._uret_vardiya_tipleri()
+            vardiya_tipleri = self._uret_vardiya_tipleri(profil.get("vardiya_sayisi", 3))
             personel_vardiya_kisitlari = self._uret_vardiya_kisitlari(
                 personel_list, vardiya_tipleri
             )
         else:
             vardiya_tipleri = []
             personel_vardiya_kisitlari = {}
-        
+
+        if profil.get("alan_sayisi"):
+            # Büyük model: vardiya kısıtı yetkin olduğu alanların hiçbirinde çalışmayan
+            # kişiye tüm vardiyaları olan ilk alanı ekle (aksi halde kişinin hiç ataması olmaz)
+            tam_alan = next(a["isim"] for a in alanlar if len(a["vardiya_tipleri"]) == len(vardiya_tipleri))
+            alan_vardiyalari = {a["isim"]: set(a["vardiya_tipleri"]) for a in alanlar}
+            for isim, kisitlar in personel_vardiya_kisitlari.items():
+                yetkin = personel_alan_yetkinlikleri.get(isim)
+                if yetkin and not any(alan_vardiyalari[a] & set(kisitlar) for a in yetkin):
+                    yetkin.append(tam_alan)
+
         # Toplam kapasiteyi hesapla
         if alanlar:
             toplam_kontenjan = sum(a.get("kontenjan", 1) for a in alanlar)
         else:
             toplam_kontenjan = 1
         
-        if vardiya_tipleri:
+        if profil.get("alan_sayisi"):
+            # Büyük model: alan kontenjanı zaten günlük slot sayısı
+            gunluk_slot = toplam_kontenjan
+        elif vardiya_tipleri:
             gunluk_slot = toplam_kontenjan * len(vardiya_tipleri)
         else:
             gunluk_slot = toplam_kontenjan
@@ -267,7 +314,8 @@ class ScenarioGenerator:
         
         # Kıdem gruplarını oluştur - toplam hedef = kapasite olacak şekilde
         kidem_gruplari, personel_kidem_gruplari = self._uret_kidem_dengeli(
-            personel_list, vardiya_tipleri, kisi_basi_ortalama, toplam_kapasite
+            personel_list, vardiya_tipleri, kisi_basi_ortalama, toplam_kapasite,
+            vardiya_hedefli=profil.get("vardiya_hedefleri", True)
         )
         
         # Varsayılan hedefi kıdem gruplarından hesapla (max 25 ile sınırla)
@@ -275,7 +323,17 @@ class ScenarioGenerator:
             varsayilan_hedef = min(25, int(sum(g.get("varsayilan_hedef", 8) for g in kidem_gruplari) / len(kidem_gruplari)))
         else:
             varsayilan_hedef = min(25, int(kisi_basi_ortalama))
-        
+
+        if profil.get("alan_sayisi"):
+            # Büyük model: birlikte tutma minimumu iki kişinin hedefini aşmasın
+            grup_hedefi = {g["isim"]: g["varsayilan_hedef"] for g in kidem_gruplari}
+            for cift in want_pairs_list:
+                hedefler = [
+                    personel_targets.get(i, grup_hedefi.get(personel_kidem_gruplari.get(i), varsayilan_hedef))
+                    for i in (cift["a"], cift["b"])
+                ]
+                cift["min"] = min(cift["min"], *hedefler)
+
         return {
             # === ZORUNLU ANAHTARLAR ===
             "personel_list": personel_list,
@@ -601,6 +659,34 @@ class ScenarioGenerator:
         
         return alanlar
     
+    def _uret_alanlar_buyuk(self, sayi: int, vardiya_tipleri: List[Dict]) -> List[Dict]:
+        """
+        Büyük model alanları: her alan vardiyaların bir alt kümesinde çalışır ve
+        kontenjanı bu vardiya sayısıdır (vardiya başına en az 1 kişi ile aynı).
+        """
+        alan_isimleri = [
+            "Acil", "Yoğun Bakım", "Poliklinik", "Ameliyathane", "Servis",
+            "Travma", "Resüsitasyon", "Pediatri", "Gözlem", "Triaj",
+            "Kardiyoloji", "Nöroloji"
+        ]
+        vardiya_isimleri = [v["isim"] for v in vardiya_tipleri]
+        alanlar = []
+        for i in range(sayi):
+            isim = alan_isimleri[i] if i < len(alan_isimleri) else f"Alan {i + 1}"
+            # Yarısı 7/24 (tüm vardiyalar), diğerleri 2-4 vardiyalık alt küme
+            if i % 2 == 0 or len(vardiya_isimleri) <= 2:
+                tipler = list(vardiya_isimleri)
+            else:
+                tipler = self.rng.sample(vardiya_isimleri, self.rng.randint(2, min(4, len(vardiya_isimleri))))
+            alanlar.append({
+                "isim": isim,
+                "kontenjan": len(tipler),
+                "max_kontenjan": None,
+                "renk": RENKLER[i % len(RENKLER)],
+                "vardiya_tipleri": tipler
+            })
+        return alanlar
+    
     def _uret_alanlar(self) -> List[Dict]:
         """
         Çalışma alanları üret.
@@ -639,11 +725,12 @@ class ScenarioGenerator:
         
         return yetkinlikler
     
-    def _uret_vardiya_tipleri(self) -> List[Dict]:
+    def _uret_vardiya_tipleri(self, sayi: int = 3) -> List[Dict]:
         """
         Vardiya tipleri üret.
+        3: Sabah/Akşam/Gece; 6: 12 ve 24 saatlik vardiyalar da eklenir (büyük model).
         """
-        return [
+        tipler = [
             {
                 "isim": "Sabah",
                 "baslangic": "08:00",
@@ -661,8 +748,27 @@ class ScenarioGenerator:
                 "baslangic": "00:00",
                 "bitis": "08:00",
                 "renk": "#9C27B0"
+            },
+            {
+                "isim": "Gündüz 12",
+                "baslangic": "08:00",
+                "bitis": "20:00",
+                "renk": "#FFC107"
+            },
+            {
+                "isim": "Gece 12",
+                "baslangic": "20:00",
+                "bitis": "08:00",
+                "renk": "#3F51B5"
+            },
+            {
+                "isim": "Tam Gün",
+                "baslangic": "08:00",
+                "bitis": "08:00",
+                "renk": "#F44336"
             }
         ]
+        return tipler[:max(1, min(sayi, len(tipler)))]
     
     def _uret_vardiya_kisitlari(
         self,
@@ -692,10 +798,12 @@ class ScenarioGenerator:
         personel_list: List[str],
         vardiya_tipleri: List[Dict],
         kisi_basi_ortalama: float,
-        toplam_kapasite: int
+        toplam_kapasite: int,
+        vardiya_hedefli: bool = True
     ) -> Tuple[List[Dict], Dict[str, str]]:
         """
         Kıdem grupları - toplam hedef >= kapasite olacak şekilde dengeli.
+        vardiya_hedefli False ise vardiya bazlı hedef üretilmez (sadece toplam hedef).
         """
         n = len(personel_list)
         
@@ -728,7 +836,7 @@ class ScenarioGenerator:
         orta_hedef = max(1, min(25, orta_hedef))
         yeni_hedef = max(1, min(25, yeni_hedef))
         
-        if vardiya_tipleri and len(vardiya_tipleri) > 0:
+        if vardiya_tipleri and len(vardiya_tipleri) > 0 and vardiya_hedefli:
             kidem_gruplari = [
                 {
                     "isim": "Kıdemli",
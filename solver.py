@@ -10,9 +10,18 @@ v2.6 - Vardiya desteği:
 - Alan-vardiya eşleştirmesi
 """
 
+import bisect
+import hashlib
+import json
+import queue
+import threading
+import time
+from collections import defaultdict
 from ortools.sat.python import cp_model
-from typing import Dict, List, Set, Tuple, Optional
-from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Set, Tuple, Optional
+from dataclasses import asdict, dataclass, field, replace
+
+import numpy as np
 
 from utils import ay_gun_sayisi, gunleri_weekday_ile_filtrele
 
@@ -84,8 +93,53 @@ class SolverConfig:
 
     saat_bazli_denge: bool = True
 
+    # Birbirinin yerine geçebilen personeli ilk nöbet gününe göre sırala (simetri kırma)
+    simetri_kirma: bool = True
+
+    # Onarım modu (yayınlanmış plana küçük düzenleme)
+    w_onarim_degisiklik: int = 2000  # Değişen her atama için ceza
+    onarim_komsuluk_gun: int = 1  # Değişen günlerin etrafında serbest bırakılan gün yarıçapı
+    onarim_sure_saniye: float = 5.0  # Genişletilmiş komşulukta deneme başına süre
+
     max_sure_saniye: float = 60.0
     thread_sayisi: int = 8
+    
+    # Uyarlanır süre: max_sure_saniye yerine model boyutundan tahmin edilen bütçe
+    # min_sure + sure_katsayisi × (değişken / 1000) × (1 + 2 × sıkılık), [min_sure, ust_sure] aralığında.
+    # Kütüphane varsayılanı sabit süredir; arayüz ve komut satırı araçları girdi.ARAC_SURE_POLITIKASI'nı açar
+    uyarlanir_sure: bool = False
+    min_sure_saniye: float = 5.0
+    uyarlanir_ust_sure_saniye: float = 300.0
+    sure_katsayisi: float = 4.0
+    
+    # Erken durma (0: kapalı): göreli boşluk eşiği ve en iyi çözümün iyileşmediği süre
+    bosluk_esigi: float = 0.0
+    durgunluk_saniye: float = 0.0
+    
+    # Kademeli (leksikografik) amaç: aileler AMAC_KADEMELERI sırasıyla ayrı ayrı optimize edilir.
+    # Kademe başına süre; liste kısaysa son değer tekrarlanır, kullanılmayan süre sonraki kademeye devreder.
+    kademeli_amac: bool = False
+    kademe_sureleri_saniye: List[float] = field(default_factory=lambda: [20.0, 20.0, 20.0])
+    
+    # Büyük model modu: geçerli (p, g, a, v) atama sayısı bu eşiği aşınca (0: kapalı)
+    # açgözlü başlangıç çizelgesi hint olarak verilir ve CP-SAT ön işlemesi hafifletilir.
+    # Hedef ölçek 300+ personel, 10 alan, 6 vardiya (~200 bin değişken): 16 çekirdekte
+    # model inşası < 5 sn, ilk uygun çözüm < 60 sn.
+    buyuk_model_esigi: int = 100_000
+    
+    # Ek CP-SAT parametreleri, ör. {"random_seed": 3, "linearization_level": 2}
+    cp_sat_parametreleri: Dict[str, object] = field(default_factory=dict)
+
+
+# Kademeli amaçta öncelik sırası: (kademe adı, amaç ailesi isimleri).
+# Burada adı geçmeyen aileler son kademeye eklenir.
+AMAC_KADEMELERI: List[Tuple[str, Tuple[str, ...]]] = [
+    ("kapsama", ("alan_kontenjan_soft", "vardiya_minimum_kontenjan_soft")),
+    ("adalet", ("gunluk_alan_dengesi", "gunluk_kisi_dengesi", "alan_bazli_denklik",
+                "saat_bazli_denge", "hafta_sonu_adaleti", "onarim_kisitlari")),
+    ("tercih", ("iki_gun_bosluk_tercihi", "birlikte_tutma_kurallari",
+                "esnek_ayri_tutma_kurallari", "tercih_edilen_gunler")),
+]
 
 
 @dataclass
@@ -114,6 +168,9 @@ class SolverInput:
     vardiyalar: List[VardiyaTanimi] = field(default_factory=list)
     personel_vardiya_kisitlari: Dict[str, List[str]] = field(default_factory=dict)
     
+    # Önceki aylardan devreden adalet sayıları: {"cuma"|"cts"|"paz"|"tatil": {kisi: sayi}}
+    adalet_devri: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    
     config: SolverConfig = None
     
     def __post_init__(self):
@@ -129,11 +186,286 @@ class SolverInput:
         return len(self.vardiyalar) > 0
 
 
+# Model formülasyonu değişince artırılır; eski önbellek girdileri geçersizleşir
+PARMAK_IZI_SURUMU = 2
+
+
+def _kanonik(deger):
+    """Set/tuple/dict değerlerini sıradan bağımsız, JSON'a yazılabilir biçime çevirir"""
+    if isinstance(deger, dict):
+        return {str(k): _kanonik(v) for k, v in deger.items()}
+    if isinstance(deger, (set, frozenset)):
+        return sorted((_kanonik(v) for v in deger), key=lambda v: json.dumps(v, sort_keys=True))
+    if isinstance(deger, (list, tuple)):
+        return [_kanonik(v) for v in deger]
+    return deger
+
+
+def girdi_parmak_izi(input_data: SolverInput) -> str:
+    """
+    SolverInput + SolverConfig için sıradan bağımsız SHA-256 parmak izi.
+    
+    Anlamı sıraya bağlı olmayan alanlar (personel listesi, çift kuralları,
+    yetkinlik listeleri) normalize edilir; alan ve vardiya sırası korunur.
+    """
+    veri = asdict(input_data)
+    veri["personeller"] = sorted(veri["personeller"])
+    veri["ayri_tut"] = sorted(sorted(cift) for cift in veri["ayri_tut"])
+    veri["esnek_ayri_tut"] = sorted(sorted(cift) for cift in veri["esnek_ayri_tut"])
+    veri["birlikte_tut"] = sorted([*sorted((a, b)), k] for a, b, k in veri["birlikte_tut"])
+    for anahtar in ("personel_alan_yetkinlikleri", "personel_vardiya_kisitlari"):
+        veri[anahtar] = {k: sorted(v) for k, v in veri[anahtar].items()}
+    for alan in veri["alanlar"]:
+        alan["vardiya_tipleri"] = sorted(alan["vardiya_tipleri"])
+    veri["surum"] = PARMAK_IZI_SURUMU
+    
+    metin = json.dumps(_kanonik(veri), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(metin.encode("utf-8")).hexdigest()
+
+
+def sonuc_atamalari(sonuc: Dict, alan_isimleri: List[str] = None) -> List[Tuple[int, Optional[str], Optional[str], str]]:
+    """
+    Herhangi bir sonuç formatını (gün, alan, vardiya, isim) demetlerine açar.
+    
+    İki seviyeli {gün: {anahtar: [isim, ...]}} formatında anahtar alan_isimleri
+    içindeyse alan, değilse vardiya kabul edilir. Gün anahtarları str olabilir (JSON).
+    """
+    alan_isimleri = set(alan_isimleri or [])
+    atamalar = []
+    for gun_anahtar, gun_data in sonuc.items():
+        gun = int(gun_anahtar)
+        if isinstance(gun_data, list):
+            atamalar.extend((gun, None, None, isim) for isim in gun_data)
+            continue
+        for anahtar, deger in gun_data.items():
+            if isinstance(deger, dict):
+                for vardiya_isim, kisiler in deger.items():
+                    atamalar.extend((gun, anahtar, vardiya_isim, isim) for isim in kisiler)
+            elif anahtar in alan_isimleri:
+                atamalar.extend((gun, anahtar, None, isim) for isim in deger)
+            else:
+                atamalar.extend((gun, None, anahtar, isim) for isim in deger)
+    atamalar.sort(key=lambda t: t[0])
+    return atamalar
+
+
+@dataclass
+class AileIstatistigi:
+    """Tek bir kısıt ailesinin (builder metodunun) model inşasına katkısı"""
+    isim: str
+    sure_saniye: float
+    eklenen_degisken: int
+    eklenen_kisit: int
+    amac_terimi: int
+    
+    def to_dict(self) -> dict:
+        return {
+            "isim": self.isim,
+            "sure_saniye": round(self.sure_saniye, 4),
+            "eklenen_degisken": self.eklenen_degisken,
+            "eklenen_kisit": self.eklenen_kisit,
+            "amac_terimi": self.amac_terimi
+        }
+
+
+@dataclass
+class KademeSonucu:
+    """Kademeli amaçta tek bir kademenin çözümü"""
+    isim: str
+    aileler: List[str]
+    durum: str
+    amac_degeri: float  # Yalnızca bu kademenin terimleri
+    en_iyi_sinir: float
+    sure_saniye: float
+    dal_sayisi: int = 0
+    catisma_sayisi: int = 0
+    
+    def to_dict(self) -> dict:
+        return {
+            "isim": self.isim,
+            "aileler": self.aileler,
+            "durum": self.durum,
+            "amac_degeri": self.amac_degeri,
+            "en_iyi_sinir": self.en_iyi_sinir,
+            "sure_saniye": round(self.sure_saniye, 4),
+            "dal_sayisi": self.dal_sayisi,
+            "catisma_sayisi": self.catisma_sayisi
+        }
+
+
+@dataclass
+class CozumRaporu:
+    """Çözüm sonrası durum, sınır ve amaç fonksiyonunun aile bazında dökümü"""
+    durum: str = ""
+    amac_degeri: float = 0.0
+    en_iyi_sinir: float = 0.0
+    bosluk: float = 0.0  # |amaç - sınır| / max(1, |amaç|)
+    sure_saniye: float = 0.0
+    dal_sayisi: int = 0
+    catisma_sayisi: int = 0
+    sure_butcesi_saniye: float = 0.0
+    durma_nedeni: str = ""  # "optimal", "bosluk", "durgunluk", "sure", "durduruldu", "cozumsuz"
+    aile_maliyetleri: Dict[str, float] = field(default_factory=dict)  # Sadece amaca terim ekleyen aileler
+    kademeler: List[KademeSonucu] = field(default_factory=list)  # Kademeli amaç modunda dolu
+    
+    def to_dict(self) -> dict:
+        return {
+            "durum": self.durum,
+            "amac_degeri": self.amac_degeri,
+            "en_iyi_sinir": self.en_iyi_sinir,
+            "bosluk": round(self.bosluk, 6),
+            "sure_saniye": round(self.sure_saniye, 4),
+            "dal_sayisi": self.dal_sayisi,
+            "catisma_sayisi": self.catisma_sayisi,
+            "sure_butcesi_saniye": round(self.sure_butcesi_saniye, 2),
+            "durma_nedeni": self.durma_nedeni,
+            "aile_maliyetleri": self.aile_maliyetleri,
+            "kademeler": [k.to_dict() for k in self.kademeler]
+        }
+
+
+@dataclass
+class ModelRaporu:
+    """Model inşa profili, CP-SAT model istatistikleri ve çözüm raporu"""
+    aileler: List[AileIstatistigi] = field(default_factory=list)
+    toplam_degisken: int = 0
+    toplam_kisit: int = 0
+    toplam_amac_terimi: int = 0
+    insa_suresi_saniye: float = 0.0
+    cp_sat_model_istatistikleri: str = ""
+    ipucu_istatistikleri: Dict[str, int] = field(default_factory=dict)
+    onarim_istatistikleri: Dict = field(default_factory=dict)
+    cozum: Optional[CozumRaporu] = None
+    
+    def en_yavas(self, n: int = 5) -> List[AileIstatistigi]:
+        """İnşa süresine göre en yavaş n aileyi döndürür"""
+        return sorted(self.aileler, key=lambda a: -a.sure_saniye)[:n]
+    
+    def to_dict(self) -> dict:
+        return {
+            "aileler": [a.to_dict() for a in self.aileler],
+            "toplam_degisken": self.toplam_degisken,
+            "toplam_kisit": self.toplam_kisit,
+            "toplam_amac_terimi": self.toplam_amac_terimi,
+            "insa_suresi_saniye": round(self.insa_suresi_saniye, 4),
+            "cp_sat_model_istatistikleri": self.cp_sat_model_istatistikleri,
+            "ipucu_istatistikleri": self.ipucu_istatistikleri,
+            "onarim_istatistikleri": self.onarim_istatistikleri,
+            "cozum": self.cozum.to_dict() if self.cozum else None
+        }
+
+
+@dataclass
+class AraCozum:
+    """
+    Çözüm sırasında bulunan (iyileşen) bir çözüm.
+    
+    atamalar (k, 4) int32 dizisidir; her satır bir atamadır: (personel_idx, gün, alan_idx, vardiya_idx).
+    İç içe sözlük formatındaki sonuc ilk erişildiğinde bu diziden kurulur.
+    """
+    atamalar: np.ndarray
+    amac_degeri: float
+    en_iyi_sinir: float
+    gecen_sure: float
+    cozum_no: int
+    son: bool = False  # True ise arama bitti, bu nihai çözüm
+    durum: str = "ARA"  # "ARA", "OPTIMAL", "FEASIBLE"
+    _sonuc_kur: Optional[Callable[[np.ndarray], Dict]] = field(default=None, repr=False, compare=False)
+    _sonuc: Optional[Dict] = field(default=None, repr=False, compare=False)
+    
+    @property
+    def sonuc(self) -> Dict:
+        if self._sonuc is None:
+            self._sonuc = self._sonuc_kur(self.atamalar)
+        return self._sonuc
+
+
+class _DurgunlukBekcisi(cp_model.CpSolverSolutionCallback):
+    """
+    En iyi çözüm durgunluk_saniye boyunca iyileşmezse aramayı durdurur.
+    Sayaç ilk çözümle başlar; with bloğu içinde arka planda izler.
+    """
+    
+    def __init__(self, solver: cp_model.CpSolver, durgunluk_saniye: float):
+        super().__init__()
+        self._solver = solver
+        self._durgunluk = durgunluk_saniye
+        self._bitti = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.son_iyilesme: Optional[float] = None
+        self.tetiklendi = False
+    
+    def iyilesme(self):
+        self.son_iyilesme = time.perf_counter()
+    
+    def OnSolutionCallback(self):
+        self.iyilesme()
+    
+    def _izle(self):
+        while not self._bitti.wait(0.1):
+            if self.son_iyilesme is not None and time.perf_counter() - self.son_iyilesme >= self._durgunluk:
+                self.tetiklendi = True
+                self._solver.StopSearch()
+                return
+    
+    def __enter__(self):
+        if self._durgunluk > 0:
+            self._thread = threading.Thread(target=self._izle, daemon=True)
+            self._thread.start()
+        return self
+    
+    def __exit__(self, *args):
+        self._bitti.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+class _AraCozumToplayici(cp_model.CpSolverSolutionCallback):
+    """Her yeni çözümü AraCozum olarak kuyruğa yazar"""
+    
+    def __init__(self, nobet_solver: "NobetSolver", kuyruk: queue.Queue,
+                 bekci: Optional[_DurgunlukBekcisi] = None):
+        super().__init__()
+        self._nobet_solver = nobet_solver
+        self._kuyruk = kuyruk
+        self._bekci = bekci
+        self.cozum_sayisi = 0
+        self.son_cozum: Optional[AraCozum] = None
+    
+    def OnSolutionCallback(self):
+        if self._bekci is not None:
+            self._bekci.iyilesme()
+        self.cozum_sayisi += 1
+        self.son_cozum = self._nobet_solver._ara_cozum(
+            self._nobet_solver._atama_dizisi(self.Response()),
+            amac_degeri=self.ObjectiveValue(),
+            en_iyi_sinir=self.BestObjectiveBound(),
+            gecen_sure=self.WallTime(),
+            cozum_no=self.cozum_sayisi
+        )
+        self._kuyruk.put(self.son_cozum)
+
+
 class NobetSolver:
     """CP-SAT tabanlı nöbet çizelgesi optimizasyonu."""
     
-    def __init__(self, input_data: SolverInput):
+    def __init__(
+        self,
+        input_data: SolverInput,
+        ipucu_sonuc: Optional[Dict] = None,
+        amac_ust_siniri: Optional[int] = None
+    ):
+        """
+        Args:
+            input_data: Solver girdileri
+            ipucu_sonuc: Sıcak başlangıç için kayıtlı bir çizelge (AylikPlan.sonuc formatında).
+                Yeni değişken uzayına eşlenip onarılarak CP-SAT'a hint olarak verilir.
+            amac_ust_siniri: Amaç değeri için üst sınır (cutoff); bilinen bir çözümden
+                kötü dalları baştan keser
+        """
         self.input = input_data
+        self.ipucu_sonuc = ipucu_sonuc
+        self.amac_ust_siniri = amac_ust_siniri
         self.gun_sayisi = ay_gun_sayisi(input_data.yil, input_data.ay)
         self.n_personel = len(input_data.personeller)
         self.name_to_idx = {name: i for i, name in enumerate(input_data.personeller)}
@@ -148,75 +480,929 @@ class NobetSolver:
         
         self.vardiya_saatleri = {v.isim: v.saat for v in input_data.vardiyalar}
         
+        # Çatışma analizi modu: (varsayım literal'i, aile, mesaj, gün, detay) listesi.
+        # None değilse hard kısıtlar bu literal'lere koşullanır.
+        self.varsayimlar: Optional[List[Tuple]] = None
+        
+        # Onarım modu: sabitlenecek eski atamalar ve serbest bırakılan kişi-günler
+        self.onarim_eski: Optional[Set[Tuple[int, int, int, int]]] = None
+        self.onarim_serbest: Set[Tuple[int, int]] = set()
+        
+        self._model_durumunu_sifirla()
+    
+    def _model_durumunu_sifirla(self):
+        """Modeli ve seyrek indeksleri boşaltır (onarım denemeleri arasında yeniden kurulum için)"""
         self.model = cp_model.CpModel()
         self.x = {}
         self.objective_terms = []
+        # Aile adı -> objective_terms içindeki [başlangıç, bitiş) aralığı
+        self.amac_aile_araliklari: Dict[str, Tuple[int, int]] = {}
+        
+        # Seyrek indeksler - sadece izin verilen (p, g, a, v) demetleri
+        self.kisi_gun_x: Dict[Tuple[int, int], List] = defaultdict(list)
+        self.gun_alan_vardiya_x: Dict[Tuple[int, int, int], Dict[int, cp_model.IntVar]] = defaultdict(dict)
+        self.kisi_atamalari: Dict[int, List[Tuple[int, int, int]]] = defaultdict(list)
+        self.kisi_alan_x: Dict[Tuple[int, int], List] = defaultdict(list)
+        self.kisi_vardiya_x: Dict[Tuple[int, int], List] = defaultdict(list)
+        
+        # Birden fazla ailenin paylaştığı ara değişkenler (bir kez oluşturulur)
+        self.alan_gun_toplamlari: Dict[Tuple[int, int], cp_model.IntVar] = {}  # (a, g) -> kişi sayısı
+        self.gunasiri_x: Dict[Tuple[int, int], cp_model.IntVar] = {}  # (p, g) -> g ve g+2 çalışıyor
+        
+        # Kişi-gün toplam katmanı: calisiyor[p, g] = 1 ise o gün herhangi bir alan/vardiyada çalışıyor
+        self.calisiyor: Dict[Tuple[int, int], cp_model.IntVar] = {}
+        
+        # Modelde birbirinin yerine geçebilen personel sınıfları (indeks listeleri)
+        self.denklik_siniflari: List[List[int]] = []
+        
+        # self.x sırasıyla (p, g, a, v) anahtarları ve CP-SAT değişken indeksleri (toplu değer okuma)
+        self._x_anahtarlari = np.empty((0, 4), dtype=np.int32)
+        self._x_indeksleri = np.empty(0, dtype=np.int64)
+        
+        self.rapor = ModelRaporu()
+        self.son_cozum: Optional[AraCozum] = None  # Son çözümün amaç/durum bilgisi
+    
+    @property
+    def buyuk_model(self) -> bool:
+        """Geçerli atama sayısı SolverConfig.buyuk_model_esigi'ni aşıyor mu"""
+        esik = self.input.config.buyuk_model_esigi
+        return esik > 0 and len(self.x) > esik
     
     def coz(self) -> Dict:
+        self._modeli_kur()
+        if self.input.config.kademeli_amac:
+            for _ in self._kademeli_akis():
+                pass
+            return self.son_cozum.sonuc
+        return self._coz_ve_sonuc_al()
+    
+    def coz_raporlu(self) -> Tuple[Dict, ModelRaporu]:
+        """Çözümü model inşa raporuyla birlikte döndürür"""
+        sonuc = self.coz()
+        return sonuc, self.rapor
+    
+    def coz_akis(self) -> Iterator[AraCozum]:
+        """
+        Çözümü akış olarak üretir: CP-SAT her iyileşen çözüm bulduğunda
+        bir AraCozum döner, arama bitince son=True olan nihai çözüm gelir.
+        
+        Tüketici döngüden erken çıkarsa (break / generator.close) arama
+        durdurulur; o ana kadarki en iyi çözüm tüketicide kalır.
+        """
+        self._modeli_kur()
+        if self.input.config.kademeli_amac:
+            # Kademe içi ara çözümler akışa verilmez; her kademe sonu bir AraCozum'dur
+            yield from self._kademeli_akis()
+            return
+        
+        kuyruk: queue.Queue = queue.Queue()
+        solver = self._cp_solver_olustur()
+        bekci = _DurgunlukBekcisi(solver, self.input.config.durgunluk_saniye)
+        toplayici = _AraCozumToplayici(self, kuyruk, bekci)
+        durum = {}
+        
+        def calistir():
+            try:
+                durum["status"] = solver.Solve(self.model, toplayici)
+            finally:
+                kuyruk.put(None)
+        
+        thread = threading.Thread(target=calistir, daemon=True)
+        with bekci:
+            thread.start()
+            try:
+                while True:
+                    ara = kuyruk.get()
+                    if ara is None:
+                        break
+                    yield ara
+            finally:
+                # Tüketici erken çıktıysa aramayı durdur
+                solver.StopSearch()
+                thread.join()
+        
+        status = durum.get("status")
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE) or toplayici.son_cozum is None:
+            raise ValueError("Çözüm bulunamadı (kısıtlar fazla sıkı olabilir).")
+        
+        self._cozum_raporunu_olustur(solver, status, durgunluk=bekci.tetiklendi)
+        # Son ara çözümün dizisi (ve kurulmuşsa sözlüğü) yeniden okunmadan kullanılır
+        self.son_cozum = replace(
+            toplayici.son_cozum,
+            amac_degeri=solver.ObjectiveValue(),
+            en_iyi_sinir=solver.BestObjectiveBound(),
+            gecen_sure=solver.WallTime(),
+            son=True,
+            durum=solver.StatusName(status)
+        )
+        yield self.son_cozum
+    
+    def _amac_kademeleri(self) -> List[Tuple[str, List[str], List]]:
+        """Modeldeki amaç terimlerini AMAC_KADEMELERI'ne göre gruplar: (kademe, aileler, terimler)"""
+        kademeler = [(isim, [], []) for isim, _ in AMAC_KADEMELERI]
+        aile_kademesi = {aile: i for i, (_, aileler) in enumerate(AMAC_KADEMELERI) for aile in aileler}
+        for aile, (bas, bit) in self.amac_aile_araliklari.items():
+            _, aileler, terimler = kademeler[aile_kademesi.get(aile, len(kademeler) - 1)]
+            aileler.append(aile)
+            terimler.extend(self.objective_terms[bas:bit])
+        return [k for k in kademeler if k[2]]
+    
+    def _kademeli_akis(self) -> Iterator[AraCozum]:
+        """
+        Amaç ailelerini kademe kademe optimize eder (_modeli_kur sonrası çağrılır).
+        
+        Her kademe yalnızca kendi terimlerini minimize eder; bulunan değer sonraki
+        kademelerde üst sınır olarak sabitlenir ve kademe çözümü sonrakine hint
+        olarak verilir. Kademe süresi dolmadan optimum kanıtlanırsa kalan süre
+        sonraki kademeye devreder. Her kademe sonunda bir AraCozum döner.
+        
+        Sonraki bir kademe süresi içinde çözüm bulamazsa önceki kademenin
+        çözümüyle yetinilir.
+        """
+        config = self.input.config
+        sureler = config.kademe_sureleri_saniye or [config.max_sure_saniye]
+        kademeler = self._amac_kademeleri() or [("tum", [], [])]
+        
+        kademe_sonuclari: List[KademeSonucu] = []
+        son_solver = son_status = None
+        devreden = 0.0
+        for i, (isim, aileler, terimler) in enumerate(kademeler):
+            butce = sureler[min(i, len(sureler) - 1)] + devreden
+            self.model.Minimize(sum(terimler))
+            solver = self._cp_solver_olustur()
+            solver.parameters.max_time_in_seconds = butce
+            status = solver.Solve(self.model)
+            if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                if son_solver is None:
+                    raise ValueError("Çözüm bulunamadı (kısıtlar fazla sıkı olabilir).")
+                break
+            
+            devreden = max(0.0, butce - solver.WallTime())
+            deger = int(round(solver.ObjectiveValue()))
+            kademe_sonuclari.append(KademeSonucu(
+                isim=isim,
+                aileler=aileler,
+                durum=solver.StatusName(status),
+                amac_degeri=deger,
+                en_iyi_sinir=solver.BestObjectiveBound(),
+                sure_saniye=solver.WallTime(),
+                dal_sayisi=solver.NumBranches(),
+                catisma_sayisi=solver.NumConflicts()
+            ))
+            son_solver, son_status = solver, status
+            
+            # Kademe değerini sabitle, çözümü sonraki kademeye hint olarak ver
+            if terimler:
+                self.model.Add(sum(terimler) <= deger)
+            degerler = self._x_degerleri(solver.ResponseProto())
+            secilen = set(map(tuple, self._x_anahtarlari[degerler == 1].tolist()))
+            self.model.ClearHints()
+            self._ipucu_ver(secilen, {(p, g) for p, g, _, _ in secilen})
+            
+            if i < len(kademeler) - 1:
+                yield self._ara_cozum(
+                    self._x_anahtarlari[degerler == 1],
+                    amac_degeri=sum(solver.Value(t) for t in self.objective_terms),
+                    en_iyi_sinir=solver.BestObjectiveBound(),
+                    gecen_sure=sum(k.sure_saniye for k in kademe_sonuclari),
+                    cozum_no=i + 1
+                )
+        
+        self._cozum_raporunu_olustur(son_solver, son_status, kademe_sonuclari)
+        cozum = self.rapor.cozum
+        self.son_cozum = self._ara_cozum(
+            self._atama_dizisi(son_solver.ResponseProto()),
+            amac_degeri=cozum.amac_degeri,
+            en_iyi_sinir=cozum.en_iyi_sinir,
+            gecen_sure=cozum.sure_saniye,
+            cozum_no=len(kademe_sonuclari),
+            son=True,
+            durum=cozum.durum
+        )
+        yield self.son_cozum
+    
+    def onar(
+        self,
+        eski_sonuc: Dict,
+        degisen_kisiler: Optional[Set[str]] = None,
+        degisen_gunler: Optional[Set[int]] = None
+    ) -> Dict:
+        """
+        Yayınlanmış bir çizelgeyi düzenlenmiş girdiye göre en az değişiklikle onarır.
+        
+        Değişen kişi ve günlerin komşuluğu dışındaki tüm atamalar sabitlenir; komşulukta
+        her değişen atama w_onarim_degisiklik kadar cezalandırılır. Model çözümsüzse
+        (veya süre içinde çözüm bulunamazsa) komşuluk iki katına genişletilir; en son
+        deneme tüm ayı serbest bırakır.
+        
+        Args:
+            eski_sonuc: Yayınlanmış çizelge (AylikPlan.sonuc formatında)
+            degisen_kisiler: Değişen personel; verilmezse eski plandan tespit edilir
+            degisen_gunler: Değişen günler; verilmezse eski plandan tespit edilir
+        """
+        config = self.input.config
+        baslangic = time.perf_counter()
+        
+        # Eski planı yeni girdiyle karşılaştırmak için domain'i bir kez kur
         self._degiskenleri_olustur()
+        eski, otomatik_kisiler, otomatik_gunler = self._eski_plani_esle(eski_sonuc)
+        
+        kisiler = {self.name_to_idx[k] for k in (degisen_kisiler or ()) if k in self.name_to_idx}
+        kisiler |= otomatik_kisiler
+        gunler = set(degisen_gunler or ()) | otomatik_gunler
+        
+        yaricap = config.onarim_komsuluk_gun
+        denemeler = []
+        while True:
+            tam = yaricap >= self.gun_sayisi
+            serbest_gunler = {g for g in range(1, self.gun_sayisi + 1)
+                              if tam or any(abs(g - d) <= yaricap for d in gunler)}
+            
+            self._model_durumunu_sifirla()
+            self.ipucu_sonuc = eski_sonuc
+            self.onarim_eski = eski
+            self.onarim_serbest = {(p, g) for p in range(self.n_personel)
+                                   for g in range(1, self.gun_sayisi + 1)
+                                   if p in kisiler or g in serbest_gunler}
+            self._modeli_kur()
+            
+            solver = self._cp_solver_olustur()
+            if not tam:
+                solver.parameters.max_time_in_seconds = min(config.onarim_sure_saniye, config.max_sure_saniye)
+            status = solver.Solve(self.model)
+            denemeler.append({
+                "yaricap": "tum_ay" if tam else yaricap,
+                "serbest_kisi_gun": len(self.onarim_serbest),
+                "durum": solver.StatusName(status),
+                "sure_saniye": round(solver.WallTime(), 3)
+            })
+            if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) or tam:
+                break
+            # Değişen gün yoksa genişletecek komşuluk da yok: doğrudan tüm ay
+            yaricap = max(yaricap * 2, 1) if gunler else self.gun_sayisi
+        
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            raise ValueError("Çözüm bulunamadı (kısıtlar fazla sıkı olabilir).")
+        
+        sonuc = self._son_cozumu_kaydet(solver, status)
+        eski_sonuc_atamalari = sonuc_atamalari(eski_sonuc, self.alan_isimleri)
+        yeni = set(map(tuple, self.son_cozum.atamalar.tolist()))
+        self.rapor.onarim_istatistikleri = {
+            "degisen_kisiler": sorted(self.input.personeller[p] for p in kisiler),
+            "degisen_gunler": sorted(gunler),
+            "eklenen_atama": len(yeni - eski),
+            "kaldirilan_atama": len(eski_sonuc_atamalari) - len(eski & yeni),
+            "denemeler": denemeler,
+            "toplam_sure_saniye": round(time.perf_counter() - baslangic, 3)
+        }
+        return sonuc
+    
+    def catisma_cekirdegi(self, max_sure_saniye: float = 10.0, kucult: bool = True) -> List["TeshisSonucu"]:
+        """
+        Çözümsüz girdide birbiriyle çelişen hard kuralların küçük bir alt kümesini bulur.
+        
+        Her hard kural ailesi kişi/çift/gün örnekleri düzeyinde bir varsayım literal'ine
+        koşullanır (izinler dahil). Model amaçsız olarak bu varsayımlarla çözülür;
+        INFEASIBLE ise CP-SAT'ın yeterli varsayım kümesi alınır ve kucult=True iken her
+        kural tek tek çıkarılarak denenir (silme tabanlı küçültme) - sonuç minimal
+        çelişen kümedir.
+        
+        Returns:
+            Çelişen kurallar (TeshisSonucu, tip="cekirdek_<aile>"); model çözülebiliyorsa
+            veya süre içinde karar verilemezse boş liste
+        """
+        baslangic = time.perf_counter()
+        self._model_durumunu_sifirla()
+        self.varsayimlar = []
+        try:
+            self._insa_et(self._degiskenleri_olustur)
+            self._insa_et(self._izin_kisitlari)
+            self._hard_constraints_ekle()
+            # Soft ailedeki tek hard kural: birlikte tutma minimumu
+            self._insa_et(self._birlikte_tutma_kurallari)
+            varsayimlar = self.varsayimlar
+        finally:
+            self.varsayimlar = None
+        
+        literal_bilgi = {k.Index(): (k, aile, mesaj, gun, detay) for k, aile, mesaj, gun, detay in varsayimlar}
+        
+        def coz(aktif: List[int], sure: float):
+            self.model.ClearAssumptions()
+            self.model.AddAssumptions([literal_bilgi[i][0] for i in aktif])
+            solver = cp_model.CpSolver()
+            solver.parameters.max_time_in_seconds = max(sure, 0.1)
+            solver.parameters.num_search_workers = 1
+            status = solver.Solve(self.model)
+            cekirdek = list(solver.SufficientAssumptionsForInfeasibility()) if status == cp_model.INFEASIBLE else []
+            return status, cekirdek
+        
+        status, cekirdek = coz(list(literal_bilgi), max_sure_saniye)
+        if status != cp_model.INFEASIBLE:
+            return []
+        
+        if kucult:
+            # Silme tabanlı küçültme: kural çıkarılınca hâlâ çözümsüzse gereksizdir
+            i = 0
+            while i < len(cekirdek):
+                kalan_sure = max_sure_saniye - (time.perf_counter() - baslangic)
+                if kalan_sure <= 0:
+                    break
+                deneme = cekirdek[:i] + cekirdek[i + 1:]
+                status, yeni = coz(deneme, kalan_sure)
+                if status == cp_model.INFEASIBLE:
+                    # Yeni çekirdek denemenin alt kümesi; sıra korunarak daralt
+                    yeni = set(yeni)
+                    cekirdek = [c for c in deneme if c in yeni]
+                else:
+                    i += 1
+        
+        return [
+            TeshisSonucu(
+                tip=f"cekirdek_{literal_bilgi[i][1]}",
+                seviye="error",
+                gun=literal_bilgi[i][3],
+                mesaj=literal_bilgi[i][2],
+                detay=literal_bilgi[i][4]
+            )
+            for i in cekirdek
+        ]
+    
+    def _izin_kisitlari(self):
+        """Çatışma analizi: izin günlerini kişi başına tek varsayımla yasaklar"""
+        for p, isim in enumerate(self.input.personeller):
+            gunler = sorted(g for g in self.input.izinler.get(isim, set()) if 1 <= g <= self.gun_sayisi)
+            degiskenler = [var for g in gunler for var in self.kisi_gun_x.get((p, g), [])]
+            if not degiskenler:
+                continue
+            k = self._varsayim("izin", f"{isim}: izinli günler {', '.join(map(str, gunler))}",
+                               personel=isim, gunler=gunler)
+            self.model.AddBoolAnd([var.Not() for var in degiskenler]).OnlyEnforceIf(k)
+    
+    def _eski_plani_esle(self, eski_sonuc: Dict) -> Tuple[Set[Tuple[int, int, int, int]], Set[int], Set[int]]:
+        """
+        Eski çizelgeyi (p, g, a, v) demetlerine eşler ve değişikliği tespit eder.
+        
+        Returns:
+            (geçerli eski demetler, değişen personel indeksleri, değişen günler)
+        """
+        eski = set()
+        kisiler, gunler = set(), set()
+        for gun, alan_isim, vardiya_isim, isim in sonuc_atamalari(eski_sonuc, self.alan_isimleri):
+            p = self.name_to_idx.get(isim)
+            a = self.alan_to_idx.get(alan_isim) if self.input.coklu_alan_modu else 0
+            v = self.vardiya_to_idx.get(vardiya_isim) if self.input.vardiya_modu else 0
+            if p is not None and (p, gun, a, v) in self.x:
+                eski.add((p, gun, a, v))
+                continue
+            # Artık geçersiz atama (izin, silinen kişi/alan/vardiya...)
+            if p is not None:
+                kisiler.add(p)
+            if 1 <= gun <= self.gun_sayisi:
+                gunler.add(gun)
+        
+        # Hedefi tutmayan kişiler (hedef değişikliği, yeni personel)
+        sayac = defaultdict(int)
+        for p, g, a, v in eski:
+            sayac[p, v] += 1
+        for p, isim in enumerate(self.input.personeller):
+            vardiya_hedef = self.input.vardiya_hedefleri.get(isim, {})
+            if vardiya_hedef and self.input.vardiya_modu:
+                tutmayan = any(sayac[p, v] != vardiya_hedef.get(vardiya, 0)
+                               for v, vardiya in enumerate(self.vardiya_isimleri))
+            else:
+                toplam = sum(n for (p2, _), n in sayac.items() if p2 == p)
+                tutmayan = toplam != self.input.hedefler.get(isim, 0)
+            if tutmayan:
+                kisiler.add(p)
+        return eski, kisiler, gunler
+    
+    def _onarim_kisitlari(self):
+        """Komşuluk dışındaki atamaları sabitler, komşuluktaki değişiklikleri cezalandırır"""
+        w = self.input.config.w_onarim_degisiklik
+        for (p, g, a, v), var in self.x.items():
+            eskide = (p, g, a, v) in self.onarim_eski
+            if (p, g) not in self.onarim_serbest:
+                self.model.Add(var == (1 if eskide else 0))
+            elif eskide:
+                self.objective_terms.append((1 - var) * w)
+            else:
+                self.objective_terms.append(var * w)
+    
+    def _modeli_kur(self):
+        baslangic = time.perf_counter()
+        self._insa_et(self._degiskenleri_olustur)
         self._hard_constraints_ekle()
+        if self.onarim_eski is not None:
+            self._insa_et(self._onarim_kisitlari)
         self._soft_constraints_ekle()
-        return self._coz_ve_sonuc_al()
+        if self.amac_ust_siniri is not None:
+            self.model.Add(sum(self.objective_terms) <= self.amac_ust_siniri)
+        if self.ipucu_sonuc:
+            self._insa_et(self._ipucu_uygula)
+        elif self.buyuk_model:
+            self._insa_et(self._acgozlu_ipucu)
+        
+        proto = self.model.Proto()
+        self.rapor.toplam_degisken = len(proto.variables)
+        self.rapor.toplam_kisit = len(proto.constraints)
+        self.rapor.toplam_amac_terimi = len(self.objective_terms)
+        self.rapor.insa_suresi_saniye = time.perf_counter() - baslangic
+        self.rapor.cp_sat_model_istatistikleri = self.model.ModelStats()
+    
+    def _insa_et(self, builder):
+        """Bir builder metodunu çalıştırır; süre, değişken, kısıt ve amaç terimi katkısını kaydeder"""
+        proto = self.model.Proto()
+        degisken_once = len(proto.variables)
+        kisit_once = len(proto.constraints)
+        terim_once = len(self.objective_terms)
+        baslangic = time.perf_counter()
+        
+        builder()
+        
+        proto = self.model.Proto()
+        isim = builder.__name__.lstrip("_")
+        if len(self.objective_terms) > terim_once:
+            self.amac_aile_araliklari[isim] = (terim_once, len(self.objective_terms))
+        self.rapor.aileler.append(AileIstatistigi(
+            isim=isim,
+            sure_saniye=time.perf_counter() - baslangic,
+            eklenen_degisken=len(proto.variables) - degisken_once,
+            eklenen_kisit=len(proto.constraints) - kisit_once,
+            amac_terimi=len(self.objective_terms) - terim_once
+        ))
     
     def _degiskenleri_olustur(self):
-        for p in range(self.n_personel):
-            for g in range(1, self.gun_sayisi + 1):
-                for a in range(self.n_alan):
-                    for v in range(self.n_vardiya):
-                        self.x[p, g, a, v] = self.model.NewBoolVar(f"x_{p}_{g}_{a}_{v}")
+        """
+        Sadece izin verilen (personel, gün, alan, vardiya) demetleri için değişken oluşturur.
+        İzin günleri, alan yetkinlikleri, vardiya kısıtları, alan-vardiya eşleşmesi ve
+        sıfır hedefli vardiyalar değişken oluşturulmadan önce elenir.
+        """
+        for p, g, a, v in self._gecerli_atamalari_hesapla():
+            var = self.model.NewBoolVar(f"x_{p}_{g}_{a}_{v}")
+            self.x[p, g, a, v] = var
+            self.kisi_gun_x[p, g].append(var)
+            self.gun_alan_vardiya_x[g, a, v][p] = var
+            self.kisi_atamalari[p].append((g, a, v))
+            self.kisi_alan_x[p, a].append(var)
+            self.kisi_vardiya_x[p, v].append(var)
+        self._x_anahtarlari = np.array(list(self.x), dtype=np.int32).reshape(-1, 4)
+        self._x_indeksleri = np.array([var.Index() for var in self.x.values()], dtype=np.int64)
+        self._calisiyor_katmani_olustur()
+    
+    def _calisiyor_katmani_olustur(self):
+        """
+        Her kişi-gün için tek bir calisiyor[p, g] Boolean'ı oluşturur ve alan/vardiya
+        değişkenlerine bir kez bağlar. calisiyor == sum(x) eşitliği aynı zamanda
+        günde en fazla bir atama kuralını da sağlar. Gün bazlı tüm kurallar bu
+        literal'leri kullanır.
+        """
+        for (p, g), degiskenler in self.kisi_gun_x.items():
+            if len(degiskenler) == 1:
+                # Tek aday varsa ayrı değişkene gerek yok
+                self.calisiyor[p, g] = degiskenler[0]
+                continue
+            c = self.model.NewBoolVar(f"c_{p}_{g}")
+            self.model.Add(cp_model.LinearExpr.Sum(degiskenler) == c)
+            self.calisiyor[p, g] = c
+    
+    def _ve_degiskeni(self, a, b, isim: str):
+        """t == a AND b olan Boolean değişken döndürür"""
+        t = self.model.NewBoolVar(isim)
+        self.model.AddImplication(t, a)
+        self.model.AddImplication(t, b)
+        self.model.AddBoolOr([a.Not(), b.Not(), t])
+        return t
+    
+    def _varsayim(self, aile: str, mesaj: str, gun: Optional[int] = None, **detay):
+        """
+        Çatışma analizi modunda bir kural örneği için varsayım literal'i oluşturur,
+        normal modda None döndürür.
+        """
+        if self.varsayimlar is None:
+            return None
+        k = self.model.NewBoolVar(f"kural_{len(self.varsayimlar)}")
+        self.varsayimlar.append((k, aile, mesaj, gun, detay))
+        return k
+    
+    def _kosullu(self, kisit, k):
+        """Varsayım literal'i varsa kısıtı ona koşullar"""
+        if k is not None:
+            kisit.OnlyEnforceIf(k)
+        return kisit
+    
+    def _en_fazla_bir(self, literaller: List, k):
+        """AddAtMostOne; enforcement desteklemediği için koşulluyken doğrusal yazılır"""
+        if k is None:
+            self.model.AddAtMostOne(literaller)
+        else:
+            self.model.Add(sum(literaller) <= 1).OnlyEnforceIf(k)
+    
+    def _gecerli_atamalari_hesapla(self) -> List[Tuple[int, int, int, int]]:
+        """Domain budama: her personel için mümkün (p, g, a, v) demetlerini döndürür"""
+        # Alan-vardiya eşleşmesi (personelden bağımsız)
+        alan_vardiyalari = {}
+        for a in range(self.n_alan):
+            gecerli_v = list(range(self.n_vardiya))
+            if self.input.coklu_alan_modu and self.input.vardiya_modu:
+                tipler = self.input.alanlar[a].vardiya_tipleri
+                if tipler:
+                    gecerli_v = [v for v in gecerli_v if self.input.vardiyalar[v].isim in tipler]
+            alan_vardiyalari[a] = gecerli_v
+        
+        demetler = []
+        for p, isim in enumerate(self.input.personeller):
+            # Çatışma analizinde izinler domain'den elenmez, _izin_kisitlari ile korunur
+            izinli = self.input.izinler.get(isim, set()) if self.varsayimlar is None else set()
+            gunler = [g for g in range(1, self.gun_sayisi + 1) if g not in izinli]
+            
+            alanlar = list(range(self.n_alan))
+            if self.input.coklu_alan_modu:
+                yetkin = self.input.personel_alan_yetkinlikleri.get(isim, [])
+                if yetkin:
+                    alanlar = [a for a in alanlar if self.input.alanlar[a].isim in yetkin]
+            
+            vardiyalar = set(range(self.n_vardiya))
+            if self.input.vardiya_modu:
+                kisitlar = self.input.personel_vardiya_kisitlari.get(isim, [])
+                if kisitlar:
+                    vardiyalar = {v for v in vardiyalar if self.input.vardiyalar[v].isim in kisitlar}
+                vardiya_hedef = self.input.vardiya_hedefleri.get(isim, {})
+                if vardiya_hedef:
+                    # Hedefi 0 olan vardiyada çalışamaz
+                    vardiyalar = {v for v in vardiyalar
+                                  if vardiya_hedef.get(self.input.vardiyalar[v].isim, 0) != 0}
+                elif self.input.hedefler.get(isim, 0) == 0:
+                    vardiyalar = set()
+            elif self.input.hedefler.get(isim, 0) == 0:
+                vardiyalar = set()
+            
+            for g in gunler:
+                for a in alanlar:
+                    for v in alan_vardiyalari[a]:
+                        if v in vardiyalar:
+                            demetler.append((p, g, a, v))
+        return demetler
     
     def _hard_constraints_ekle(self):
-        self._hedef_nobet_sayilari()
-        self._izin_gunleri()
-        self._kisi_gun_tek_atama()
+        # İzin, alan yetkinliği, vardiya kısıtı ve alan-vardiya eşleşmesi
+        # _gecerli_atamalari_hesapla içinde domain'den elenir
+        # Günde tek atama kuralı calisiyor katmanında sağlanır
+        self._insa_et(self._hedef_nobet_sayilari)
 
         if self.input.coklu_alan_modu:
-            self._alan_yetkinlikleri()
-            self._kidem_kurallari()
+            self._insa_et(self._alan_max_kontenjan)
+            self._insa_et(self._kidem_kurallari)
 
         if self.input.vardiya_modu:
-            self._vardiya_kisitlari()
-            self._alan_vardiya_eslesmesi()
             # Minimum staffing: Hard constraint if enforce_minimum_staffing is True
             if self.input.config.enforce_minimum_staffing:
-                self._vardiya_minimum_kontenjan_hard()
+                self._insa_et(self._vardiya_minimum_kontenjan_hard)
 
         if self.input.config.ardisik_yasak:
-            self._ardisik_gun_yasagi()
+            self._insa_et(self._ardisik_gun_yasagi)
 
         if self.input.config.gunasiri_limit_aktif and self.input.config.max_gunasiri_per_kisi > 0:
-            self._gunasiri_limiti()
+            self._insa_et(self._gunasiri_limiti)
+
+        self._insa_et(self._ayri_tutma_kurallari)
 
-        self._ayri_tutma_kurallari()
+        # Onarımda kişiler eski plana sabitlendiği için simetri yoktur
+        if self.input.config.simetri_kirma and self.onarim_eski is None:
+            self._insa_et(self._simetri_kirma)
     
     def _soft_constraints_ekle(self):
         if self.input.coklu_alan_modu:
-            self._alan_kontenjan_soft()
-            self._gunluk_alan_dengesi()
+            self._insa_et(self._alan_kontenjan_soft)
+            self._insa_et(self._gunluk_alan_dengesi)
             if self.input.alan_bazli_denklik:
-                self._alan_bazli_denklik()
+                self._insa_et(self._alan_bazli_denklik)
         else:
-            self._gunluk_kisi_dengesi()
+            self._insa_et(self._gunluk_kisi_dengesi)
 
         # Minimum staffing: Soft constraint if enforce_minimum_staffing is False
         if self.input.vardiya_modu and not self.input.config.enforce_minimum_staffing:
-            self._vardiya_minimum_kontenjan_soft()
+            self._insa_et(self._vardiya_minimum_kontenjan_soft)
 
         if self.input.config.saat_bazli_denge and self.input.vardiya_modu:
-            self._saat_bazli_denge()
+            self._insa_et(self._saat_bazli_denge)
 
         if self.input.config.hafta_sonu_dengesi_aktif:
-            self._hafta_sonu_adaleti()
+            self._insa_et(self._hafta_sonu_adaleti)
 
         if self.input.config.iki_gun_bosluk_aktif:
-            self._iki_gun_bosluk_tercihi()
+            self._insa_et(self._iki_gun_bosluk_tercihi)
 
-        self._birlikte_tutma_kurallari()
-        self._esnek_ayri_tutma_kurallari()
-        self._tercih_edilen_gunler()
+        self._insa_et(self._birlikte_tutma_kurallari)
+        self._insa_et(self._esnek_ayri_tutma_kurallari)
+        self._insa_et(self._tercih_edilen_gunler)
 
         self.model.Minimize(sum(self.objective_terms))
     
+    def _ipucu_uygula(self):
+        """
+        Kayıtlı çizelgeyi (önceki çözüm veya önceki ay) yeni değişken uzayına eşler
+        ve solution hint olarak verir. Onarım kuralları:
+        - Artık olmayan personel ve ay dışı günler atılır
+        - Alan/vardiya artık yoksa veya kişi için yasaksa, aynı gün kişinin izinli
+          olduğu başka bir alan/vardiyaya taşınır (önce aynı vardiya, sonra aynı alan)
+        - Günde tek atama, ardışık gün yasağı ve hedef üst sınırı korunur
+        """
+        atamalar = sonuc_atamalari(self.ipucu_sonuc, self.alan_isimleri)
+        istatistik = {"toplam": len(atamalar), "eslesen": 0, "onarilan": 0, "atilan": 0}
+        
+        secilen = set()  # (p, g, a, v)
+        dolu_gunler = set()  # (p, g)
+        sayac = defaultdict(int)  # p veya (p, v) -> atama sayısı
+        
+        for gun, alan_isim, vardiya_isim, isim in atamalar:
+            p = self.name_to_idx.get(isim)
+            if p is None or not 1 <= gun <= self.gun_sayisi or (p, gun) in dolu_gunler:
+                istatistik["atilan"] += 1
+                continue
+            if self.input.config.ardisik_yasak and ((p, gun - 1) in dolu_gunler or (p, gun + 1) in dolu_gunler):
+                istatistik["atilan"] += 1
+                continue
+            
+            a = self.alan_to_idx.get(alan_isim) if self.input.coklu_alan_modu else 0
+            v = self.vardiya_to_idx.get(vardiya_isim) if self.input.vardiya_modu else 0
+            
+            onarildi = (p, gun, a, v) not in self.x
+            if not onarildi:
+                demet = (p, gun, a, v)
+            else:
+                # Onarım: aynı gün için geçerli bir alan/vardiya ara
+                adaylar = [(g2, a2, v2) for (g2, a2, v2) in self.kisi_atamalari[p] if g2 == gun]
+                if not adaylar:
+                    istatistik["atilan"] += 1
+                    continue
+                adaylar.sort(key=lambda t: (t[2] != v, t[1] != a))
+                _, a, v = adaylar[0]
+                demet = (p, gun, a, v)
+            
+            vardiya_hedef = self.input.vardiya_hedefleri.get(isim, {})
+            if vardiya_hedef and self.input.vardiya_modu:
+                anahtar, limit = (p, v), vardiya_hedef.get(self.vardiya_isimleri[v], 0)
+            else:
+                anahtar, limit = p, self.input.hedefler.get(isim, 0)
+            if sayac[anahtar] >= limit:
+                istatistik["atilan"] += 1
+                continue
+            
+            sayac[anahtar] += 1
+            secilen.add(demet)
+            dolu_gunler.add((p, gun))
+            istatistik["onarilan" if onarildi else "eslesen"] += 1
+        
+        self._ipucu_ver(secilen, dolu_gunler)
+        self.rapor.ipucu_istatistikleri = istatistik
+    
+    def _ipucu_ver(
+        self,
+        secilen: Set[Tuple[int, int, int, int]],
+        dolu_gunler: Set[Tuple[int, int]],
+        serbest: Set[int] = frozenset()
+    ):
+        """
+        Seçilen (p, g, a, v) atamalarını x ve calisiyor değişkenlerine hint olarak yazar.
+        serbest kişilerin değişkenlerine hint verilmez.
+        """
+        # Simetri kırma aktifse hint'i sınıf içinde ilk nöbet gününe göre yeniden dağıt
+        for sinif in self.denklik_siniflari:
+            ilk_gun = {p: min((g for (p2, g) in dolu_gunler if p2 == p), default=self.gun_sayisi + 1)
+                       for p in sinif}
+            sirali = sorted(sinif, key=lambda p: ilk_gun[p])
+            esleme = dict(zip(sirali, sinif))
+            secilen = {(esleme.get(p, p), g, a, v) for (p, g, a, v) in secilen}
+            dolu_gunler = {(esleme.get(p, p), g) for (p, g) in dolu_gunler}
+        
+        # Proto'ya toplu yazılır; büyük modelde değişken başına AddHint saniyeler sürer
+        x_hint = [(i, 1 if anahtar in secilen else 0)
+                  for anahtar, i in zip(self.x, self._x_indeksleri.tolist()) if anahtar[0] not in serbest]
+        katman = [(p, g) for (p, g), degiskenler in self.kisi_gun_x.items()
+                  if len(degiskenler) > 1 and p not in serbest]
+        hint = self.model.Proto().solution_hint
+        hint.vars.extend([i for i, _ in x_hint] + [self.calisiyor[pg].Index() for pg in katman])
+        hint.values.extend([d for _, d in x_hint] + [1 if pg in dolu_gunler else 0 for pg in katman])
+
+    def _acgozlu_ipucu(self):
+        """
+        Büyük model modu: hızlı bir açgözlü çizelge kurup hint olarak verir. Büyük
+        modelde CP-SAT'ın ilk uygun çözümü bulması dakikalar sürebildiği için arama
+        bu çizelgeden başlar.
+
+        Önce birlikte tutma minimumları ortak müsait günlere yerleştirilir. Sonra
+        günler sırayla doldurulur: her gün/alan/vardiya en az bir kişiyle (en az
+        adaylı olan önce), ardından kendi temposunun gerisinde kalan kişiler en boş
+        alan/vardiyaya. Tempo: hedefi T, müsait günü D olan kişinin k. nöbeti
+        yaklaşık (k + kayma) × D / T. müsait gününe düşer; kişiye özgü kayma
+        nöbetleri günlere yayar. Günde tek atama, ardışık gün, günaşırı limiti,
+        ayrı tutma, alan maksimumu ve hedefler korunur; kıdem kuralları CP-SAT'a
+        bırakılır.
+        """
+        config = self.input.config
+        gunasiri_limiti = config.max_gunasiri_per_kisi if config.gunasiri_limit_aktif else None
+
+        # Kalan hedef: toplam (p) ve vardiya hedefliyse vardiya bazında (p, v)
+        kalan: Dict = {}
+        vardiya_hedefli = set()
+        for p, isim in enumerate(self.input.personeller):
+            vardiya_hedef = self.input.vardiya_hedefleri.get(isim, {}) if self.input.vardiya_modu else {}
+            if vardiya_hedef:
+                vardiya_hedefli.add(p)
+                for v, vardiya in enumerate(self.input.vardiyalar):
+                    kalan[p, v] = vardiya_hedef.get(vardiya.isim, 0)
+                kalan[p] = sum(vardiya_hedef.values())
+            else:
+                kalan[p] = self.input.hedefler.get(isim, 0)
+        hedef = {p: kalan[p] for p in range(self.n_personel)}
+
+        gun_secenekleri = defaultdict(list)  # (p, g) -> [(a, v)]
+        for p, g, a, v in self.x:
+            gun_secenekleri[p, g].append((a, v))
+        musait = defaultdict(list)  # p -> sıralı müsait günler
+        for p, g in sorted(self.kisi_gun_x):
+            musait[p].append(g)
+        musait_kume = {p: set(gunler) for p, gunler in musait.items()}
+
+        ayri = defaultdict(set)
+        for a_isim, b_isim in self.input.ayri_tut:
+            if a_isim in self.name_to_idx and b_isim in self.name_to_idx:
+                pa, pb = self.name_to_idx[a_isim], self.name_to_idx[b_isim]
+                ayri[pa].add(pb)
+                ayri[pb].add(pa)
+        alan_max = {a: alan.max_kontenjan for a, alan in enumerate(self.input.alanlar)
+                    if alan.max_kontenjan and alan.max_kontenjan > 0}
+        alan_hedef = {a: alan.gunluk_kontenjan for a, alan in enumerate(self.input.alanlar)}
+
+        calisan = defaultdict(set)  # p -> çalıştığı günler
+        gunasiri_sayisi = defaultdict(int)
+        alan_gun_sayisi = defaultdict(int)  # (a, g) -> kişi
+        slot_sayisi = defaultdict(int)  # (g, a, v) -> kişi
+        secilen = set()
+
+        def uygun(p, g, a, v) -> bool:
+            gunler = calisan[p]
+            if kalan[p] <= 0 or g in gunler:
+                return False
+            if p in vardiya_hedefli and kalan[p, v] <= 0:
+                return False
+            if config.ardisik_yasak and (g - 1 in gunler or g + 1 in gunler):
+                return False
+            if gunasiri_limiti and gunasiri_sayisi[p] + (g - 2 in gunler) + (g + 2 in gunler) > gunasiri_limiti:
+                return False
+            if any(g in calisan[q] for q in ayri[p]):
+                return False
+            return a not in alan_max or alan_gun_sayisi[a, g] < alan_max[a]
+
+        def ata(p, g, a, v):
+            gunler = calisan[p]
+            gunasiri_sayisi[p] += (g - 2 in gunler) + (g + 2 in gunler)
+            gunler.add(g)
+            kalan[p] -= 1
+            if p in vardiya_hedefli:
+                kalan[p, v] -= 1
+            alan_gun_sayisi[a, g] += 1
+            slot_sayisi[g, a, v] += 1
+            secilen.add((p, g, a, v))
+
+        def geri_al(p, g, a, v):
+            gunler = calisan[p]
+            gunler.discard(g)
+            gunasiri_sayisi[p] -= (g - 2 in gunler) + (g + 2 in gunler)
+            kalan[p] += 1
+            if p in vardiya_hedefli:
+                kalan[p, v] += 1
+            alan_gun_sayisi[a, g] -= 1
+            slot_sayisi[g, a, v] -= 1
+            secilen.discard((p, g, a, v))
+
+        def gerilik(p, g) -> float:
+            """Kişinin g gününde temposunun ne kadar gerisinde olduğu (>= 0: nöbet zamanı)"""
+            gunler = musait[p]
+            gecen = bisect.bisect_left(gunler, g)
+            kayma = (p * 0.618034) % 1.0
+            return gecen - (hedef[p] - kalan[p] + kayma) * len(gunler) / max(hedef[p], 1)
+
+        def ilk_uygun(p, g):
+            return next(((a, v) for a, v in gun_secenekleri[p, g] if uygun(p, g, a, v)), None)
+
+        # 0) Birlikte tutma minimumu: ortak müsait günlere eşit aralıkla yerleştir
+        ciftler = [(self.name_to_idx[a_isim], self.name_to_idx[b_isim], min_k)
+                   for a_isim, b_isim, min_k in self.input.birlikte_tut
+                   if min_k > 0 and a_isim in self.name_to_idx and b_isim in self.name_to_idx]
+        esler = defaultdict(set)
+        for pa, pb, _ in ciftler:
+            esler[pa].add(pb)
+            esler[pb].add(pa)
+        for pa, pb, min_k in ciftler:
+            ortak = sorted(set(musait[pa]) & set(musait[pb]))
+            adim = max(len(ortak) // min_k, 1)
+            birlikte = len(calisan[pa] & calisan[pb])
+            # Önce birinin zaten çalıştığı günler (başka bir çiftten), sonra eşit aralıklı
+            # günler; diğer eşlerin de müsait olduğu günler önce (üçlü birliktelikler için)
+            zaten = [g for g in ortak if g in calisan[pa] or g in calisan[pb]]
+            diger_esler = (esler[pa] | esler[pb]) - {pa, pb}
+            sirali = sorted(ortak[adim // 2::adim] + ortak,
+                            key=lambda g: -sum(g in musait_kume.get(q, ()) for q in diger_esler))
+            for g in zaten + sirali:
+                if birlikte >= min_k:
+                    break
+                if g in calisan[pa] and g in calisan[pb]:
+                    continue
+                yeni = []
+                for p in (pa, pb):
+                    secim = None if g in calisan[p] else ilk_uygun(p, g)
+                    if secim is not None:
+                        ata(p, g, *secim)
+                        yeni.append((p, g, *secim))
+                if g in calisan[pa] and g in calisan[pb]:
+                    birlikte += 1
+                else:
+                    # Eş bu gün atanamıyor: yapılan atamayı geri al
+                    for atama in yeni:
+                        geri_al(*atama)
+
+        for g in range(1, self.gun_sayisi + 1):
+            # 1) Kapsama: her gün/alan/vardiya en az bir kişi, en az adaylı önce
+            slotlar = sorted(
+                ((a, v) for a in range(self.n_alan) for v in range(self.n_vardiya)
+                 if self.gun_alan_vardiya_x.get((g, a, v))),
+                key=lambda av: len(self.gun_alan_vardiya_x[g, av[0], av[1]])
+            )
+            for a, v in slotlar:
+                adaylar = [p for p in self.gun_alan_vardiya_x[g, a, v] if uygun(p, g, a, v)]
+                if adaylar:
+                    ata(max(adaylar, key=lambda p: gerilik(p, g)), g, a, v)
+
+            # 2) Tempo: gerisinde kalanlar hedefinden en uzak alan/vardiyaya
+            gunun_kisileri = [p for p in range(self.n_personel) if (p, g) in gun_secenekleri]
+            for p in sorted(gunun_kisileri, key=lambda p: -gerilik(p, g)):
+                if gerilik(p, g) < 0:
+                    break
+                secenekler = [(a, v) for a, v in gun_secenekleri[p, g] if uygun(p, g, a, v)]
+                if secenekler:
+                    a, v = min(secenekler, key=lambda av: (
+                        alan_gun_sayisi[av[0], g] - alan_hedef.get(av[0], 1), slot_sayisi[g, av[0], av[1]]))
+                    ata(p, g, a, v)
+
+        # 3) Kalan hedefler: uygun herhangi bir güne
+        for p in range(self.n_personel):
+            for g in musait[p]:
+                if kalan[p] <= 0:
+                    break
+                for a, v in gun_secenekleri[p, g]:
+                    if uygun(p, g, a, v):
+                        ata(p, g, a, v)
+                        break
+
+        # Tam hint: önce çizelgenin tamamı sabitlenerek, olmazsa birlikte tutma
+        # çiftlerindeki kişiler serbest bırakılarak tamamlanır; ikisi de olmazsa kısmi kalır
+        dolu_gunler = {(p, g) for p, g, _, _ in secilen}
+        birlikte_kisiler = {self.name_to_idx[i] for a_isim, b_isim, _ in self.input.birlikte_tut
+                            for i in (a_isim, b_isim) if i in self.name_to_idx}
+        tam_hint = False
+        for serbest in [set()] + ([birlikte_kisiler] if birlikte_kisiler else []):
+            self.model.ClearHints()
+            self._ipucu_ver(secilen, dolu_gunler, serbest)
+            tam_hint = self._ipucu_tamamla()
+            if tam_hint:
+                break
+        if not tam_hint:
+            self.model.ClearHints()
+            self._ipucu_ver(secilen, dolu_gunler)
+        
+        self.rapor.ipucu_istatistikleri = {
+            "acgozlu_atama": len(secilen),
+            "eksik_hedef": sum(max(kalan[p], 0) for p in range(self.n_personel)),
+            "tam_hint": tam_hint
+        }
+
+    def _ipucu_tamamla(self, max_sure_saniye: float = 10.0) -> bool:
+        """
+        Kısmi hint'i tüm değişkenlere tamamlar: model hint'li değişkenler sabitlenerek
+        çözülür; hint'siz değişkenler (ara değişkenler, serbest bırakılan kişiler)
+        çözümden alınır. Tam ve uygun hint CP-SAT'ta ön işlemeden hemen sonra ilk
+        çözüm olur; büyük modelde kısmi hint'in tamamlanması ise dakikalar sürebilir.
+
+        Returns:
+            Hint tamamlandıysa True; sabitlenmiş model çözümsüzse (ör. açgözlü
+            çizelge bir kıdem kuralını sağlamıyor) hint kısmi kalır ve False döner
+        """
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = max_sure_saniye
+        solver.parameters.num_search_workers = 1
+        solver.parameters.fix_variables_to_their_hinted_value = True
+        solver.parameters.stop_after_first_solution = True
+        status = solver.Solve(self.model)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return False
+        cozum = solver.ResponseProto().solution
+        self.model.ClearHints()
+        hint = self.model.Proto().solution_hint
+        hint.vars.extend(range(len(cozum)))
+        hint.values.extend(cozum)
+        return True
+
     def _hedef_nobet_sayilari(self):
         """
         Her personel için hedef sayıda nöbet tutmalı.
@@ -237,85 +1423,38 @@ class NobetSolver:
             # Vardiya bazlı hedef var mı?
             vardiya_hedef = self.input.vardiya_hedefleri.get(isim, {})
 
+            # Çatışma analizinde imkânsız hedef de çekirdeğe girsin diye hata fırlatılmaz
+            analiz = self.varsayimlar is not None
+
             if vardiya_hedef and self.input.vardiya_modu:
                 # VARDIYA BAZLI HEDEF MODU
                 toplam_vardiya_hedef = sum(vardiya_hedef.values())
-                if toplam_vardiya_hedef > max_mumkun:
+                if toplam_vardiya_hedef > max_mumkun and not analiz:
                     raise ValueError(f"{isim}: Toplam vardiya hedefi ({toplam_vardiya_hedef}) > maksimum mümkün ({max_mumkun})")
 
                 for v_idx, vardiya in enumerate(self.input.vardiyalar):
                     hedef = vardiya_hedef.get(vardiya.isim, 0)
+                    # Hedefi 0 olan vardiyalar domain'den elendi
                     if hedef > 0:
-                        if hedef > max_mumkun:
+                        if hedef > max_mumkun and not analiz:
                             raise ValueError(f"{isim}: {vardiya.isim} hedefi ({hedef}) > maksimum mümkün ({max_mumkun})")
                         # Bu kişinin bu vardiyadan tutması gereken nöbet sayısı
-                        toplam = sum(self.x[p_idx, g, a, v_idx]
-                                    for g in range(1, self.gun_sayisi + 1)
-                                    for a in range(self.n_alan))
-                        self.model.Add(toplam == hedef)
-                    elif hedef == 0:
-                        # Bu vardiyada çalışmamalı (hedef 0 ise)
-                        for g in range(1, self.gun_sayisi + 1):
-                            for a in range(self.n_alan):
-                                self.model.Add(self.x[p_idx, g, a, v_idx] == 0)
+                        toplam = cp_model.LinearExpr.Sum(self.kisi_vardiya_x.get((p_idx, v_idx), []))
+                        k = self._varsayim("hedef", f"{isim}: {vardiya.isim} hedefi {hedef} nöbet",
+                                           personel=isim, vardiya=vardiya.isim, hedef=hedef)
+                        self._kosullu(self.model.Add(toplam == hedef), k)
             else:
                 # ESKİ MOD - toplam nöbet hedefi
                 hedef = self.input.hedefler.get(isim, 0)
-                if hedef > max_mumkun:
+                if hedef > max_mumkun and not analiz:
                     raise ValueError(f"{isim}: Hedef ({hedef}) > maksimum mümkün ({max_mumkun})")
-                toplam = sum(self.x[p_idx, g, a, v]
-                            for g in range(1, self.gun_sayisi + 1)
-                            for a in range(self.n_alan)
-                            for v in range(self.n_vardiya))
-                self.model.Add(toplam == hedef)
-    
-    def _izin_gunleri(self):
-        for p_idx, isim in enumerate(self.input.personeller):
-            for gun in self.input.izinler.get(isim, set()):
-                if 1 <= gun <= self.gun_sayisi:
-                    for a in range(self.n_alan):
-                        for v in range(self.n_vardiya):
-                            self.model.Add(self.x[p_idx, gun, a, v] == 0)
-    
-    def _kisi_gun_tek_atama(self):
-        for p in range(self.n_personel):
-            for g in range(1, self.gun_sayisi + 1):
-                self.model.Add(sum(self.x[p, g, a, v] 
-                                  for a in range(self.n_alan) 
-                                  for v in range(self.n_vardiya)) <= 1)
-    
-    def _alan_yetkinlikleri(self):
-        for p_idx, isim in enumerate(self.input.personeller):
-            yetkin = self.input.personel_alan_yetkinlikleri.get(isim, [])
-            if not yetkin:
-                continue
-            for a_idx, alan in enumerate(self.input.alanlar):
-                if alan.isim not in yetkin:
-                    for g in range(1, self.gun_sayisi + 1):
-                        for v in range(self.n_vardiya):
-                            self.model.Add(self.x[p_idx, g, a_idx, v] == 0)
-    
-    def _vardiya_kisitlari(self):
-        for p_idx, isim in enumerate(self.input.personeller):
-            kisitlar = self.input.personel_vardiya_kisitlari.get(isim, [])
-            if not kisitlar:
-                continue
-            for v_idx, vardiya in enumerate(self.input.vardiyalar):
-                if vardiya.isim not in kisitlar:
-                    for g in range(1, self.gun_sayisi + 1):
-                        for a in range(self.n_alan):
-                            self.model.Add(self.x[p_idx, g, a, v_idx] == 0)
-    
-    def _alan_vardiya_eslesmesi(self):
-        for a_idx, alan in enumerate(self.input.alanlar):
-            gecerli = alan.vardiya_tipleri
-            if not gecerli:
-                continue
-            for v_idx, vardiya in enumerate(self.input.vardiyalar):
-                if vardiya.isim not in gecerli:
-                    for p in range(self.n_personel):
-                        for g in range(1, self.gun_sayisi + 1):
-                            self.model.Add(self.x[p, g, a_idx, v_idx] == 0)
+                if hedef == 0:
+                    # Hiç değişkeni yok, kısıt gereksiz
+                    continue
+                toplam = sum(self.calisiyor[p_idx, g] for g in range(1, self.gun_sayisi + 1)
+                             if (p_idx, g) in self.calisiyor)
+                k = self._varsayim("hedef", f"{isim}: hedef {hedef} nöbet", personel=isim, hedef=hedef)
+                self._kosullu(self.model.Add(toplam == hedef), k)
     
     def _vardiya_minimum_kontenjan_hard(self):
         """Her vardiyada (her alanda) günde en az 1 kişi olmalı - HARD CONSTRAINT"""
@@ -330,10 +1469,15 @@ class NobetSolver:
                         if alan.vardiya_tipleri and vardiya.isim not in alan.vardiya_tipleri:
                             continue
 
-                    # Bu gün/alan/vardiya için en az 1 kişi
-                    toplam = sum(self.x[p, g, a, v] for p in range(self.n_personel))
-                    self.model.Add(toplam >= 1)
-
+                    # Bu gün/alan/vardiya için en az 1 kişi - doğal BoolOr kısıtı
+                    # (hiç aday yoksa boş BoolOr False olur ve model çözümsüz kalır)
+                    adaylar = list(self.gun_alan_vardiya_x[g, a, v].values())
+                    yer = ", ".join(isim for isim in (
+                        self.alan_isimleri[a] if self.input.coklu_alan_modu else None,
+                        self.vardiya_isimleri[v]) if isim)
+                    k = self._varsayim("vardiya_minimum", f"Gün {g}, {yer}: en az 1 kişi", gun=g, yer=yer)
+                    self._kosullu(self.model.AddBoolOr(adaylar), k)
+    
     def _vardiya_minimum_kontenjan_soft(self):
         """Her vardiyada (her alanda) günde en az 1 kişi olmalı - SOFT CONSTRAINT"""
         w = self.input.config.w_vardiya_min_kontenjan
@@ -349,10 +1493,14 @@ class NobetSolver:
                             continue
 
                     # Soft penalty for empty slots
+                    adaylar = list(self.gun_alan_vardiya_x[g, a, v].values())
+                    if not adaylar:
+                        # Kimse atanamaz - slot kesin boş kalacak
+                        self.objective_terms.append(w)
+                        continue
                     bos = self.model.NewBoolVar(f"bos_{g}_{a}_{v}")
-                    toplam = sum(self.x[p, g, a, v] for p in range(self.n_personel))
                     # bos = 1 if toplam == 0 (empty shift)
-                    self.model.Add(bos == (toplam == 0))
+                    self.model.Add(sum(adaylar) + bos >= 1)
                     self.objective_terms.append(bos * w)
     
     def _kidem_kurallari(self):
@@ -362,65 +1510,158 @@ class NobetSolver:
             for grup_isim, kurallar in alan.kidem_kurallari.items():
                 min_k = kurallar.get("min", 0)
                 max_k = kurallar.get("max")
-                
+
                 grup_idx = [p for p, isim in enumerate(self.input.personeller)
                            if self.input.personel_kidem_gruplari.get(isim) == grup_isim]
                 if not grup_idx:
                     continue
-                
+
                 for g in range(1, self.gun_sayisi + 1):
-                    toplam = sum(self.x[p, g, a_idx, v] 
-                                for p in grup_idx for v in range(self.n_vardiya))
+                    adaylar = []
+                    for v in range(self.n_vardiya):
+                        gav = self.gun_alan_vardiya_x[g, a_idx, v]
+                        adaylar.extend(gav[p] for p in grup_idx if p in gav)
+                    toplam = sum(adaylar)
                     if min_k > 0:
-                        self.model.Add(toplam >= min_k)
-                    if max_k and max_k > 0:
-                        self.model.Add(toplam <= max_k)
+                        k = self._varsayim("kidem", f"Gün {g}, {alan.isim}: {grup_isim} en az {min_k}",
+                                           gun=g, alan=alan.isim, kidem_grubu=grup_isim, min=min_k)
+                        self._kosullu(self.model.Add(toplam >= min_k), k)
+                    if max_k and max_k > 0 and len(adaylar) > max_k:
+                        k = self._varsayim("kidem", f"Gün {g}, {alan.isim}: {grup_isim} en fazla {max_k}",
+                                           gun=g, alan=alan.isim, kidem_grubu=grup_isim, max=max_k)
+                        self._kosullu(self.model.Add(toplam <= max_k), k)
     
     def _ardisik_gun_yasagi(self):
-        for p in range(self.n_personel):
+        for p, isim in enumerate(self.input.personeller):
+            k = self._varsayim("ardisik", f"{isim}: ardışık gün yasağı", personel=isim)
             for g in range(1, self.gun_sayisi):
-                bugun = sum(self.x[p, g, a, v] for a in range(self.n_alan) for v in range(self.n_vardiya))
-                yarin = sum(self.x[p, g+1, a, v] for a in range(self.n_alan) for v in range(self.n_vardiya))
-                self.model.Add(bugun + yarin <= 1)
+                bugun = self.calisiyor.get((p, g))
+                yarin = self.calisiyor.get((p, g + 1))
+                if bugun is not None and yarin is not None:
+                    self._en_fazla_bir([bugun, yarin], k)
     
     def _gunasiri_limiti(self):
         max_ga = self.input.config.max_gunasiri_per_kisi
         for p in range(self.n_personel):
             ga_list = []
             for g in range(1, self.gun_sayisi - 1):
-                b = self.model.NewBoolVar(f"ga_{p}_{g}")
-                g1 = sum(self.x[p, g, a, v] for a in range(self.n_alan) for v in range(self.n_vardiya))
-                g3 = sum(self.x[p, g+2, a, v] for a in range(self.n_alan) for v in range(self.n_vardiya))
-                self.model.Add(b <= g1)
-                self.model.Add(b <= g3)
-                self.model.Add(b >= g1 + g3 - 1)
-                ga_list.append(b)
-            if ga_list:
-                self.model.Add(sum(ga_list) <= max_ga)
+                g1 = self.calisiyor.get((p, g))
+                g3 = self.calisiyor.get((p, g + 2))
+                if g1 is None or g3 is None:
+                    continue
+                ga = self._ve_degiskeni(g1, g3, f"ga_{p}_{g}")
+                # İki gün boşluk tercihi aynı literal'i ceza olarak kullanır
+                self.gunasiri_x[p, g] = ga
+                ga_list.append(ga)
+            if len(ga_list) > max_ga:
+                isim = self.input.personeller[p]
+                k = self._varsayim("gunasiri", f"{isim}: en fazla {max_ga} günaşırı", personel=isim)
+                self._kosullu(self.model.Add(cp_model.LinearExpr.Sum(ga_list) <= max_ga), k)
     
     def _ayri_tutma_kurallari(self):
         for (a, b) in self.input.ayri_tut:
             if a not in self.name_to_idx or b not in self.name_to_idx:
                 continue
             pa, pb = self.name_to_idx[a], self.name_to_idx[b]
+            k = self._varsayim("ayri_tut", f"{a} + {b}: aynı gün nöbet tutmasın", personel_a=a, personel_b=b)
             for g in range(1, self.gun_sayisi + 1):
-                ta = sum(self.x[pa, g, al, v] for al in range(self.n_alan) for v in range(self.n_vardiya))
-                tb = sum(self.x[pb, g, al, v] for al in range(self.n_alan) for v in range(self.n_vardiya))
-                self.model.Add(ta + tb <= 1)
+                ta = self.calisiyor.get((pa, g))
+                tb = self.calisiyor.get((pb, g))
+                if ta is not None and tb is not None:
+                    self._en_fazla_bir([ta, tb], k)
+    
+    def _denklik_siniflarini_bul(self) -> List[List[int]]:
+        """
+        SolverInput'ta birbirinden ayırt edilemeyen personeli gruplar: aynı hedefler,
+        izinler, tercihler, yetkinlikler, kıdem grubu, vardiya kısıtları ve devreden
+        adalet sayıları; hiçbir çift kuralında yer almayan.
+        """
+        ciftlerde = set()
+        for kural in (self.input.ayri_tut, self.input.esnek_ayri_tut, self.input.birlikte_tut):
+            for cift in kural:
+                ciftlerde.update(cift[:2])
+        
+        siniflar = defaultdict(list)
+        for p, isim in enumerate(self.input.personeller):
+            if isim in ciftlerde or not self.kisi_atamalari[p]:
+                continue
+            imza = (
+                self.input.hedefler.get(isim, 0),
+                self.input.hedefler_saat.get(isim),
+                frozenset(self.input.vardiya_hedefleri.get(isim, {}).items()),
+                frozenset(self.input.izinler.get(isim, set())),
+                frozenset(self.input.tercih_edilen.get(isim, set())),
+                frozenset(self.input.personel_alan_yetkinlikleri.get(isim, [])),
+                self.input.personel_kidem_gruplari.get(isim),
+                frozenset(self.input.personel_vardiya_kisitlari.get(isim, [])),
+                tuple(sorted((tag, d.get(isim, 0)) for tag, d in self.input.adalet_devri.items()))
+            )
+            siniflar[imza].append(p)
+        return [sinif for sinif in siniflar.values() if len(sinif) > 1]
+    
+    def _simetri_kirma(self):
+        """
+        Her denklik sınıfında ardışık kişiler ilk nöbet gününe göre sıralanır:
+        p2 g gününde çalışıyorsa p1 g veya daha önceki bir günde çalışmış olmalı.
+        Sınıf içindeki her çözüm bu sıraya permüte edilebildiği için optimum kaybolmaz.
+        
+        Tam sözlük sıralaması (calisiyor vektörleri üzerinde lex) denendi; sınırı
+        iyileştirmesine rağmen LNS'in iyi çözüm bulmasını engellediği için bu
+        daha zayıf ama arama dostu sıralama kullanılır.
+        """
+        self.denklik_siniflari = self._denklik_siniflarini_bul()
+        for sinif in self.denklik_siniflari:
+            for p1, p2 in zip(sinif, sinif[1:]):
+                onek = []  # p1'in 1..g günlerindeki literal'leri
+                for g in range(1, self.gun_sayisi + 1):
+                    x = self.calisiyor.get((p1, g))
+                    y = self.calisiyor.get((p2, g))
+                    if x is None:
+                        # Aynı imza aynı domain demek: iki kişide de değişken yok
+                        continue
+                    onek.append(x)
+                    self.model.AddBoolOr([y.Not()] + onek)
+    
+    def _alan_gun_degiskenleri(self, a_idx: int, g: int) -> List:
+        """Bir alandaki bir güne ait tüm atama değişkenleri (tüm vardiyalar)"""
+        degiskenler = []
+        for v in range(self.n_vardiya):
+            degiskenler.extend(self.gun_alan_vardiya_x[g, a_idx, v].values())
+        return degiskenler
+    
+    def _alan_gun_toplami(self, a_idx: int, g: int) -> cp_model.IntVar:
+        """
+        Bir alanda bir gün çalışan kişi sayısı. Kontenjan, maksimum ve günlük denge
+        aileleri aynı toplamı kullandığı için değişken bir kez kurulur.
+        """
+        t = self.alan_gun_toplamlari.get((a_idx, g))
+        if t is None:
+            adaylar = self._alan_gun_degiskenleri(a_idx, g)
+            t = self.model.NewIntVar(0, len(adaylar), f"agt_{a_idx}_{g}")
+            self.model.Add(t == cp_model.LinearExpr.Sum(adaylar))
+            self.alan_gun_toplamlari[a_idx, g] = t
+        return t
+    
+    def _alan_max_kontenjan(self):
+        """Alan başına günlük maksimum kişi sayısı (hard)"""
+        for a_idx, alan in enumerate(self.input.alanlar):
+            max_k = alan.max_kontenjan
+            if not max_k or max_k <= 0:
+                continue
+            for g in range(1, self.gun_sayisi + 1):
+                adaylar = self._alan_gun_degiskenleri(a_idx, g)
+                if len(adaylar) > max_k:
+                    k = self._varsayim("alan_max", f"Gün {g}, {alan.isim}: en fazla {max_k} kişi",
+                                       gun=g, alan=alan.isim, max=max_k)
+                    self._kosullu(self.model.Add(self._alan_gun_toplami(a_idx, g) <= max_k), k)
     
     def _alan_kontenjan_soft(self):
         w = self.input.config.w_alan_kontenjan_sapma
         for a_idx, alan in enumerate(self.input.alanlar):
             hedef = alan.gunluk_kontenjan
-            max_k = alan.max_kontenjan
-            
+
             for g in range(1, self.gun_sayisi + 1):
-                toplam = sum(self.x[p, g, a_idx, v] 
-                            for p in range(self.n_personel) for v in range(self.n_vardiya))
-                
-                if max_k and max_k > 0:
-                    self.model.Add(toplam <= max_k)
-                
+                toplam = self._alan_gun_toplami(a_idx, g)
                 sapma_pos = self.model.NewIntVar(0, self.n_personel, f"sp_{a_idx}_{g}")
                 sapma_neg = self.model.NewIntVar(0, self.n_personel, f"sn_{a_idx}_{g}")
                 self.model.Add(toplam - hedef == sapma_pos - sapma_neg)
@@ -432,10 +1673,7 @@ class NobetSolver:
         for a_idx in range(self.n_alan):
             topl = []
             for g in range(1, self.gun_sayisi + 1):
-                t = self.model.NewIntVar(0, self.n_personel * self.n_vardiya, f"gad_{a_idx}_{g}")
-                self.model.Add(t == sum(self.x[p, g, a_idx, v] 
-                                       for p in range(self.n_personel) for v in range(self.n_vardiya)))
-                topl.append(t)
+                topl.append(self._alan_gun_toplami(a_idx, g))
             if len(topl) > 1:
                 mn = self.model.NewIntVar(0, self.n_personel * self.n_vardiya, f"gad_mn_{a_idx}")
                 mx = self.model.NewIntVar(0, self.n_personel * self.n_vardiya, f"gad_mx_{a_idx}")
@@ -449,10 +1687,7 @@ class NobetSolver:
         w = self.input.config.w_gunluk_denge
         topl = []
         for g in range(1, self.gun_sayisi + 1):
-            t = self.model.NewIntVar(0, self.n_personel * self.n_vardiya, f"gkd_{g}")
-            self.model.Add(t == sum(self.x[p, g, 0, v] 
-                                   for p in range(self.n_personel) for v in range(self.n_vardiya)))
-            topl.append(t)
+            topl.append(self._alan_gun_toplami(0, g))
         if len(topl) > 1:
             mn = self.model.NewIntVar(0, self.n_personel * self.n_vardiya, "gkd_mn")
             mx = self.model.NewIntVar(0, self.n_personel * self.n_vardiya, "gkd_mx")
@@ -468,13 +1703,13 @@ class NobetSolver:
         saatler = []
         for p in range(self.n_personel):
             s = self.model.NewIntVar(0, max_saat, f"saat_{p}")
-            toplam = []
-            for g in range(1, self.gun_sayisi + 1):
-                for a in range(self.n_alan):
-                    for v_idx, vrd in enumerate(self.input.vardiyalar):
-                        saat = self.vardiya_saatleri.get(vrd.isim, 24)
-                        toplam.append(self.x[p, g, a, v_idx] * saat)
-            self.model.Add(s == sum(toplam))
+            degiskenler, katsayilar = [], []
+            for v_idx, vardiya_isim in enumerate(self.vardiya_isimleri):
+                saat = self.vardiya_saatleri.get(vardiya_isim, 24)
+                vardiya_x = self.kisi_vardiya_x.get((p, v_idx), [])
+                degiskenler.extend(vardiya_x)
+                katsayilar.extend([saat] * len(vardiya_x))
+            self.model.Add(s == cp_model.LinearExpr.WeightedSum(degiskenler, katsayilar))
             saatler.append(s)
         if len(saatler) > 1:
             mn = self.model.NewIntVar(0, max_saat, "saat_mn")
@@ -491,8 +1726,7 @@ class NobetSolver:
             sayimlar = []
             for p in range(self.n_personel):
                 s = self.model.NewIntVar(0, self.gun_sayisi * self.n_vardiya, f"abd_{a_idx}_{p}")
-                self.model.Add(s == sum(self.x[p, g, a_idx, v] 
-                                       for g in range(1, self.gun_sayisi + 1) for v in range(self.n_vardiya)))
+                self.model.Add(s == cp_model.LinearExpr.Sum(self.kisi_alan_x.get((p, a_idx), [])))
                 sayimlar.append(s)
             if len(sayimlar) > 1:
                 mn = self.model.NewIntVar(0, self.gun_sayisi * self.n_vardiya, f"abd_mn_{a_idx}")
@@ -517,14 +1751,15 @@ class NobetSolver:
     def _adalet_ekle(self, gunler: List[int], agirlik: int, tag: str):
         if not gunler:
             return
+        devir = self.input.adalet_devri.get(tag, {})
+        ub = len(gunler) * self.n_alan * self.n_vardiya + max(devir.values(), default=0)
         sayimlar = []
-        for p in range(self.n_personel):
-            s = self.model.NewIntVar(0, len(gunler) * self.n_alan * self.n_vardiya, f"{tag}_{p}")
-            self.model.Add(s == sum(self.x[p, g, a, v] 
-                                   for g in gunler for a in range(self.n_alan) for v in range(self.n_vardiya)))
+        for p, isim in enumerate(self.input.personeller):
+            s = self.model.NewIntVar(0, ub, f"{tag}_{p}")
+            self.model.Add(s == sum(self.calisiyor[p, g] for g in gunler if (p, g) in self.calisiyor)
+                           + devir.get(isim, 0))
             sayimlar.append(s)
         if len(sayimlar) > 1:
-            ub = len(gunler) * self.n_alan * self.n_vardiya
             mn = self.model.NewIntVar(0, ub, f"{tag}_mn")
             mx = self.model.NewIntVar(0, ub, f"{tag}_mx")
             self.model.AddMinEquality(mn, sayimlar)
@@ -537,10 +1772,17 @@ class NobetSolver:
         w = self.input.config.w_iki_gun_bosluk
         for p in range(self.n_personel):
             for g in range(1, self.gun_sayisi - 1):
+                g1 = self.calisiyor.get((p, g))
+                g3 = self.calisiyor.get((p, g + 2))
+                if g1 is None or g3 is None:
+                    continue
+                if (p, g) in self.gunasiri_x:
+                    # Günaşırı limiti g1 AND g3 literal'ini zaten kurdu
+                    self.objective_terms.append(self.gunasiri_x[p, g] * w)
+                    continue
                 ceza = self.model.NewBoolVar(f"bos_{p}_{g}")
-                g1 = sum(self.x[p, g, a, v] for a in range(self.n_alan) for v in range(self.n_vardiya))
-                g3 = sum(self.x[p, g+2, a, v] for a in range(self.n_alan) for v in range(self.n_vardiya))
-                self.model.Add(ceza >= g1 + g3 - 1)
+                # ceza >= g1 + g3 - 1
+                self.model.AddBoolOr([g1.Not(), g3.Not(), ceza])
                 self.objective_terms.append(ceza * w)
     
     def _birlikte_tutma_kurallari(self):
@@ -550,18 +1792,18 @@ class NobetSolver:
             pa, pb = self.name_to_idx[a], self.name_to_idx[b]
             birlikte = []
             for g in range(1, self.gun_sayisi + 1):
-                t = self.model.NewBoolVar(f"bir_{pa}_{pb}_{g}")
-                ca = sum(self.x[pa, g, al, v] for al in range(self.n_alan) for v in range(self.n_vardiya))
-                cb = sum(self.x[pb, g, al, v] for al in range(self.n_alan) for v in range(self.n_vardiya))
-                self.model.Add(t <= ca)
-                self.model.Add(t <= cb)
-                self.model.Add(t >= ca + cb - 1)
-                birlikte.append(t)
-            if birlikte:
-                toplam = self.model.NewIntVar(0, self.gun_sayisi, f"bir_t_{pa}_{pb}")
-                self.model.Add(toplam == sum(birlikte))
-                self.model.Add(toplam >= min_k)
-                self.objective_terms.append(toplam * (-self.input.config.w_birlikte_odul))
+                ca = self.calisiyor.get((pa, g))
+                cb = self.calisiyor.get((pb, g))
+                if ca is None or cb is None:
+                    continue
+                birlikte.append(self._ve_degiskeni(ca, cb, f"bir_{pa}_{pb}_{g}"))
+            toplam = self.model.NewIntVar(0, self.gun_sayisi, f"bir_t_{pa}_{pb}")
+            self.model.Add(toplam == sum(birlikte))
+            if min_k > 0:
+                k = self._varsayim("birlikte_tut", f"{a} + {b}: en az {min_k} gün birlikte",
+                                   personel_a=a, personel_b=b, min_birlikte=min_k)
+                self._kosullu(self.model.Add(toplam >= min_k), k)
+            self.objective_terms.append(toplam * (-self.input.config.w_birlikte_odul))
     
     def _esnek_ayri_tutma_kurallari(self):
         w = self.input.config.w_esnek_ayri
@@ -570,70 +1812,190 @@ class NobetSolver:
                 continue
             pa, pb = self.name_to_idx[a], self.name_to_idx[b]
             for g in range(1, self.gun_sayisi + 1):
+                ca = self.calisiyor.get((pa, g))
+                cb = self.calisiyor.get((pb, g))
+                if ca is None or cb is None:
+                    continue
                 t = self.model.NewBoolVar(f"esn_{pa}_{pb}_{g}")
-                ca = sum(self.x[pa, g, al, v] for al in range(self.n_alan) for v in range(self.n_vardiya))
-                cb = sum(self.x[pb, g, al, v] for al in range(self.n_alan) for v in range(self.n_vardiya))
-                self.model.Add(t >= ca + cb - 1)
+                # t >= ca + cb - 1
+                self.model.AddBoolOr([ca.Not(), cb.Not(), t])
                 self.objective_terms.append(t * w)
     
     def _tercih_edilen_gunler(self):
         w = self.input.config.w_tercih
         for p_idx, isim in enumerate(self.input.personeller):
             for g in self.input.tercih_edilen.get(isim, set()):
-                if 1 <= g <= self.gun_sayisi:
-                    for a in range(self.n_alan):
-                        for v in range(self.n_vardiya):
-                            self.objective_terms.append(self.x[p_idx, g, a, v] * (-w))
+                if (p_idx, g) in self.calisiyor:
+                    self.objective_terms.append(self.calisiyor[p_idx, g] * (-w))
     
-    def _coz_ve_sonuc_al(self) -> Dict:
+    def _sure_butcesi(self) -> float:
+        """
+        Süre sınırı. Uyarlanır modda model kurulduktan sonra boyut ve sıkılıktan tahmin edilir:
+        sıkılık = toplam hedef / kullanılabilir kişi-gün (ardışık gün yasağında yarısı).
+        Vardiya hedefi verilen kişinin hedefi vardiya hedeflerinin toplamıdır.
+        """
+        config = self.input.config
+        if not config.uyarlanir_sure:
+            return config.max_sure_saniye
+        hedef = 0
+        for isim in self.input.personeller:
+            vardiya_hedef = self.input.vardiya_hedefleri.get(isim, {}) if self.input.vardiya_modu else {}
+            hedef += sum(vardiya_hedef.values()) if vardiya_hedef else self.input.hedefler.get(isim, 0)
+        kapasite = len(self.kisi_gun_x) * (0.5 if config.ardisik_yasak else 1.0)
+        sikilik = min(1.0, hedef / max(kapasite, 1.0))
+        butce = config.min_sure_saniye + config.sure_katsayisi * (self.rapor.toplam_degisken / 1000) * (1 + 2 * sikilik)
+        return min(max(butce, config.min_sure_saniye), config.uyarlanir_ust_sure_saniye)
+    
+    def _cp_solver_olustur(self) -> cp_model.CpSolver:
         solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = self.input.config.max_sure_saniye
+        solver.parameters.max_time_in_seconds = self._sure_butcesi()
         solver.parameters.num_search_workers = self.input.config.thread_sayisi
+        if self.input.config.bosluk_esigi > 0:
+            solver.parameters.relative_gap_limit = self.input.config.bosluk_esigi
+        if self.buyuk_model:
+            # Büyük modelde ön işlemenin probing/simetri adımları tek başına onlarca saniye sürer;
+            # başlangıç çizelgesi zaten tam hint olduğu için arama süresine bırakılır
+            solver.parameters.cp_model_probing_level = 0
+            solver.parameters.symmetry_level = 0
+            solver.parameters.max_presolve_iterations = 1
+        for isim, deger in self.input.config.cp_sat_parametreleri.items():
+            setattr(solver.parameters, isim, deger)
+        return solver
+    
+    def _coz_ve_sonuc_al(self) -> Dict:
+        solver = self._cp_solver_olustur()
         
-        status = solver.Solve(self.model)
+        if self.input.config.durgunluk_saniye > 0:
+            with _DurgunlukBekcisi(solver, self.input.config.durgunluk_saniye) as bekci:
+                status = solver.Solve(self.model, bekci)
+            durgunluk = bekci.tetiklendi
+        else:
+            status = solver.Solve(self.model)
+            durgunluk = False
         
         if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
             raise ValueError("Çözüm bulunamadı (kısıtlar fazla sıkı olabilir).")
         
+        return self._son_cozumu_kaydet(solver, status, durgunluk)
+    
+    def _son_cozumu_kaydet(self, solver: cp_model.CpSolver, status, durgunluk: bool = False) -> Dict:
+        """Bitmiş bir aramanın sonucunu kurar ve son_cozum'a yazar"""
+        self._cozum_raporunu_olustur(solver, status, durgunluk=durgunluk)
+        self.son_cozum = self._ara_cozum(
+            self._atama_dizisi(solver.ResponseProto()),
+            amac_degeri=solver.ObjectiveValue(),
+            en_iyi_sinir=solver.BestObjectiveBound(),
+            gecen_sure=solver.WallTime(),
+            cozum_no=0,
+            son=True,
+            durum=solver.StatusName(status)
+        )
+        return self.son_cozum.sonuc
+    
+    def _durma_nedeni(self, solver: cp_model.CpSolver, status, durgunluk: bool) -> str:
+        """Aramanın neden bittiğini döndürür"""
+        if status == cp_model.INFEASIBLE:
+            return "cozumsuz"
+        if durgunluk:
+            return "durgunluk"
+        if status == cp_model.OPTIMAL:
+            # Boşluk eşiğiyle durunca CP-SAT da OPTIMAL döner; gerçek boşluğa bakılır
+            kalan = abs(solver.ObjectiveValue() - solver.BestObjectiveBound())
+            return "bosluk" if kalan > 1e-6 else "optimal"
+        if solver.WallTime() >= solver.parameters.max_time_in_seconds * 0.98:
+            return "sure"
+        return "durduruldu"
+    
+    def _cozum_raporunu_olustur(self, solver: cp_model.CpSolver, status,
+                                kademeler: Optional[List[KademeSonucu]] = None, durgunluk: bool = False):
+        """
+        Amaç terimlerini aile bazında toplar, durum/sınır/arama istatistiklerini rapora yazar.
+        
+        Kademeli modda amaç değeri tüm ailelerin ağırlıklı toplamıdır (tek amaçlı
+        çözümle karşılaştırılabilir); durum ancak tüm kademeler optimumsa OPTIMAL'dir.
+        Sınır kademe sınırlarının toplamıdır, ağırlıklı amaç için alt sınır değildir.
+        """
+        aile_maliyetleri = {
+            isim: sum(solver.Value(t) for t in self.objective_terms[bas:bit])
+            for isim, (bas, bit) in self.amac_aile_araliklari.items()
+        }
+        if kademeler:
+            amac = float(sum(aile_maliyetleri.values()))
+            optimal = all(k.durum == "OPTIMAL" for k in kademeler)
+            sinir = amac if optimal else sum(k.en_iyi_sinir for k in kademeler)
+            durum = "OPTIMAL" if optimal else "FEASIBLE"
+            sure = sum(k.sure_saniye for k in kademeler)
+            sureler = self.input.config.kademe_sureleri_saniye or [self.input.config.max_sure_saniye]
+            butce = sum(sureler[min(i, len(sureler) - 1)] for i in range(len(kademeler)))
+            dal = sum(k.dal_sayisi for k in kademeler)
+            catisma = sum(k.catisma_sayisi for k in kademeler)
+        else:
+            amac = solver.ObjectiveValue()
+            sinir = solver.BestObjectiveBound()
+            durum = solver.StatusName(status)
+            sure = solver.WallTime()
+            butce = solver.parameters.max_time_in_seconds
+            dal = solver.NumBranches()
+            catisma = solver.NumConflicts()
+        self.rapor.cozum = CozumRaporu(
+            durum=durum,
+            amac_degeri=amac,
+            en_iyi_sinir=sinir,
+            bosluk=abs(amac - sinir) / max(1.0, abs(amac)),
+            sure_saniye=sure,
+            dal_sayisi=dal,
+            catisma_sayisi=catisma,
+            sure_butcesi_saniye=butce,
+            durma_nedeni=self._durma_nedeni(solver, status, durgunluk),
+            aile_maliyetleri=aile_maliyetleri,
+            kademeler=kademeler or []
+        )
+    
+    def _x_degerleri(self, cevap) -> np.ndarray:
+        """
+        Tüm atama değişkenlerinin değerini tek seferde okur (self.x sırasıyla).
+        cevap: CpSolver.ResponseProto() veya çözüm callback'inin Response()'u
+        """
+        return np.asarray(cevap.solution, dtype=np.int64)[self._x_indeksleri]
+    
+    def _atama_dizisi(self, cevap) -> np.ndarray:
+        """Değeri 1 olan atamaların (personel_idx, gün, alan_idx, vardiya_idx) satırları"""
+        return self._x_anahtarlari[self._x_degerleri(cevap) == 1]
+    
+    def _ara_cozum(self, atamalar: np.ndarray, **kwargs) -> AraCozum:
+        """Sözlük formatı gerektiğinde bu solver'ın moduna göre kurulan AraCozum"""
+        return AraCozum(atamalar=atamalar, _sonuc_kur=self._sonuc_olustur, **kwargs)
+    
+    def _sonuc_olustur(self, atamalar: np.ndarray) -> Dict:
+        """
+        Atama dizisinden mod'a uygun sonuç sözlüğünü kurar.
+        Bir slottaki isimler personel sırasıyla, vardiyalar tanım sırasıyla gelir.
+        """
+        sirali = atamalar[np.lexsort((atamalar[:, 0], atamalar[:, 3], atamalar[:, 2], atamalar[:, 1]))]
+        personeller = self.input.personeller
+        gunler = range(1, self.gun_sayisi + 1)
+        
         if self.input.vardiya_modu and self.input.coklu_alan_modu:
-            sonuc = {}
-            for g in range(1, self.gun_sayisi + 1):
-                sonuc[g] = {}
-                for a_idx, alan in enumerate(self.input.alanlar):
-                    sonuc[g][alan.isim] = {}
-                    for v_idx, vardiya in enumerate(self.input.vardiyalar):
-                        kisiler = [isim for p_idx, isim in enumerate(self.input.personeller)
-                                  if solver.Value(self.x[p_idx, g, a_idx, v_idx]) == 1]
-                        if kisiler:
-                            sonuc[g][alan.isim][vardiya.isim] = kisiler
-            return sonuc
+            sonuc = {g: {alan: {} for alan in self.alan_isimleri} for g in gunler}
+            for p, g, a, v in sirali.tolist():
+                sonuc[g][self.alan_isimleri[a]].setdefault(self.vardiya_isimleri[v], []).append(personeller[p])
         
         elif self.input.vardiya_modu:
-            sonuc = {}
-            for g in range(1, self.gun_sayisi + 1):
-                sonuc[g] = {}
-                for v_idx, vardiya in enumerate(self.input.vardiyalar):
-                    kisiler = [isim for p_idx, isim in enumerate(self.input.personeller)
-                              if solver.Value(self.x[p_idx, g, 0, v_idx]) == 1]
-                    if kisiler:
-                        sonuc[g][vardiya.isim] = kisiler
-            return sonuc
+            sonuc = {g: {} for g in gunler}
+            for p, g, _, v in sirali.tolist():
+                sonuc[g].setdefault(self.vardiya_isimleri[v], []).append(personeller[p])
         
         elif self.input.coklu_alan_modu:
-            sonuc = {}
-            for g in range(1, self.gun_sayisi + 1):
-                sonuc[g] = {}
-                for a_idx, alan in enumerate(self.input.alanlar):
-                    sonuc[g][alan.isim] = [isim for p_idx, isim in enumerate(self.input.personeller)
-                                          if solver.Value(self.x[p_idx, g, a_idx, 0]) == 1]
-            return sonuc
+            sonuc = {g: {alan: [] for alan in self.alan_isimleri} for g in gunler}
+            for p, g, a, _ in sirali.tolist():
+                sonuc[g][self.alan_isimleri[a]].append(personeller[p])
         
         else:
-            sonuc = {}
-            for g in range(1, self.gun_sayisi + 1):
-                sonuc[g] = [isim for p_idx, isim in enumerate(self.input.personeller)
-                           if solver.Value(self.x[p_idx, g, 0, 0]) == 1]
-            return sonuc
+            sonuc = {g: [] for g in gunler}
+            for p, g, _, _ in sirali.tolist():
+                sonuc[g].append(personeller[p])
+        
+        return sonuc
 
 
 # =============================================================================
@@ -669,8 +2031,12 @@ def gelismis_teshis(
     ardisik_yasak: bool = True
 ) -> List[TeshisSonucu]:
     """
-    Çözüm bulunamadığında detaylı teşhis yapar.
+    Çözüm bulunamadığında (veya çözümden önce) detaylı teşhis yapar.
     Tüm olası sorunları tespit edip raporlar.
+    
+    Kontroller Boolean matrisler üzerinde maskeli toplamlardır:
+    kişi×gün müsaitlik, kişi×alan yetkinlik, kişi×vardiya izni ve kişi bazında
+    kıdem grubu. Mesaj listeleri yalnızca ihlal olan hücreler için kurulur.
     """
     sorunlar = []
     gun_sayisi = ay_gun_sayisi(yil, ay)
@@ -682,53 +2048,71 @@ def gelismis_teshis(
     alanlar = alanlar or []
     vardiyalar = vardiyalar or []
     
+    isimler = np.array(personeller, dtype=object)
+    n_p = len(personeller)
+    
+    # Kişi×gün müsaitlik (sütun g-1 = gün g)
+    musait = np.ones((n_p, gun_sayisi), dtype=bool)
+    for i, p in enumerate(personeller):
+        izinli = [g - 1 for g in izinler.get(p, ()) if 1 <= g <= gun_sayisi]
+        musait[i, izinli] = False
+    
+    # Kişi×alan yetkinlik (liste boşsa tüm alanlar)
+    yetkin = np.ones((n_p, len(alanlar)), dtype=bool)
+    for i, p in enumerate(personeller):
+        liste = personel_alan_yetkinlikleri.get(p)
+        if liste:
+            yetkin[i] = [a.isim in liste for a in alanlar]
+    
+    # Kişi×vardiya izni (liste boşsa tüm vardiyalar)
+    vardiya_izinli = np.ones((n_p, len(vardiyalar)), dtype=bool)
+    for i, p in enumerate(personeller):
+        liste = personel_vardiya_kisitlari.get(p)
+        if liste:
+            vardiya_izinli[i] = [v.isim in liste for v in vardiyalar]
+    
+    kidem = np.array([personel_kidem_gruplari.get(p) for p in personeller], dtype=object)
+    hedef = np.array([hedefler.get(p, 0) for p in personeller], dtype=np.int64)
+    
     # =========================================================================
     # 1. KİŞİ BAZLI HEDEF ANALİZİ
     # =========================================================================
     
-    for p in personeller:
-        musait_gunler = [g for g in range(1, gun_sayisi + 1) if g not in izinler.get(p, set())]
-        musait_gun_sayisi = len(musait_gunler)
-        
-        # Ardışık yasak varsa max nöbet = (müsait+1)/2
-        if ardisik_yasak:
-            max_mumkun = (musait_gun_sayisi + 1) // 2
-        else:
-            max_mumkun = musait_gun_sayisi
-        
-        toplam_hedef = hedefler.get(p, 0)
-        
-        if toplam_hedef > max_mumkun:
+    musait_gun_sayisi = musait.sum(axis=1)
+    # Ardışık yasak varsa max nöbet = (müsait+1)/2
+    max_mumkun = (musait_gun_sayisi + 1) // 2 if ardisik_yasak else musait_gun_sayisi
+    
+    for i in range(n_p):
+        p = personeller[i]
+        if hedef[i] > max_mumkun[i]:
             sorunlar.append(TeshisSonucu(
                 tip="hedef_imkansiz",
                 seviye="error",
                 gun=None,
-                mesaj=f"{p}: Hedef ({toplam_hedef}) > maksimum mümkün ({max_mumkun})",
+                mesaj=f"{p}: Hedef ({hedef[i]}) > maksimum mümkün ({max_mumkun[i]})",
                 detay={
                     "personel": p,
-                    "hedef": toplam_hedef,
-                    "musait_gun": musait_gun_sayisi,
-                    "max_mumkun": max_mumkun,
+                    "hedef": int(hedef[i]),
+                    "musait_gun": int(musait_gun_sayisi[i]),
+                    "max_mumkun": int(max_mumkun[i]),
                     "ardisik_yasak": ardisik_yasak
                 }
             ))
         
         # Vardiya bazlı hedef kontrolü
         if p in vardiya_hedefleri and vardiyalar:
-            p_vardiya_hedef = vardiya_hedefleri[p]
             p_kisitlar = personel_vardiya_kisitlari.get(p, [])
-            
-            for vardiya_isim, hedef in p_vardiya_hedef.items():
-                if hedef > 0 and p_kisitlar and vardiya_isim not in p_kisitlar:
+            for vardiya_isim, v_hedef in vardiya_hedefleri[p].items():
+                if v_hedef > 0 and p_kisitlar and vardiya_isim not in p_kisitlar:
                     sorunlar.append(TeshisSonucu(
                         tip="vardiya_uyumsuz",
                         seviye="error",
                         gun=None,
-                        mesaj=f"{p}: {vardiya_isim} için hedef var ({hedef}) ama bu vardiyada çalışamaz",
+                        mesaj=f"{p}: {vardiya_isim} için hedef var ({v_hedef}) ama bu vardiyada çalışamaz",
                         detay={
                             "personel": p,
                             "vardiya": vardiya_isim,
-                            "hedef": hedef,
+                            "hedef": v_hedef,
                             "calisabilir_vardiyalar": p_kisitlar
                         }
                     ))
@@ -738,49 +2122,71 @@ def gelismis_teshis(
     # =========================================================================
     
     if alanlar:
-        for p in personeller:
-            yetkin_alanlar = personel_alan_yetkinlikleri.get(p, [])
-            hedef = hedefler.get(p, 0)
-            
-            if yetkin_alanlar and hedef > 0:
-                # Bu kişi sadece belirli alanlarda çalışabilir
-                # O alanların toplam kapasitesi yeterli mi?
-                toplam_kapasite = 0
-                for alan in alanlar:
-                    if alan.isim in yetkin_alanlar:
-                        toplam_kapasite += alan.gunluk_kontenjan * gun_sayisi
-                
-                if hedef > toplam_kapasite:
-                    sorunlar.append(TeshisSonucu(
-                        tip="alan_kapasite_yetersiz",
-                        seviye="warning",
-                        gun=None,
-                        mesaj=f"{p}: Hedef ({hedef}) > çalışabildiği alanların kapasitesi ({toplam_kapasite})",
-                        detay={
-                            "personel": p,
-                            "hedef": hedef,
-                            "yetkin_alanlar": yetkin_alanlar,
-                            "toplam_kapasite": toplam_kapasite
-                        }
-                    ))
+        # Sadece belirli alanlarda çalışabilenler: o alanların toplam kapasitesi yeterli mi?
+        kontenjan = np.array([a.gunluk_kontenjan for a in alanlar], dtype=np.int64)
+        kapasite = yetkin.astype(np.int64) @ kontenjan * gun_sayisi
+        kisitli = np.array([bool(personel_alan_yetkinlikleri.get(p)) for p in personeller], dtype=bool)
+        for i in np.flatnonzero(kisitli & (hedef > 0) & (hedef > kapasite)):
+            p = personeller[i]
+            sorunlar.append(TeshisSonucu(
+                tip="alan_kapasite_yetersiz",
+                seviye="warning",
+                gun=None,
+                mesaj=f"{p}: Hedef ({hedef[i]}) > çalışabildiği alanların kapasitesi ({kapasite[i]})",
+                detay={
+                    "personel": p,
+                    "hedef": int(hedef[i]),
+                    "yetkin_alanlar": personel_alan_yetkinlikleri.get(p, []),
+                    "toplam_kapasite": int(kapasite[i])
+                }
+            ))
     
     # =========================================================================
     # 3. GÜNLÜK KAPASİTE ANALİZİ (Unfillable Shift Detection)
     # =========================================================================
-
-    for gun in range(1, gun_sayisi + 1):
-        musait_kisiler = [p for p in personeller if gun not in izinler.get(p, set())]
-
+    
+    musait_i = musait.astype(np.int64)
+    # Gün×alan müsait kişi sayısı
+    alan_sayim = musait_i.T @ yetkin.astype(np.int64)
+    # (alan, grup, min) kuralları için gün bazında müsait grup üyesi sayısı
+    kidem_kontrolleri = []
+    for a_idx, alan in enumerate(alanlar):
+        for grup_isim, kurallar in (alan.kidem_kurallari or {}).items():
+            min_k = kurallar.get("min", 0)
+            if min_k > 0:
+                maske = yetkin[:, a_idx] & (kidem == grup_isim)
+                kidem_kontrolleri.append((a_idx, grup_isim, min_k, maske, musait_i[maske].sum(axis=0)))
+    # Gün×vardiya ve gün×alan×vardiya müsait kişi sayıları
+    vardiya_sayim = musait_i.T @ vardiya_izinli.astype(np.int64)
+    alan_vardiya_sayim = np.einsum(
+        "pd,pa,pv->dav", musait_i, yetkin.astype(np.int64), vardiya_izinli.astype(np.int64)
+    )
+    alan_vardiya_gecerli = np.array(
+        [[not a.vardiya_tipleri or v.isim in a.vardiya_tipleri for v in vardiyalar] for a in alanlar],
+        dtype=bool
+    ).reshape(len(alanlar), len(vardiyalar))
+    
+    # Sadece ihlal olan günler dolaşılır
+    ihlal = np.zeros(gun_sayisi, dtype=bool)
+    if alanlar:
+        kontenjan = np.array([a.gunluk_kontenjan for a in alanlar], dtype=np.int64)
+        ihlal |= (alan_sayim < kontenjan).any(axis=1)
+        for _, _, min_k, _, sayim in kidem_kontrolleri:
+            ihlal |= sayim < min_k
+    if vardiyalar:
+        if alanlar:
+            ihlal |= ((alan_vardiya_sayim < 1) & alan_vardiya_gecerli).any(axis=(1, 2))
+        else:
+            ihlal |= (vardiya_sayim < 1).any(axis=1)
+    
+    for d in np.flatnonzero(ihlal):
+        gun = int(d) + 1
+        
         if alanlar:
             # Çoklu alan modu
-            for alan in alanlar:
-                # Bu alanda çalışabilecek müsait kişiler
-                alan_musait = [
-                    p for p in musait_kisiler
-                    if not personel_alan_yetkinlikleri.get(p) or alan.isim in personel_alan_yetkinlikleri.get(p, [])
-                ]
-
-                if len(alan_musait) < alan.gunluk_kontenjan:
+            for a_idx, alan in enumerate(alanlar):
+                if alan_sayim[d, a_idx] < alan.gunluk_kontenjan:
+                    alan_musait = list(isimler[musait[:, d] & yetkin[:, a_idx]])
                     sorunlar.append(TeshisSonucu(
                         tip="gunluk_kapasite_yetersiz",
                         seviye="error",
@@ -794,86 +2200,61 @@ def gelismis_teshis(
                             "gerekli_kontenjan": alan.gunluk_kontenjan
                         }
                     ))
-
+                
                 # Kıdem kuralları kontrolü
-                alan_kidem = alan.kidem_kurallari
-                if alan_kidem:
-                    for grup_isim, kurallar in alan_kidem.items():
-                        min_k = kurallar.get("min", 0)
-                        if min_k > 0:
-                            # Bu gruptan bu alanda çalışabilecek müsait kişiler
-                            grup_musait = [
-                                p for p in alan_musait
-                                if personel_kidem_gruplari.get(p) == grup_isim
-                            ]
-
-                            if len(grup_musait) < min_k:
-                                sorunlar.append(TeshisSonucu(
-                                    tip="kidem_eksik",
-                                    seviye="error",
-                                    gun=gun,
-                                    mesaj=f"Gün {gun}, {alan.isim}: {grup_isim} grubu min {min_k} gerekli, müsait = {len(grup_musait)}",
-                                    detay={
-                                        "gun": gun,
-                                        "alan": alan.isim,
-                                        "kidem_grubu": grup_isim,
-                                        "gerekli_min": min_k,
-                                        "musait_sayisi": len(grup_musait),
-                                        "musait_kisiler": grup_musait
-                                    }
-                                ))
-
+                for k_alan, grup_isim, min_k, maske, sayim in kidem_kontrolleri:
+                    if k_alan != a_idx or sayim[d] >= min_k:
+                        continue
+                    grup_musait = list(isimler[maske & musait[:, d]])
+                    sorunlar.append(TeshisSonucu(
+                        tip="kidem_eksik",
+                        seviye="error",
+                        gun=gun,
+                        mesaj=f"Gün {gun}, {alan.isim}: {grup_isim} grubu min {min_k} gerekli, müsait = {len(grup_musait)}",
+                        detay={
+                            "gun": gun,
+                            "alan": alan.isim,
+                            "kidem_grubu": grup_isim,
+                            "gerekli_min": min_k,
+                            "musait_sayisi": len(grup_musait),
+                            "musait_kisiler": grup_musait
+                        }
+                    ))
+        
         # Vardiya kontrolü - detect unfillable shifts
-        if vardiyalar:
-            for vardiya in vardiyalar:
-                # Bu vardiyada çalışabilecek müsait kişiler
-                vardiya_musait = [
-                    p for p in musait_kisiler
-                    if not personel_vardiya_kisitlari.get(p) or vardiya.isim in personel_vardiya_kisitlari.get(p, [])
-                ]
-
-                # If there are multiple areas, check each area+vardiya combination
-                if alanlar:
-                    for alan in alanlar:
-                        # Skip if this vardiya is not valid for this area
-                        if alan.vardiya_tipleri and vardiya.isim not in alan.vardiya_tipleri:
-                            continue
-
-                        # People who can work in this area AND this shift
-                        alan_vardiya_musait = [
-                            p for p in vardiya_musait
-                            if not personel_alan_yetkinlikleri.get(p) or alan.isim in personel_alan_yetkinlikleri.get(p, [])
-                        ]
-
-                        if len(alan_vardiya_musait) < 1:
-                            sorunlar.append(TeshisSonucu(
-                                tip="vardiya_alan_bos_kalacak",
-                                seviye="error",
-                                gun=gun,
-                                mesaj=f"Gün {gun}, {alan.isim}, {vardiya.isim}: Çalışabilecek müsait kimse yok! (Minimum staffing gerekli)",
-                                detay={
-                                    "gun": gun,
-                                    "alan": alan.isim,
-                                    "vardiya": vardiya.isim,
-                                    "musait_kisiler": [],
-                                    "oneri": "Bu gün için izinleri azaltın veya minimum staffing ayarını soft yapın"
-                                }
-                            ))
-                else:
-                    # Single area mode
-                    if len(vardiya_musait) < 1:
-                        sorunlar.append(TeshisSonucu(
-                            tip="vardiya_bos_kalacak",
-                            seviye="error",
-                            gun=gun,
-                            mesaj=f"Gün {gun}, {vardiya.isim}: Çalışabilecek müsait kimse yok! (Minimum staffing gerekli)",
-                            detay={
-                                "gun": gun,
-                                "vardiya": vardiya.isim,
-                                "musait_kisiler": [],
-                                "oneri": "Bu gün için izinleri azaltın veya minimum staffing ayarını soft yapın"
-                            }
-                        ))
+        for v_idx, vardiya in enumerate(vardiyalar):
+            if alanlar:
+                for a_idx, alan in enumerate(alanlar):
+                    # Alan için geçersiz vardiya veya dolurulabilir hücre
+                    if not alan_vardiya_gecerli[a_idx, v_idx] or alan_vardiya_sayim[d, a_idx, v_idx] >= 1:
+                        continue
+                    sorunlar.append(TeshisSonucu(
+                        tip="vardiya_alan_bos_kalacak",
+                        seviye="error",
+                        gun=gun,
+                        mesaj=f"Gün {gun}, {alan.isim}, {vardiya.isim}: Çalışabilecek müsait kimse yok! (Minimum staffing gerekli)",
+                        detay={
+                            "gun": gun,
+                            "alan": alan.isim,
+                            "vardiya": vardiya.isim,
+                            "musait_kisiler": [],
+                            "oneri": "Bu gün için izinleri azaltın veya minimum staffing ayarını soft yapın"
+                        }
+                    ))
+            elif vardiya_sayim[d, v_idx] < 1:
+                # Single area mode
+                sorunlar.append(TeshisSonucu(
+                    tip="vardiya_bos_kalacak",
+                    seviye="error",
+                    gun=gun,
+                    mesaj=f"Gün {gun}, {vardiya.isim}: Çalışabilecek müsait kimse yok! (Minimum staffing gerekli)",
+                    detay={
+                        "gun": gun,
+                        "vardiya": vardiya.isim,
+                        "musait_kisiler": [],
+                        "oneri": "Bu gün için izinleri azaltın veya minimum staffing ayarını soft yapın"
+                    }
+                ))
     
     # =========================================================================
     # 4. TOPLAM HEDEF vs KAPASİTE ANALİZİ
@@ -918,13 +2299,11 @@ def gelismis_teshis(
     # 5. EŞLEŞTİRME KURALLARI ANALİZİ
     # =========================================================================
     
+    indeks = {p: i for i, p in enumerate(personeller)}
     for (a, b, min_k) in birlikte_tut:
-        if a in personeller and b in personeller:
-            ortak_gunler = [
-                g for g in range(1, gun_sayisi + 1) 
-                if g not in izinler.get(a, set()) and g not in izinler.get(b, set())
-            ]
-            max_ortak = (len(ortak_gunler) + 1) // 2 if ardisik_yasak else len(ortak_gunler)
+        if a in indeks and b in indeks:
+            ortak_gun = int((musait[indeks[a]] & musait[indeks[b]]).sum())
+            max_ortak = (ortak_gun + 1) // 2 if ardisik_yasak else ortak_gun
             
             if max_ortak < min_k:
                 sorunlar.append(TeshisSonucu(
@@ -936,7 +2315,7 @@ def gelismis_teshis(
                         "personel_a": a,
                         "personel_b": b,
                         "min_birlikte": min_k,
-                        "ortak_musait_gun": len(ortak_gunler),
+                        "ortak_musait_gun": ortak_gun,
                         "max_mumkun": max_ortak
                     }
                 ))
@@ -1,100 +1,1036 @@
 """
 Nöbet Planlayıcı - Veri Saklama
 
-Ayarları ve aylık planları JSON dosyalarına kaydeder/yükler.
+Ayarları ve aylık planları kaydeder/yükler. Depolama arka ucu değiştirilebilir:
+- JsonDepolama (varsayılan): data/settings.json + her ay için data/schedules/YYYY_AA.json
+- SqliteDepolama: tek veritabanı dosyası (WAL modu), normalize tablolar. Aynı
+  sunucuda eşzamanlı düzenleme ve personel/ay bazlı indeksli sorgular için.
+
+Arka uç NOBET_DEPOLAMA ortam değişkeniyle ("json", "sqlite" veya
+"sqlite:/yol/nobet.db") ya da depolama_arka_ucunu_ayarla ile seçilir; modül
+fonksiyonları (ayarlari_kaydet, aylik_plani_yukle, ...) seçili arka uca gider.
+Çözüm önbelleği her iki durumda da data/cache altındaki dosyalardadır.
+
+Her plan kaydı ayın eklemeli revizyon geçmişine de yazılır (JSON: data/history,
+SQLite: plan_revizyon tablosu); plan_revizyonlari, plan_revizyonu,
+revizyon_farki ve revizyonu_geri_yukle ile okunur.
+
+Mevcut JSON verisini SQLite'a aktarmak için:
+    NOBET_DEPOLAMA=sqlite python -c "import storage; print(storage.json_dan_sqlite_a_aktar())"
 """
 
+import atexit
+import calendar
+import copy
+import hashlib
 import json
 import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from collections import Counter
 from pathlib import Path
-from typing import Optional, List
+from typing import Callable, Dict, Optional, List, Tuple
+from dataclasses import replace
 from datetime import datetime
 
-from models import Ayarlar, AylikPlan
+from models import Ayarlar, AylikPlan, sonuc_seviyesi
 
 
 # Varsayılan veri dizini
 DATA_DIR = Path(__file__).parent / "data"
 SETTINGS_FILE = DATA_DIR / "settings.json"
 SCHEDULES_DIR = DATA_DIR / "schedules"
+CACHE_DIR = DATA_DIR / "cache"
+# Kayıtlı planların özet indeksi (kenar çubuğu listesi plan dosyalarını açmadan okur)
+PLAN_INDEX_FILE = DATA_DIR / "plan_index.json"
+PLAN_INDEX_SURUMU = 1
+# SqliteDepolama varsayılan veritabanı dosyası
+SQLITE_FILE = DATA_DIR / "nobet.db"
+# Plan revizyon günlükleri (JsonDepolama): ay başına eklemeli JSON satırları
+HISTORY_DIR = DATA_DIR / "history"
+# Bu kadar revizyonda bir tam kopya; geri kurmak en fazla REVIZYON_TAM_ARALIGI - 1 fark uygular
+REVIZYON_TAM_ARALIGI = 10
+
+# Ertelenmiş ayar kaydı: son değişiklikten bu kadar saniye sonra yazılır,
+# düzenlemeler sürse de ilk değişiklikten en geç AYAR_MAX_BEKLEME saniye sonra
+AYAR_KAYIT_GECIKMESI = 2.0
+AYAR_MAX_BEKLEME = 10.0
+
+# Çözüm önbelleği toplam boyut sınırı (aşılınca en uzun süredir kullanılmayanlar silinir)
+ONBELLEK_MAX_BAYT = 50 * 1024 * 1024
 
 
 def veri_dizinini_hazirla():
     """Gerekli dizinleri oluşturur"""
     DATA_DIR.mkdir(exist_ok=True)
     SCHEDULES_DIR.mkdir(exist_ok=True)
+    CACHE_DIR.mkdir(exist_ok=True)
+
+
+def _atomik_yaz(dosya_yolu: Path, icerik: str):
+    """
+    İçeriği aynı dizinde geçici dosyaya yazıp os.replace ile yerine koyar.
+    Yazma yarıda kesilirse eski dosya olduğu gibi kalır.
+    """
+    fd, gecici = tempfile.mkstemp(dir=dosya_yolu.parent, prefix=f".{dosya_yolu.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(icerik)
+        os.replace(gecici, dosya_yolu)
+    except BaseException:
+        if os.path.exists(gecici):
+            os.unlink(gecici)
+        raise
+
+
+def _ayarlari_serilestir(ayarlar: Ayarlar) -> Tuple[str, str]:
+    """Ayarların JSON metni ve içerik özeti (değişmeyen ayarlar yeniden yazılmaz)"""
+    icerik = json.dumps(ayarlar.to_dict(), ensure_ascii=False, indent=2)
+    return icerik, hashlib.sha256(icerik.encode('utf-8')).hexdigest()
+
+
+def _plan_dosya_adi(yil: int, ay: int) -> str:
+    return f"{yil}_{ay:02d}.json"
+
+
+def _sonuc_satirlari(
+    sonuc: Dict, sonuc_alanli: bool, bos_hucreler: bool = False
+) -> List[Tuple[int, Optional[str], Optional[str], Optional[str]]]:
+    """
+    Sonucu sıralı (gün, alan, vardiya, isim) satırlarına açar.
+    Tek seviyeli {gün: {anahtar: [...]}} formatında anahtar sonuc_alanlı ise alan,
+    değilse vardiya sayılır (solver.sonuc_atamalari ile aynı yorum).
+    bos_hucreler True ise boş gün, alan ve hücreler isim None olan satırlarla
+    yerinde korunur (boş gün: alan ve vardiya da None).
+    """
+    satirlar = []
+
+    def ekle(gun, alan, vardiya, kisiler):
+        satirlar.extend((gun, alan, vardiya, isim) for isim in kisiler)
+        if bos_hucreler and not kisiler:
+            satirlar.append((gun, alan, vardiya, None))
+
+    for gun_anahtar, gun_data in sonuc.items():
+        gun = int(gun_anahtar)
+        if isinstance(gun_data, list):
+            ekle(gun, None, None, gun_data)
+            continue
+        if not gun_data:
+            ekle(gun, None, None, [])
+        for anahtar, deger in gun_data.items():
+            if isinstance(deger, dict):
+                if not deger:
+                    ekle(gun, anahtar, None, [])
+                for vardiya_isim, kisiler in deger.items():
+                    ekle(gun, anahtar, vardiya_isim, kisiler)
+            elif sonuc_alanli:
+                ekle(gun, anahtar, None, deger)
+            else:
+                ekle(gun, None, anahtar, deger)
+    return satirlar
+
+
+# =============================================================================
+# DEPOLAMA ARKA UÇLARI
+# =============================================================================
+
+class DepolamaArkaUcu(ABC):
+    """
+    Ayarlar ve aylık planlar için depolama arayüzü.
+
+    Metotlar hata durumunda istisna fırlatır; modül fonksiyonları yakalayıp
+    mesaj yazar ve False/None/[] döndürür. Soyut metotların hepsini
+    uygulamayan arka uç oluşturulurken TypeError verir.
+    """
+
+    @abstractmethod
+    def ayarlari_kaydet(self, ayarlar: Ayarlar) -> bool:
+        """İçerik kayıtlı olanla aynıysa yazmaz; yazdıysa True"""
+
+    @abstractmethod
+    def ayarlari_yukle(self) -> Optional[Ayarlar]:
+        """Kayıtlı ayarlar yoksa None"""
+
+    @abstractmethod
+    def plani_kaydet(self, plan: AylikPlan):
+        """Planı yazar (varsa üzerine)"""
+
+    @abstractmethod
+    def plani_yukle(self, yil: int, ay: int) -> Optional[AylikPlan]:
+        """Plan yoksa None"""
+
+    @abstractmethod
+    def planlari_listele(self) -> List[dict]:
+        """kayitli_planlari_listele biçiminde özetler (sırasız)"""
+
+    @abstractmethod
+    def plani_sil(self, yil: int, ay: int) -> bool:
+        """Plan vardı ve silindiyse True"""
+
+    def personel_atamalari(self, isim: str, yil: Optional[int] = None) -> List[dict]:
+        """
+        Kişinin kayıtlı planlardaki tüm atamaları (yıl, ay, gün sırasıyla).
+        Varsayılan uygulama planları tek tek açar; SqliteDepolama indeksten okur.
+        """
+        atamalar = []
+        ozetler = sorted(self.planlari_listele(), key=lambda x: (x["yil"], x["ay"]))
+        for ozet in ozetler:
+            if not ozet["sonuc_var"] or (yil is not None and ozet["yil"] != yil):
+                continue
+            plan = self.plani_yukle(ozet["yil"], ozet["ay"])
+            if plan is None or not plan.sonuc:
+                continue
+            for gun, alan, vardiya, kisi in sorted(_sonuc_satirlari(plan.sonuc, plan.sonuc_alanlı), key=lambda t: t[0]):
+                if kisi == isim:
+                    atamalar.append({"yil": plan.yil, "ay": plan.ay, "gun": gun, "alan": alan, "vardiya": vardiya})
+        return atamalar
+
+    @abstractmethod
+    def revizyonlari_oku(self, yil: int, ay: int) -> List[dict]:
+        """Ayın revizyon kayıtları, no sırasıyla (yoksa boş)"""
+
+    @abstractmethod
+    def revizyon_ekle(self, yil: int, ay: int, kayit_olustur: Callable[[List[dict]], Optional[dict]]) -> Optional[dict]:
+        """
+        kayit_olustur(mevcut revizyonlar) sonucunu günlüğe ekler (None ise eklemez).
+        Okuma ve ekleme birlikte yapılır: eşzamanlı iki kayıt aynı numarayı almaz.
+        """
+
+
+def _plan_ozeti(data: dict, stat: os.stat_result) -> dict:
+    """İndeks girdisi: listede gösterilen alanlar + geçerlilik için dosyanın mtime/boyutu"""
+    return {
+        "yil": data.get("yil"),
+        "ay": data.get("ay"),
+        "olusturma_tarihi": data.get("olusturma_tarihi"),
+        "sonuc_var": data.get("sonuc") is not None,
+        "mtime_ns": stat.st_mtime_ns,
+        "boyut": stat.st_size
+    }
+
+
+def _plan_indeksini_oku() -> Dict[str, dict]:
+    """İndeksi {dosya_adi: özet} olarak döndürür; yoksa, bozuksa veya sürümü eskiyse boş"""
+    try:
+        with open(PLAN_INDEX_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("surum") == PLAN_INDEX_SURUMU:
+            return data.get("planlar", {})
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def _plan_indeksini_yaz(planlar: Dict[str, dict]):
+    icerik = json.dumps({"surum": PLAN_INDEX_SURUMU, "planlar": planlar}, ensure_ascii=False)
+    _atomik_yaz(PLAN_INDEX_FILE, icerik)
+
+
+def _plan_indeksini_guncelle(dosya_adi: str, data: Optional[dict], stat: Optional[os.stat_result] = None):
+    """
+    Tek bir planın indeks girdisini yazar (data None ise siler).
+    İndeks yalnızca bir önbellektir: yazılamazsa plan işlemi başarısız sayılmaz,
+    planlari_listele eksik/eskimiş girdiyi dosyadan yeniden üretir.
+    """
+    try:
+        planlar = _plan_indeksini_oku()
+        if data is None:
+            if planlar.pop(dosya_adi, None) is None:
+                return
+        else:
+            planlar[dosya_adi] = _plan_ozeti(data, stat)
+        _plan_indeksini_yaz(planlar)
+    except Exception as e:
+        print(f"Plan indeksi güncellenemedi: {e}")
+
+
+class JsonDepolama(DepolamaArkaUcu):
+    """Varsayılan arka uç: ayarlar settings.json, her ay schedules/YYYY_AA.json"""
+
+    def __init__(self):
+        # settings.json'ın son bilinen (mtime_ns, boyut, özet) bilgisi; dosya
+        # değişmedikçe özet için yeniden okunmaz
+        self._ayar_dosyasi_ozeti: Optional[Tuple[int, int, str]] = None
+        self._revizyon_kilidi = threading.Lock()
+
+    def _kayitli_ayar_ozeti(self) -> Optional[str]:
+        try:
+            stat = SETTINGS_FILE.stat()
+        except FileNotFoundError:
+            return None
+        bilinen = self._ayar_dosyasi_ozeti
+        if bilinen is not None and bilinen[:2] == (stat.st_mtime_ns, stat.st_size):
+            return bilinen[2]
+        ozet = hashlib.sha256(SETTINGS_FILE.read_bytes()).hexdigest()
+        self._ayar_dosyasi_ozeti = (stat.st_mtime_ns, stat.st_size, ozet)
+        return ozet
+
+    def ayarlari_kaydet(self, ayarlar: Ayarlar) -> bool:
+        veri_dizinini_hazirla()
+        icerik, ozet = _ayarlari_serilestir(ayarlar)
+        if ozet == self._kayitli_ayar_ozeti():
+            return False
+        # Geçici dosya + os.replace: yazarken çökme settings.json'ı bozmaz
+        _atomik_yaz(SETTINGS_FILE, icerik)
+        stat = SETTINGS_FILE.stat()
+        self._ayar_dosyasi_ozeti = (stat.st_mtime_ns, stat.st_size, ozet)
+        return True
+
+    def ayarlari_yukle(self) -> Optional[Ayarlar]:
+        if not SETTINGS_FILE.exists():
+            return None
+        with open(SETTINGS_FILE, 'r', encoding='utf-8') as f:
+            icerik = f.read()
+        try:
+            data = json.loads(icerik)
+        except ValueError:
+            # Bozuk dosyayı kenara kopyala: sonraki kayıt üzerine yazsa da elle kurtarılabilsin
+            shutil.copy2(SETTINGS_FILE, SETTINGS_FILE.with_name(SETTINGS_FILE.name + ".bozuk"))
+            raise
+        return Ayarlar.from_dict(data)
+
+    def plani_kaydet(self, plan: AylikPlan):
+        veri_dizinini_hazirla()
+        dosya_yolu = SCHEDULES_DIR / plan.dosya_adi
+        data = plan.to_dict()
+        # Girintisiz: sütunlu sonuçta indent her tamsayıyı ayrı satıra yazar
+        _atomik_yaz(dosya_yolu, json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+        _plan_indeksini_guncelle(plan.dosya_adi, data, dosya_yolu.stat())
+
+    def plani_yukle(self, yil: int, ay: int) -> Optional[AylikPlan]:
+        dosya_yolu = SCHEDULES_DIR / _plan_dosya_adi(yil, ay)
+        if not dosya_yolu.exists():
+            return None
+        with open(dosya_yolu, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return AylikPlan.from_dict(data)
+
+    def planlari_listele(self) -> List[dict]:
+        """
+        Plan dosyaları açılmaz; özetler plan_index.json'dan okunur. mtime veya
+        boyutu indekstekinden farklı olan (elle kopyalanmış, başka süreçte
+        yazılmış) dosyalar yeniden okunur ve indeks güncellenir.
+        """
+        veri_dizinini_hazirla()
+        indeks = _plan_indeksini_oku()
+        guncel = {}
+        degisti = False
+
+        with os.scandir(SCHEDULES_DIR) as girdiler:
+            for dosya in girdiler:
+                if not dosya.name.endswith(".json") or not dosya.is_file():
+                    continue
+                stat = dosya.stat()
+                ozet = indeks.get(dosya.name)
+                if ozet is None or ozet.get("mtime_ns") != stat.st_mtime_ns or ozet.get("boyut") != stat.st_size:
+                    try:
+                        with open(dosya.path, 'r', encoding='utf-8') as f:
+                            ozet = _plan_ozeti(json.load(f), stat)
+                    except Exception:
+                        # Okunamayan dosya da kaydedilir; değişmedikçe tekrar açılmaz
+                        ozet = {"gecersiz": True, "mtime_ns": stat.st_mtime_ns, "boyut": stat.st_size}
+                    degisti = True
+                guncel[dosya.name] = ozet
+
+        if degisti or guncel.keys() != indeks.keys():
+            try:
+                _plan_indeksini_yaz(guncel)
+            except Exception as e:
+                print(f"Plan indeksi yazılamadı: {e}")
+
+        return [
+            {
+                "yil": ozet["yil"],
+                "ay": ozet["ay"],
+                "dosya": dosya_adi,
+                "olusturma_tarihi": ozet["olusturma_tarihi"],
+                "sonuc_var": ozet["sonuc_var"]
+            }
+            for dosya_adi, ozet in guncel.items()
+            if not ozet.get("gecersiz")
+        ]
+
+    def plani_sil(self, yil: int, ay: int) -> bool:
+        dosya_adi = _plan_dosya_adi(yil, ay)
+        dosya_yolu = SCHEDULES_DIR / dosya_adi
+        if not dosya_yolu.exists():
+            return False
+        dosya_yolu.unlink()
+        _plan_indeksini_guncelle(dosya_adi, None)
+        return True
+
+    @staticmethod
+    def _gunluk_yolu(yil: int, ay: int) -> Path:
+        return HISTORY_DIR / f"{yil}_{ay:02d}.jsonl"
+
+    def revizyonlari_oku(self, yil: int, ay: int) -> List[dict]:
+        yol = self._gunluk_yolu(yil, ay)
+        if not yol.exists():
+            return []
+        with open(yol, 'r', encoding='utf-8') as f:
+            satirlar = [s for s in f.read().split("\n") if s.strip()]
+        revizyonlar = []
+        for satir in satirlar:
+            try:
+                revizyonlar.append(json.loads(satir))
+            except ValueError:
+                # Yarıda kesilmiş (onaylanmamış) ekleme; sonraki kayıtlar geçerli
+                print(f"Revizyon günlüğünde okunamayan satır atlandı: {yol.name}")
+        return revizyonlar
+
+    def revizyon_ekle(self, yil: int, ay: int, kayit_olustur: Callable[[List[dict]], Optional[dict]]) -> Optional[dict]:
+        # Süreç içi kilit; ayrı süreçlerden eşzamanlı kayıt için SqliteDepolama kullanın
+        with self._revizyon_kilidi:
+            kayit = kayit_olustur(self.revizyonlari_oku(yil, ay))
+            if kayit is None:
+                return None
+            HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+            with open(self._gunluk_yolu(yil, ay), 'a+b') as f:
+                # Önceki ekleme yarıda kaldıysa yeni kayıt onun satırına yapışmasın
+                basa = b""
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        basa = b"\n"
+                f.write(basa + json.dumps(kayit, ensure_ascii=False, separators=(",", ":")).encode('utf-8') + b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+            return kayit
+
+
+# Ayarlar'ın liste alanları -> tablo. Satırlar sira ile saklanır; ayrıntılar
+# (alan hedefleri, kıdem kuralları, ...) modelin to_dict çıktısı olarak veri sütununda.
+_AYAR_TABLOLARI = {
+    "personeller": "personel",
+    "alanlar": "alan",
+    "kidem_gruplari": "kidem_grubu",
+    "vardiya_tipleri": "vardiya_tipi",
+}
+_ESLESME_TURLERI = ("birlikte_tutma", "ayri_tutma", "esnek_ayri_tutma")
+
+# Sürüm 3: plan.sonuc_bicimi seviyeyi açıkça tutar, atama boş gün/hücreleri de saklar
+_SQLITE_SEMA_SURUMU = 3
+# plan.sonuc_bicimi değerleri, models.sonuc_seviyesi sırasıyla
+_SONUC_BICIMLERI = ("liste", "sozluk", "ic_ice")
+_ATAMA_TABLOSU = """
+CREATE TABLE IF NOT EXISTS atama (
+    yil INTEGER NOT NULL,
+    ay INTEGER NOT NULL,
+    gun INTEGER NOT NULL,
+    alan TEXT,
+    vardiya TEXT,
+    personel TEXT,                      -- NULL: boş gün/alan/hücre
+    FOREIGN KEY (yil, ay) REFERENCES plan(yil, ay) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS atama_yil_ay ON atama(yil, ay, gun);
+CREATE INDEX IF NOT EXISTS atama_personel ON atama(personel, yil, ay);
+"""
+_SQLITE_SEMA = """
+CREATE TABLE IF NOT EXISTS ayar (
+    anahtar TEXT PRIMARY KEY,
+    deger TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS personel (
+    sira INTEGER PRIMARY KEY,
+    isim TEXT NOT NULL,
+    kidem_grubu TEXT,
+    veri TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS personel_isim ON personel(isim);
+CREATE TABLE IF NOT EXISTS alan (
+    sira INTEGER PRIMARY KEY,
+    isim TEXT NOT NULL,
+    veri TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS kidem_grubu (
+    sira INTEGER PRIMARY KEY,
+    isim TEXT NOT NULL,
+    veri TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS vardiya_tipi (
+    sira INTEGER PRIMARY KEY,
+    isim TEXT NOT NULL,
+    veri TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS eslesme (
+    tur TEXT NOT NULL,
+    sira INTEGER NOT NULL,
+    personel_a TEXT NOT NULL,
+    personel_b TEXT NOT NULL,
+    veri TEXT NOT NULL,
+    PRIMARY KEY (tur, sira)
+);
+CREATE INDEX IF NOT EXISTS eslesme_personel_a ON eslesme(personel_a);
+CREATE INDEX IF NOT EXISTS eslesme_personel_b ON eslesme(personel_b);
+
+CREATE TABLE IF NOT EXISTS plan (
+    yil INTEGER NOT NULL,
+    ay INTEGER NOT NULL,
+    manuel_tatiller TEXT NOT NULL,
+    sonuc_bicimi TEXT,                  -- NULL: sonuç yok, 'liste', 'sozluk' (tek seviye) veya 'ic_ice'
+    sonuc_alanli INTEGER NOT NULL,
+    olusturma_tarihi TEXT,
+    guncelleme_tarihi TEXT NOT NULL,
+    PRIMARY KEY (yil, ay)
+);
+-- İzin ve tercih günleri; gun NULL ise kişinin listesi boş
+CREATE TABLE IF NOT EXISTS plan_gunu (
+    yil INTEGER NOT NULL,
+    ay INTEGER NOT NULL,
+    tur TEXT NOT NULL,                  -- 'izin' veya 'tercih'
+    personel TEXT NOT NULL,
+    gun INTEGER,
+    FOREIGN KEY (yil, ay) REFERENCES plan(yil, ay) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS plan_gunu_yil_ay ON plan_gunu(yil, ay);
+CREATE INDEX IF NOT EXISTS plan_gunu_personel ON plan_gunu(personel, yil, ay);
+CREATE TABLE IF NOT EXISTS plan_hedefi (
+    yil INTEGER NOT NULL,
+    ay INTEGER NOT NULL,
+    personel TEXT NOT NULL,
+    hedef INTEGER NOT NULL,
+    FOREIGN KEY (yil, ay) REFERENCES plan(yil, ay) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS plan_hedefi_yil_ay ON plan_hedefi(yil, ay);
+-- Sonuç: her satır bir atama; rowid sırası sonucun sözlük sırasını korur
+{atama}-- Plan geçmişi: eklemeli, plan silinse de kalır (veri = revizyon kaydının JSON'u)
+CREATE TABLE IF NOT EXISTS plan_revizyon (
+    yil INTEGER NOT NULL,
+    ay INTEGER NOT NULL,
+    no INTEGER NOT NULL,
+    tur TEXT NOT NULL,                  -- 'tam' veya 'fark'
+    tarih TEXT NOT NULL,
+    veri TEXT NOT NULL,
+    PRIMARY KEY (yil, ay, no)
+);
+""".replace("{atama}", _ATAMA_TABLOSU.lstrip())
+
+
+class SqliteDepolama(DepolamaArkaUcu):
+    """
+    Tek dosyalı SQLite arka ucu (WAL modu).
+
+    Her işlem kendi bağlantısını açar (Streamlit oturumları ayrı thread'lerde
+    çalışır); yazmalar BEGIN IMMEDIATE ile tek işlemde yapılır, kilitli
+    veritabanında bekleme_saniye kadar beklenir. WAL sayesinde okuyucular
+    yazarı beklemez.
+    """
+
+    def __init__(self, yol: Optional[Path] = None, bekleme_saniye: float = 30.0):
+        self.yol = Path(yol) if yol is not None else SQLITE_FILE
+        self.bekleme_saniye = bekleme_saniye
+        self._sema_hazir = False
+
+    @contextmanager
+    def _baglanti(self):
+        if not self._sema_hazir:
+            self.yol.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.yol, timeout=self.bekleme_saniye, isolation_level=None)
+        try:
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            if not self._sema_hazir:
+                self._semayi_kur(conn)
+            yield conn
+        finally:
+            conn.close()
+
+    def _semayi_kur(self, conn: sqlite3.Connection):
+        # journal_mode kalıcıdır; dosya başına bir kez WAL'e geçer
+        conn.execute("PRAGMA journal_mode = WAL")
+        surum = conn.execute("PRAGMA user_version").fetchone()[0]
+        if surum < _SQLITE_SEMA_SURUMU:
+            conn.executescript(_SQLITE_SEMA)
+            if surum > 0:
+                self._surum_3_gecisi(conn)
+            conn.execute(f"PRAGMA user_version = {_SQLITE_SEMA_SURUMU}")
+        self._sema_hazir = True
+
+    @staticmethod
+    def _surum_3_gecisi(conn: sqlite3.Connection):
+        """
+        Sürüm 1-2 veritabanını sürüm 3'e taşır: atama.personel NULL olabilir,
+        'sozluk' planlardan iç içe olanlar 'ic_ice' olur ve eski yükleyicinin
+        ürettiği boş günler satır olarak eklenir (yüklenen sonuç değişmez).
+        """
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= 3:
+                conn.execute("COMMIT")  # Başka bir süreç taşıdı
+                return
+            conn.execute("ALTER TABLE atama RENAME TO atama_eski")
+            conn.execute("DROP INDEX IF EXISTS atama_yil_ay")
+            conn.execute("DROP INDEX IF EXISTS atama_personel")
+            for komut in _ATAMA_TABLOSU.split(";"):
+                if komut.strip():
+                    conn.execute(komut)
+            conn.execute(
+                "UPDATE plan SET sonuc_bicimi = 'ic_ice' WHERE sonuc_bicimi = 'sozluk' AND EXISTS ("
+                "SELECT 1 FROM atama_eski a WHERE a.yil = plan.yil AND a.ay = plan.ay "
+                "AND a.alan IS NOT NULL AND a.vardiya IS NOT NULL)"
+            )
+            # Eski yükleyici ayın tüm günlerini sırayla açıyordu: gün sırasıyla yeniden yaz
+            for yil, ay in conn.execute("SELECT yil, ay FROM plan WHERE sonuc_bicimi IS NOT NULL").fetchall():
+                satirlar = conn.execute(
+                    "SELECT gun, alan, vardiya, personel FROM atama_eski WHERE yil = ? AND ay = ? ORDER BY gun, rowid",
+                    (yil, ay)
+                ).fetchall()
+                dolu = {s[0] for s in satirlar}
+                satirlar += [(g, None, None, None) for g in range(1, calendar.monthrange(yil, ay)[1] + 1) if g not in dolu]
+                satirlar.sort(key=lambda s: s[0])
+                conn.executemany(
+                    "INSERT INTO atama (yil, ay, gun, alan, vardiya, personel) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(yil, ay, *s) for s in satirlar]
+                )
+            conn.execute("DROP TABLE atama_eski")
+            conn.execute(f"PRAGMA user_version = {_SQLITE_SEMA_SURUMU}")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @contextmanager
+    def _yazma(self):
+        """Yazma kilidini baştan alan işlem; hata olursa geri alınır"""
+        with self._baglanti() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    # --- Ayarlar ---
+
+    @staticmethod
+    def _ayarlari_yaz(conn: sqlite3.Connection, ayarlar: Ayarlar) -> bool:
+        _, ozet = _ayarlari_serilestir(ayarlar)
+        kayitli = conn.execute("SELECT deger FROM ayar WHERE anahtar = '_ozet'").fetchone()
+        if kayitli is not None and json.loads(kayitli[0]) == ozet:
+            return False
+        data = ayarlar.to_dict()
+        conn.execute("DELETE FROM ayar")
+        conn.executemany(
+            "INSERT INTO ayar (anahtar, deger) VALUES (?, ?)",
+            [(k, json.dumps(v, ensure_ascii=False)) for k, v in data.items()
+             if k not in _AYAR_TABLOLARI and k not in _ESLESME_TURLERI] + [("_ozet", json.dumps(ozet))]
+        )
+        for alan, tablo in _AYAR_TABLOLARI.items():
+            conn.execute(f"DELETE FROM {tablo}")
+            conn.executemany(
+                f"INSERT INTO {tablo} (sira, isim, veri) VALUES (?, ?, ?)",
+                [(i, d["isim"], json.dumps(d, ensure_ascii=False)) for i, d in enumerate(data[alan])]
+            )
+        conn.executemany(
+            "UPDATE personel SET kidem_grubu = ? WHERE sira = ?",
+            [(p.kidem_grubu, i) for i, p in enumerate(ayarlar.personeller) if p.kidem_grubu]
+        )
+        conn.execute("DELETE FROM eslesme")
+        conn.executemany(
+            "INSERT INTO eslesme (tur, sira, personel_a, personel_b, veri) VALUES (?, ?, ?, ?, ?)",
+            [(tur, i, d["personel_a"], d["personel_b"], json.dumps(d, ensure_ascii=False))
+             for tur in _ESLESME_TURLERI for i, d in enumerate(data[tur])]
+        )
+        return True
+
+    def ayarlari_kaydet(self, ayarlar: Ayarlar) -> bool:
+        with self._yazma() as conn:
+            return self._ayarlari_yaz(conn, ayarlar)
+
+    def ayarlari_yukle(self) -> Optional[Ayarlar]:
+        with self._baglanti() as conn:
+            # Tek okuma işlemi: eşzamanlı bir kayıt yarım görülmez
+            conn.execute("BEGIN")
+            data = {
+                k: json.loads(v) for k, v in
+                conn.execute("SELECT anahtar, deger FROM ayar WHERE anahtar != '_ozet'")
+            }
+            if not data:
+                conn.execute("COMMIT")
+                return None
+            for alan, tablo in _AYAR_TABLOLARI.items():
+                data[alan] = [json.loads(v) for (v,) in conn.execute(f"SELECT veri FROM {tablo} ORDER BY sira")]
+            for tur in _ESLESME_TURLERI:
+                data[tur] = [
+                    json.loads(v) for (v,) in
+                    conn.execute("SELECT veri FROM eslesme WHERE tur = ? ORDER BY sira", (tur,))
+                ]
+            conn.execute("COMMIT")
+        return Ayarlar.from_dict(data)
+
+    # --- Aylık planlar ---
+
+    @staticmethod
+    def _plani_yaz(conn: sqlite3.Connection, plan: AylikPlan):
+        anahtar = (plan.yil, plan.ay)
+        bicim = None if plan.sonuc is None else _SONUC_BICIMLERI[sonuc_seviyesi(plan.sonuc)]
+        conn.execute(
+            "INSERT INTO plan (yil, ay, manuel_tatiller, sonuc_bicimi, sonuc_alanli, olusturma_tarihi, guncelleme_tarihi) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (yil, ay) DO UPDATE SET manuel_tatiller = excluded.manuel_tatiller, "
+            "sonuc_bicimi = excluded.sonuc_bicimi, sonuc_alanli = excluded.sonuc_alanli, "
+            "olusturma_tarihi = excluded.olusturma_tarihi, guncelleme_tarihi = excluded.guncelleme_tarihi",
+            (*anahtar, json.dumps(plan.manuel_tatiller), bicim, int(plan.sonuc_alanlı),
+             plan.olusturma_tarihi, datetime.now().isoformat())
+        )
+        for tablo in ("plan_gunu", "plan_hedefi", "atama"):
+            conn.execute(f"DELETE FROM {tablo} WHERE yil = ? AND ay = ?", anahtar)
+
+        gunler = []
+        for tur, kaynak in (("izin", plan.izinler), ("tercih", plan.tercih_edilen_gunler)):
+            for isim, liste in kaynak.items():
+                gunler.extend((*anahtar, tur, isim, g) for g in liste)
+                if not liste:
+                    gunler.append((*anahtar, tur, isim, None))
+        conn.executemany("INSERT INTO plan_gunu (yil, ay, tur, personel, gun) VALUES (?, ?, ?, ?, ?)", gunler)
+        conn.executemany(
+            "INSERT INTO plan_hedefi (yil, ay, personel, hedef) VALUES (?, ?, ?, ?)",
+            [(*anahtar, isim, hedef) for isim, hedef in plan.hedef_override.items()]
+        )
+        if plan.sonuc:
+            conn.executemany(
+                "INSERT INTO atama (yil, ay, gun, alan, vardiya, personel) VALUES (?, ?, ?, ?, ?, ?)",
+                [(*anahtar, *satir) for satir in _sonuc_satirlari(plan.sonuc, plan.sonuc_alanlı, bos_hucreler=True)]
+            )
+
+    def plani_kaydet(self, plan: AylikPlan):
+        with self._yazma() as conn:
+            self._plani_yaz(conn, plan)
+
+    def plani_yukle(self, yil: int, ay: int) -> Optional[AylikPlan]:
+        anahtar = (yil, ay)
+        with self._baglanti() as conn:
+            conn.execute("BEGIN")
+            satir = conn.execute(
+                "SELECT manuel_tatiller, sonuc_bicimi, sonuc_alanli, olusturma_tarihi FROM plan WHERE yil = ? AND ay = ?",
+                anahtar
+            ).fetchone()
+            if satir is None:
+                conn.execute("COMMIT")
+                return None
+            manuel_tatiller, bicim, sonuc_alanli, olusturma_tarihi = satir
+
+            izinler, tercihler = {}, {}
+            for tur, isim, gun in conn.execute(
+                "SELECT tur, personel, gun FROM plan_gunu WHERE yil = ? AND ay = ? ORDER BY rowid", anahtar
+            ):
+                liste = (izinler if tur == "izin" else tercihler).setdefault(isim, [])
+                if gun is not None:
+                    liste.append(gun)
+            hedefler = dict(conn.execute(
+                "SELECT personel, hedef FROM plan_hedefi WHERE yil = ? AND ay = ? ORDER BY rowid", anahtar
+            ))
+
+            sonuc = None
+            if bicim is not None:
+                # Gün anahtarları JSON'dan yüklenen planlardaki gibi str; isim None: boş gün/alan/hücre
+                sonuc = {}
+                for gun, alan, vardiya, isim in conn.execute(
+                    "SELECT gun, alan, vardiya, personel FROM atama WHERE yil = ? AND ay = ? ORDER BY rowid", anahtar
+                ):
+                    gun_data = sonuc.setdefault(str(gun), [] if bicim == "liste" else {})
+                    if alan is None and vardiya is None:
+                        hucre = gun_data
+                    elif alan is not None and (vardiya is not None or (bicim == "ic_ice" and isim is None)):
+                        hucre = gun_data.setdefault(alan, {})
+                        if vardiya is not None:
+                            hucre = hucre.setdefault(vardiya, [])
+                    else:
+                        hucre = gun_data.setdefault(alan if alan is not None else vardiya, [])
+                    if isim is not None:
+                        hucre.append(isim)
+            conn.execute("COMMIT")
+
+        return AylikPlan(
+            yil=yil,
+            ay=ay,
+            izinler=izinler,
+            tercih_edilen_gunler=tercihler,
+            manuel_tatiller=json.loads(manuel_tatiller),
+            hedef_override=hedefler,
+            sonuc=sonuc,
+            sonuc_alanlı=bool(sonuc_alanli),
+            olusturma_tarihi=olusturma_tarihi
+        )
+
+    def planlari_listele(self) -> List[dict]:
+        with self._baglanti() as conn:
+            satirlar = conn.execute(
+                "SELECT yil, ay, olusturma_tarihi, sonuc_bicimi IS NOT NULL FROM plan"
+            ).fetchall()
+        return [
+            {
+                "yil": yil,
+                "ay": ay,
+                "dosya": _plan_dosya_adi(yil, ay),
+                "olusturma_tarihi": olusturma_tarihi,
+                "sonuc_var": bool(sonuc_var)
+            }
+            for yil, ay, olusturma_tarihi, sonuc_var in satirlar
+        ]
+
+    def plani_sil(self, yil: int, ay: int) -> bool:
+        with self._yazma() as conn:
+            return conn.execute("DELETE FROM plan WHERE yil = ? AND ay = ?", (yil, ay)).rowcount > 0
+
+    def personel_atamalari(self, isim: str, yil: Optional[int] = None) -> List[dict]:
+        sorgu = "SELECT yil, ay, gun, alan, vardiya FROM atama WHERE personel = ?"
+        parametreler = [isim]
+        if yil is not None:
+            sorgu += " AND yil = ?"
+            parametreler.append(yil)
+        with self._baglanti() as conn:
+            satirlar = conn.execute(sorgu + " ORDER BY yil, ay, gun", parametreler).fetchall()
+        return [
+            {"yil": y, "ay": a, "gun": g, "alan": alan, "vardiya": vardiya}
+            for y, a, g, alan, vardiya in satirlar
+        ]
+
+    def revizyonlari_oku(self, yil: int, ay: int) -> List[dict]:
+        with self._baglanti() as conn:
+            return self._revizyonlar(conn, yil, ay)
+
+    @staticmethod
+    def _revizyonlar(conn: sqlite3.Connection, yil: int, ay: int) -> List[dict]:
+        return [
+            json.loads(v) for (v,) in
+            conn.execute("SELECT veri FROM plan_revizyon WHERE yil = ? AND ay = ? ORDER BY no", (yil, ay))
+        ]
+
+    def revizyon_ekle(self, yil: int, ay: int, kayit_olustur: Callable[[List[dict]], Optional[dict]]) -> Optional[dict]:
+        with self._yazma() as conn:
+            kayit = kayit_olustur(self._revizyonlar(conn, yil, ay))
+            if kayit is not None:
+                conn.execute(
+                    "INSERT INTO plan_revizyon (yil, ay, no, tur, tarih, veri) VALUES (?, ?, ?, ?, ?, ?)",
+                    (yil, ay, kayit["no"], kayit["tur"], kayit["tarih"], json.dumps(kayit, ensure_ascii=False))
+                )
+            return kayit
+
+    def json_dan_ice_aktar(self, veri_dizini: Optional[Path] = None) -> dict:
+        """
+        JsonDepolama dizinindeki ayarları ve tüm planları tek işlemde aktarır.
+        Aynı aya ait kayıtlı plan varsa üzerine yazılır; okunamayan dosyalar atlanır.
+
+        Returns:
+            {"ayarlar": bool, "plan_sayisi": int, "atlanan": [dosya adı, ...]}
+        """
+        veri_dizini = Path(veri_dizini) if veri_dizini is not None else DATA_DIR
+        ayarlar_dosyasi = veri_dizini / SETTINGS_FILE.name
+        ayarlar = None
+        if ayarlar_dosyasi.exists():
+            with open(ayarlar_dosyasi, 'r', encoding='utf-8') as f:
+                ayarlar = Ayarlar.from_dict(json.load(f))
+
+        planlar, atlanan = [], []
+        plan_dizini = veri_dizini / SCHEDULES_DIR.name
+        for dosya in sorted(plan_dizini.glob("*.json")) if plan_dizini.exists() else []:
+            try:
+                with open(dosya, 'r', encoding='utf-8') as f:
+                    planlar.append(AylikPlan.from_dict(json.load(f)))
+            except Exception as e:
+                print(f"Plan aktarılamadı ({dosya.name}): {e}")
+                atlanan.append(dosya.name)
+
+        with self._yazma() as conn:
+            if ayarlar is not None:
+                self._ayarlari_yaz(conn, ayarlar)
+            for plan in planlar:
+                self._plani_yaz(conn, plan)
+        return {"ayarlar": ayarlar is not None, "plan_sayisi": len(planlar), "atlanan": atlanan}
+
+
+_arka_uc: Optional[DepolamaArkaUcu] = None
+
+
+def depolama_arka_ucu() -> DepolamaArkaUcu:
+    """Seçili arka uç; ilk çağrıda NOBET_DEPOLAMA ortam değişkeninden oluşturulur"""
+    global _arka_uc
+    if _arka_uc is None:
+        secim = os.environ.get("NOBET_DEPOLAMA", "json").strip()
+        if secim == "json":
+            _arka_uc = JsonDepolama()
+        elif secim == "sqlite":
+            _arka_uc = SqliteDepolama()
+        elif secim.startswith("sqlite:"):
+            _arka_uc = SqliteDepolama(Path(secim[len("sqlite:"):]))
+        else:
+            raise ValueError(f"Bilinmeyen NOBET_DEPOLAMA değeri: {secim} (json, sqlite, sqlite:/yol)")
+    return _arka_uc
+
+
+def depolama_arka_ucunu_ayarla(arka_uc: DepolamaArkaUcu):
+    """Modül fonksiyonlarının kullanacağı arka ucu değiştirir"""
+    global _arka_uc
+    _arka_uc = arka_uc
+
+
+def json_dan_sqlite_a_aktar(yol: Optional[Path] = None, veri_dizini: Optional[Path] = None) -> dict:
+    """
+    Mevcut JSON ayar ve planlarını SQLite veritabanına toplu aktarır.
+
+    Args:
+        yol: Veritabanı dosyası (varsayılan: seçili arka uç SQLite ise onun dosyası, değilse data/nobet.db)
+        veri_dizini: settings.json ve schedules/ dizinini içeren dizin (varsayılan: data/)
+    """
+    if yol is None and isinstance(_arka_uc, SqliteDepolama):
+        hedef = _arka_uc
+    else:
+        hedef = SqliteDepolama(yol)
+    return hedef.json_dan_ice_aktar(veri_dizini)
+
+
+# =============================================================================
+# KAYDET / YÜKLE (seçili arka uç)
+# =============================================================================
+
+# Ertelenmiş kayıt kuyruğu: tek bekleyen Ayarlar (en yenisi) + zamanlayıcı.
+# Kilit, kuyruk boşaltma ile doğrudan kaydı sıraya sokar; daha yeni ayarlar
+# eskisinin üzerine yazılmaz.
+_ayar_kilidi = threading.RLock()
+_bekleyen_ayarlar: Optional[Ayarlar] = None
+_ilk_bekleme: Optional[float] = None
+_ayar_zamanlayici: Optional[threading.Timer] = None
+
+
+def _bekleyeni_birak():
+    """Kuyruktaki ayarları ve zamanlayıcıyı bırakır (kilit tutulurken çağrılır)"""
+    global _bekleyen_ayarlar, _ilk_bekleme, _ayar_zamanlayici
+    if _ayar_zamanlayici is not None:
+        _ayar_zamanlayici.cancel()
+    ayarlar = _bekleyen_ayarlar
+    _bekleyen_ayarlar, _ilk_bekleme, _ayar_zamanlayici = None, None, None
+    return ayarlar
 
 
 def ayarlari_kaydet(ayarlar: Ayarlar) -> bool:
     """
-    Ayarları JSON dosyasına kaydeder.
+    Ayarları hemen kaydeder (kuyrukta bekleyen eski ayarlar atılır).
+    Kayıtlı içerikle aynıysa yazılmaz.
     
     Args:
         ayarlar: Kaydedilecek Ayarlar nesnesi
-        
+    
     Returns:
         Başarılı ise True
     """
     try:
-        veri_dizinini_hazirla()
-        with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(ayarlar.to_dict(), f, ensure_ascii=False, indent=2)
+        with _ayar_kilidi:
+            _bekleyeni_birak()
+            depolama_arka_ucu().ayarlari_kaydet(ayarlar)
         return True
     except Exception as e:
         print(f"Ayarlar kaydedilemedi: {e}")
         return False
 
 
-def ayarlari_yukle() -> Optional[Ayarlar]:
+def ayarlari_ertelenmis_kaydet(ayarlar: Ayarlar, gecikme: Optional[float] = None):
     """
-    Kaydedilmiş ayarları yükler.
+    Ayarları kuyruğa alır; son çağrıdan gecikme saniye sonra (varsayılan
+    AYAR_KAYIT_GECIKMESI) arka planda yazılır. Arada gelen her çağrı öncekinin
+    yerini alır, böylece ard arda arayüz düzenlemeleri tek yazma olur. Sürekli
+    düzenlemede bile ilk değişiklikten en geç AYAR_MAX_BEKLEME saniye sonra yazılır.
+    """
+    global _bekleyen_ayarlar, _ilk_bekleme, _ayar_zamanlayici
+    gecikme = AYAR_KAYIT_GECIKMESI if gecikme is None else gecikme
+    with _ayar_kilidi:
+        simdi = time.monotonic()
+        if _ayar_zamanlayici is not None:
+            _ayar_zamanlayici.cancel()
+        if _ilk_bekleme is None:
+            _ilk_bekleme = simdi
+        _bekleyen_ayarlar = ayarlar
+        kalan = max(0.0, min(gecikme, _ilk_bekleme + AYAR_MAX_BEKLEME - simdi))
+        _ayar_zamanlayici = threading.Timer(kalan, ayarlari_bekleyeni_yaz)
+        _ayar_zamanlayici.daemon = True
+        _ayar_zamanlayici.start()
+
+
+def ayarlari_bekleyeni_yaz() -> bool:
+    """
+    Kuyrukta bekleyen ayarları hemen yazar (zamanlayıcı, okuma öncesi ve
+    çıkışta çağrılır).
     
     Returns:
-        Ayarlar nesnesi veya dosya yoksa None
+        Başarılı ise veya bekleyen yoksa True
+    """
+    with _ayar_kilidi:
+        ayarlar = _bekleyeni_birak()
+        if ayarlar is None:
+            return True
+        return ayarlari_kaydet(ayarlar)
+
+
+atexit.register(ayarlari_bekleyeni_yaz)
+
+
+def ayarlari_yukle(hata_firlat: bool = False) -> Optional[Ayarlar]:
+    """
+    Kaydedilmiş ayarları yükler (önce kuyrukta bekleyen kayıt yazılır).
+    
+    Args:
+        hata_firlat: True ise okuma hatası yakalanmaz (bozuk dosya yine
+            .bozuk olarak kenara kopyalanır)
+    
+    Returns:
+        Ayarlar nesnesi veya kayıt yoksa None (hata_firlat False iken hata da None)
     """
     try:
-        if not SETTINGS_FILE.exists():
-            return None
-        with open(SETTINGS_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return Ayarlar.from_dict(data)
+        ayarlari_bekleyeni_yaz()
+        return depolama_arka_ucu().ayarlari_yukle()
     except Exception as e:
+        if hata_firlat:
+            raise
         print(f"Ayarlar yüklenemedi: {e}")
         return None
 
 
 def ayarlari_yukle_veya_varsayilan() -> Ayarlar:
-    """Ayarları yükler, yoksa varsayılan döndürür"""
-    ayarlar = ayarlari_yukle()
+    """
+    Ayarları yükler, kayıt yoksa varsayılan döndürür.
+    
+    Raises:
+        Exception: Kayıtlı ayarlar okunamazsa; varsayılanlar sessizce
+            kullanılıp bozuk kaydın üzerine yazılmasın diye yutulmaz
+    """
+    ayarlar = ayarlari_yukle(hata_firlat=True)
     if ayarlar is None:
         ayarlar = Ayarlar()
     return ayarlar
 
 
-def aylik_plani_kaydet(plan: AylikPlan) -> bool:
+def aylik_plani_kaydet(plan: AylikPlan, aciklama: Optional[str] = None) -> bool:
     """
-    Aylık planı JSON dosyasına kaydeder.
+    Aylık planı kaydeder ve değiştiyse ayın geçmişine yeni revizyon ekler.
     
     Args:
         plan: Kaydedilecek AylikPlan nesnesi
-        
+        aciklama: Revizyon notu (ör. "yeniden çözüm", "elle düzeltme")
+    
     Returns:
-        Başarılı ise True
+        Başarılı ise True (revizyon yazılamazsa plan kaydedilmiş olsa da False)
     """
     try:
-        veri_dizinini_hazirla()
-        dosya_yolu = SCHEDULES_DIR / plan.dosya_adi
-        
         # Kaydetmeden önce tarihi güncelle
         if plan.sonuc is not None and plan.olusturma_tarihi is None:
             plan.olusturma_tarihi = datetime.now().isoformat()
         
-        with open(dosya_yolu, 'w', encoding='utf-8') as f:
-            json.dump(plan.to_dict(), f, ensure_ascii=False, indent=2)
-        return True
+        depolama_arka_ucu().plani_kaydet(plan)
     except Exception as e:
         print(f"Plan kaydedilemedi: {e}")
         return False
+    try:
+        depolama_arka_ucu().revizyon_ekle(plan.yil, plan.ay, lambda revizyonlar: _revizyon_kaydi(revizyonlar, plan, aciklama))
+        return True
+    except Exception as e:
+        print(f"Plan kaydedildi ama revizyon yazılamadı: {e}")
+        return False
 
 
 def aylik_plani_yukle(yil: int, ay: int) -> Optional[AylikPlan]:
@@ -104,20 +1040,12 @@ def aylik_plani_yukle(yil: int, ay: int) -> Optional[AylikPlan]:
     Args:
         yil: Yıl
         ay: Ay
-        
+    
     Returns:
-        AylikPlan nesnesi veya dosya yoksa None
+        AylikPlan nesnesi veya kayıt yoksa None
     """
     try:
-        dosya_adi = f"{yil}_{ay:02d}.json"
-        dosya_yolu = SCHEDULES_DIR / dosya_adi
-        
-        if not dosya_yolu.exists():
-            return None
-            
-        with open(dosya_yolu, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return AylikPlan.from_dict(data)
+        return depolama_arka_ucu().plani_yukle(yil, ay)
     except Exception as e:
         print(f"Plan yüklenemedi: {e}")
         return None
@@ -131,31 +1059,34 @@ def aylik_plani_yukle_veya_yeni(yil: int, ay: int) -> AylikPlan:
     return plan
 
 
+def ipucu_plani_bul(yil: int, ay: int) -> Optional[AylikPlan]:
+    """
+    Sıcak başlangıç için kullanılacak planı bulur: önce aynı ayın son çözümü,
+    yoksa önceki ayın çözümü.
+    
+    Returns:
+        Sonucu olan AylikPlan veya bulunamazsa None
+    """
+    plan = aylik_plani_yukle(yil, ay)
+    if plan is not None and plan.sonuc:
+        return plan
+    
+    onceki_yil, onceki_ay = (yil - 1, 12) if ay == 1 else (yil, ay - 1)
+    plan = aylik_plani_yukle(onceki_yil, onceki_ay)
+    if plan is not None and plan.sonuc:
+        return plan
+    return None
+
+
 def kayitli_planlari_listele() -> List[dict]:
     """
     Kaydedilmiş tüm planların listesini döndürür.
     
     Returns:
-        [{"yil": 2025, "ay": 1, "dosya": "2025_01.json", "tarih": "..."}, ...]
+        [{"yil": 2025, "ay": 1, "dosya": "2025_01.json", "olusturma_tarihi": "...", "sonuc_var": True}, ...]
     """
     try:
-        veri_dizinini_hazirla()
-        planlar = []
-        
-        for dosya in SCHEDULES_DIR.glob("*.json"):
-            try:
-                with open(dosya, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                planlar.append({
-                    "yil": data.get("yil"),
-                    "ay": data.get("ay"),
-                    "dosya": dosya.name,
-                    "olusturma_tarihi": data.get("olusturma_tarihi"),
-                    "sonuc_var": data.get("sonuc") is not None
-                })
-            except Exception:
-                continue
-        
+        planlar = depolama_arka_ucu().planlari_listele()
         # Tarihe göre sırala (en yeni önce)
         planlar.sort(key=lambda x: (x["yil"], x["ay"]), reverse=True)
         return planlar
@@ -171,23 +1102,290 @@ def plani_sil(yil: int, ay: int) -> bool:
     Args:
         yil: Yıl
         ay: Ay
-        
+    
     Returns:
         Başarılı ise True
     """
     try:
-        dosya_adi = f"{yil}_{ay:02d}.json"
-        dosya_yolu = SCHEDULES_DIR / dosya_adi
-        
-        if dosya_yolu.exists():
-            dosya_yolu.unlink()
-            return True
-        return False
+        return depolama_arka_ucu().plani_sil(yil, ay)
     except Exception as e:
         print(f"Plan silinemedi: {e}")
         return False
 
 
+def personel_atamalari(isim: str, yil: Optional[int] = None) -> List[dict]:
+    """
+    Bir kişinin kayıtlı planlardaki atamaları (raporlar için).
+    
+    Returns:
+        [{"yil": 2025, "ay": 1, "gun": 3, "alan": "Yeşil", "vardiya": None}, ...]
+    """
+    try:
+        return depolama_arka_ucu().personel_atamalari(isim, yil)
+    except Exception as e:
+        print(f"Atamalar alınamadı: {e}")
+        return []
+
+
+# =============================================================================
+# PLAN GEÇMİŞİ (REVİZYONLAR)
+# =============================================================================
+#
+# Her kayıt ayın günlüğüne bir revizyon ekler (aynı içerik tekrar kaydedilirse
+# eklenmez). Revizyon ya "tam" (plan.to_dict) ya da bir öncekine göre "fark":
+# çıkan atamalar [gün, alan, vardiya, isim], eklenenler [..., hücredeki sırası]
+# ve değişen plan alanları.
+# REVIZYON_TAM_ARALIGI revizyonda bir, sonuç biçimi değiştiğinde, fark sonucu
+# birebir (boş hücreler, sıra) geri kuramıyorsa veya fark tam kopyadan büyükse
+# (ör. sıfırdan yeniden çözüm) tam kopya yazılır.
+
+def _plan_alanlari(plan: AylikPlan) -> dict:
+    """Sonuç dışındaki plan alanları (izinler, tercihler, ...), JSON'daki haliyle"""
+    data = json.loads(json.dumps(replace(plan, sonuc=None).to_dict(), ensure_ascii=False))
+    data.pop("sonuc")
+    return data
+
+
+def _sonuca_fark_uygula(sonuc: Dict, cikan: List[list], eklenen: List[list]) -> Dict:
+    """Fark satırlarını iç içe sonucun kopyasına uygular (gün anahtarları str)"""
+    sonuc = copy.deepcopy(sonuc)
+    
+    def hucre(gun, alan, vardiya) -> list:
+        if alan is None and vardiya is None:
+            return sonuc.setdefault(str(gun), [])
+        gun_data = sonuc.setdefault(str(gun), {})
+        if alan is not None and vardiya is not None:
+            return gun_data.setdefault(alan, {}).setdefault(vardiya, [])
+        return gun_data.setdefault(alan if alan is not None else vardiya, [])
+    
+    for gun, alan, vardiya, isim in cikan:
+        hucre(gun, alan, vardiya).remove(isim)
+    # Hücre içinde artan sırayla eklendiği için her isim yeni sonuçtaki yerine oturur
+    for gun, alan, vardiya, isim, sira in eklenen:
+        hucre(gun, alan, vardiya).insert(sira, isim)
+    return sonuc
+
+
+def _atama_farki(eski: Optional[AylikPlan], yeni: AylikPlan) -> Tuple[List[list], List[list]]:
+    """
+    (çıkan, eklenen) atama satırları. Eklenenler yeni sonuçtaki sırayla ve
+    hücre içindeki konumlarıyla: [gün, alan, vardiya, isim, sıra].
+    """
+    eski_satirlar = _sonuc_satirlari(eski.sonuc, eski.sonuc_alanlı) if eski is not None and eski.sonuc else []
+    yeni_satirlar = _sonuc_satirlari(yeni.sonuc, yeni.sonuc_alanlı) if yeni.sonuc else []
+    fazla = Counter(yeni_satirlar)
+    fazla.subtract(eski_satirlar)
+    
+    cikan = []
+    for satir in eski_satirlar:
+        if fazla[satir] < 0:
+            cikan.append(list(satir))
+            fazla[satir] += 1
+    
+    eklenen = []
+    hucre_sirasi = Counter()
+    for satir in yeni_satirlar:
+        sira = hucre_sirasi[satir[:3]]
+        hucre_sirasi[satir[:3]] += 1
+        if fazla[satir] > 0:
+            eklenen.append([*satir, sira])
+            fazla[satir] -= 1
+    return cikan, eklenen
+
+
+def _revizyondan_plan(revizyonlar: List[dict], no: int) -> Optional[AylikPlan]:
+    """no numaralı revizyonu, önceki en yakın tam kopyadan farkları uygulayarak kurar"""
+    hedef = next((i for i, r in enumerate(revizyonlar) if r["no"] == no), None)
+    if hedef is None:
+        return None
+    bas = max(i for i in range(hedef + 1) if revizyonlar[i]["tur"] == "tam")
+    plan = AylikPlan.from_dict(copy.deepcopy(revizyonlar[bas]["plan"]))
+    for r in revizyonlar[bas + 1:hedef + 1]:
+        alanlar = {**_plan_alanlari(plan), **r["degisen"]}
+        alanlar["sonuc"] = _sonuca_fark_uygula(plan.sonuc, r["cikan"], r["eklenen"])
+        plan = AylikPlan.from_dict(alanlar)
+    return plan
+
+
+def _revizyon_kaydi(revizyonlar: List[dict], plan: AylikPlan, aciklama: Optional[str]) -> Optional[dict]:
+    """Plan için eklenecek revizyon kaydı; son revizyonla aynıysa None"""
+    onceki = _revizyondan_plan(revizyonlar, revizyonlar[-1]["no"]) if revizyonlar else None
+    cikan, eklenen = _atama_farki(onceki, plan)
+    alanlar = _plan_alanlari(plan)
+    onceki_alanlar = _plan_alanlari(onceki) if onceki is not None else {}
+    degisen = {k: v for k, v in alanlar.items() if onceki_alanlar.get(k) != v}
+    yeni_sonuc = None if plan.sonuc is None else {str(k): v for k, v in plan.sonuc.items()}
+    if onceki is not None and not cikan and not eklenen and not degisen and onceki.sonuc == yeni_sonuc:
+        return None
+    
+    no = revizyonlar[-1]["no"] + 1 if revizyonlar else 1
+    son_tam = max((r["no"] for r in revizyonlar if r["tur"] == "tam"), default=0)
+    kayit = {
+        "no": no,
+        "ebeveyn": revizyonlar[-1]["no"] if revizyonlar else None,
+        "tarih": datetime.now().isoformat(),
+        "aciklama": aciklama,
+        "atama_sayisi": len(_sonuc_satirlari(plan.sonuc, plan.sonuc_alanlı)) if plan.sonuc else 0,
+        "cikan_sayisi": len(cikan),
+        "eklenen_sayisi": len(eklenen)
+    }
+    fark_olur = (
+        onceki is not None
+        and no - son_tam < REVIZYON_TAM_ARALIGI
+        and onceki.sonuc is not None and yeni_sonuc is not None
+        and onceki.sonuc_alanlı == plan.sonuc_alanlı
+        and _sonuca_fark_uygula(onceki.sonuc, cikan, eklenen) == yeni_sonuc
+    )
+    tam = {"plan": plan.to_dict()}
+    fark = {"cikan": cikan, "eklenen": eklenen, "degisen": degisen}
+    if fark_olur and len(json.dumps(fark, ensure_ascii=False)) < len(json.dumps(tam, ensure_ascii=False)):
+        kayit.update(tur="fark", **fark)
+    else:
+        kayit.update(tur="tam", **tam)
+    return kayit
+
+
+def plan_revizyonlari(yil: int, ay: int) -> List[dict]:
+    """
+    Ayın revizyon listesi (eskiden yeniye).
+    
+    Returns:
+        [{"no": 3, "ebeveyn": 2, "tarih": "...", "aciklama": "...", "tur": "fark",
+          "atama_sayisi": 62, "cikan_sayisi": 4, "eklenen_sayisi": 4}, ...]
+    """
+    try:
+        alanlar = ("no", "ebeveyn", "tarih", "aciklama", "tur", "atama_sayisi", "cikan_sayisi", "eklenen_sayisi")
+        return [{k: r.get(k) for k in alanlar} for r in depolama_arka_ucu().revizyonlari_oku(yil, ay)]
+    except Exception as e:
+        print(f"Revizyonlar alınamadı: {e}")
+        return []
+
+
+def plan_revizyonu(yil: int, ay: int, no: int) -> Optional[AylikPlan]:
+    """Belirli bir revizyondaki planı geri kurar (yoksa None)"""
+    try:
+        return _revizyondan_plan(depolama_arka_ucu().revizyonlari_oku(yil, ay), no)
+    except Exception as e:
+        print(f"Revizyon okunamadı: {e}")
+        return None
+
+
+def revizyon_farki(yil: int, ay: int, eski_no: int, yeni_no: int) -> Optional[dict]:
+    """
+    İki revizyon arasındaki fark.
+    
+    Returns:
+        {"cikan": [[gün, alan, vardiya, isim], ...], "eklenen": [...],
+         "degisen": {alan: [eski, yeni]}} veya revizyonlardan biri yoksa None
+    """
+    try:
+        revizyonlar = depolama_arka_ucu().revizyonlari_oku(yil, ay)
+        eski, yeni = _revizyondan_plan(revizyonlar, eski_no), _revizyondan_plan(revizyonlar, yeni_no)
+        if eski is None or yeni is None:
+            return None
+        cikan, eklenen = _atama_farki(eski, yeni)
+        eski_alanlar, yeni_alanlar = _plan_alanlari(eski), _plan_alanlari(yeni)
+        return {
+            "cikan": cikan,
+            "eklenen": [e[:4] for e in eklenen],
+            "degisen": {k: [eski_alanlar.get(k), v] for k, v in yeni_alanlar.items() if eski_alanlar.get(k) != v}
+        }
+    except Exception as e:
+        print(f"Revizyon farkı hesaplanamadı: {e}")
+        return None
+
+
+def revizyonu_geri_yukle(yil: int, ay: int, no: int) -> bool:
+    """
+    Revizyondaki planı güncel plan yapar. Geçmiş silinmez: geri yükleme yeni
+    bir revizyon olarak eklenir.
+    
+    Returns:
+        Başarılı ise True
+    """
+    plan = plan_revizyonu(yil, ay, no)
+    if plan is None:
+        print(f"Revizyon bulunamadı: {yil}-{ay:02d} #{no}")
+        return False
+    return aylik_plani_kaydet(plan, aciklama=f"{no} numaralı revizyondan geri yükleme")
+
+
+def onbellekten_oku(anahtar: str) -> Optional[dict]:
+    """
+    Parmak izine göre önbellekteki çözümü döndürür ve girdiyi "son kullanılan" yapar.
+    
+    Args:
+        anahtar: solver.girdi_parmak_izi çıktısı
+        
+    Returns:
+        {"sonuc": {gün(int): ...}, "amac_degeri": ..., "durum": ..., "sure_saniye": ..., "tarih": ...}
+        veya önbellekte yoksa None
+    """
+    try:
+        dosya_yolu = CACHE_DIR / f"{anahtar}.json"
+        if not dosya_yolu.exists():
+            return None
+        with open(dosya_yolu, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        # LRU: erişim zamanı olarak mtime kullanılır
+        os.utime(dosya_yolu)
+        data["sonuc"] = {int(k): v for k, v in data["sonuc"].items()}
+        return data
+    except Exception as e:
+        print(f"Önbellek okunamadı: {e}")
+        return None
+
+
+def onbellege_yaz(anahtar: str, sonuc: Dict, amac_degeri: float, durum: str, sure_saniye: float) -> bool:
+    """
+    Çözümü meta verisiyle önbelleğe yazar, boyut sınırı aşılırsa LRU tahliyesi yapar.
+    
+    Returns:
+        Başarılı ise True
+    """
+    try:
+        veri_dizinini_hazirla()
+        data = {
+            "anahtar": anahtar,
+            "sonuc": {str(k): v for k, v in sonuc.items()},
+            "amac_degeri": amac_degeri,
+            "durum": durum,
+            "sure_saniye": round(sure_saniye, 3),
+            "tarih": datetime.now().isoformat()
+        }
+        _atomik_yaz(CACHE_DIR / f"{anahtar}.json", json.dumps(data, ensure_ascii=False))
+        onbellegi_sinirla()
+        return True
+    except Exception as e:
+        print(f"Önbelleğe yazılamadı: {e}")
+        return False
+
+
+def onbellegi_sinirla(max_bayt: int = None) -> int:
+    """
+    Toplam boyut max_bayt altına inene kadar en eski erişilen girdileri siler.
+    
+    Returns:
+        Silinen girdi sayısı
+    """
+    max_bayt = ONBELLEK_MAX_BAYT if max_bayt is None else max_bayt
+    girdiler = [(d.stat().st_mtime, d.stat().st_size, d) for d in CACHE_DIR.glob("*.json")]
+    toplam = sum(boyut for _, boyut, _ in girdiler)
+    silinen = 0
+    for _, boyut, dosya in sorted(girdiler):
+        if toplam <= max_bayt:
+            break
+        dosya.unlink()
+        toplam -= boyut
+        silinen += 1
+    return silinen
+
+
+def onbellegi_temizle() -> int:
+    """Tüm çözüm önbelleğini siler, silinen girdi sayısını döndürür"""
+    return onbellegi_sinirla(max_bayt=0) if CACHE_DIR.exists() else 0
+
+
 def ayarlari_json_olarak_export(ayarlar: Ayarlar) -> str:
     """Ayarları JSON string olarak döndürür (indirme için)"""
     return json.dumps(ayarlar.to_dict(), ensure_ascii=False, indent=2)
@@ -205,7 +1403,7 @@ def ayarlari_json_dan_import(json_str: str) -> Optional[Ayarlar]:
 
 def plani_json_olarak_export(plan: AylikPlan) -> str:
     """Planı JSON string olarak döndürür"""
-    return json.dumps(plan.to_dict(), ensure_ascii=False, indent=2)
+    return json.dumps(plan.to_dict(), ensure_ascii=False, separators=(",", ":"))
 
 
 def plani_json_dan_import(json_str: str) -> Optional[AylikPlan]:
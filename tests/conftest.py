@@ -0,0 +1,35 @@
+"""
+Ortak test düzeneği: modüller depo kökünden içe aktarılır, depolama geçici
+bir veri dizinine yönlendirilir.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import storage  # noqa: E402
+
+
+@pytest.fixture
+def veri_dizini(tmp_path, monkeypatch):
+    """storage'ın tüm dosya yollarını tmp_path altına taşır (JSON arka ucu seçili)"""
+    monkeypatch.setattr(storage, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(storage, "SETTINGS_FILE", tmp_path / "settings.json")
+    monkeypatch.setattr(storage, "SCHEDULES_DIR", tmp_path / "schedules")
+    monkeypatch.setattr(storage, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(storage, "PLAN_INDEX_FILE", tmp_path / "plan_index.json")
+    monkeypatch.setattr(storage, "HISTORY_DIR", tmp_path / "history")
+    monkeypatch.setattr(storage, "SQLITE_FILE", tmp_path / "nobet.db")
+    monkeypatch.setattr(storage, "_arka_uc", storage.JsonDepolama())
+    return tmp_path
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def arka_uc(request, veri_dizini, monkeypatch):
+    """Her iki depolama arka ucuyla çalıştırır"""
+    if request.param == "sqlite":
+        monkeypatch.setattr(storage, "_arka_uc", storage.SqliteDepolama(veri_dizini / "nobet.db"))
+    return storage.depolama_arka_ucu()
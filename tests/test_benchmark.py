@@ -0,0 +1,87 @@
+"""benchmark.karsilastir toleransları ve sonuç dosyası gidiş-dönüşü"""
+
+from dataclasses import replace
+
+import pytest
+
+from benchmark import BenchmarkSonucu, karsilastir, sonuclari_oku, sonuclari_yaz
+
+
+def _sonuc(**alanlar) -> BenchmarkSonucu:
+    varsayilan = dict(
+        anahtar="normal-p20-2026-03-s1", senaryo="normal", personel=20, yil=2026, ay=3, tohum=1,
+        durum="OPTIMAL", amac_degeri=1000.0, insa_suresi_saniye=1.0, cozum_suresi_saniye=4.0,
+        tepe_bellek_mb=100.0
+    )
+    varsayilan.update(alanlar)
+    return BenchmarkSonucu(**varsayilan)
+
+
+def _olcutler(temel, yeni, **tolerans) -> list:
+    return [g.olcut for g in karsilastir([temel], [yeni], **tolerans)]
+
+
+def test_ayni_sonuc_gerileme_vermez():
+    assert karsilastir([_sonuc()], [_sonuc()]) == []
+
+
+def test_farkli_anahtar_karsilastirilmaz():
+    assert karsilastir([_sonuc()], [_sonuc(anahtar="baska", durum="COZUMSUZ", amac_degeri=None)]) == []
+
+
+@pytest.mark.parametrize("yeni_amac, tolerans, beklenen", [
+    (1000.0, 0.0, []),
+    (1001.0, 0.0, ["amac_degeri"]),
+    (1040.0, 0.05, []),
+    (1060.0, 0.05, ["amac_degeri"]),
+    (900.0, 0.0, []),
+])
+def test_amac_toleransi(yeni_amac, tolerans, beklenen):
+    assert _olcutler(_sonuc(), _sonuc(amac_degeri=yeni_amac), amac_toleransi=tolerans) == beklenen
+
+
+@pytest.mark.parametrize("yeni_sure, beklenen", [
+    (4.9, []),                          # %25 altında
+    (5.5, ["cozum_suresi_saniye"]),     # göreli ve mutlak eşik aşıldı
+])
+def test_cozum_suresi_toleransi(yeni_sure, beklenen):
+    assert _olcutler(_sonuc(), _sonuc(cozum_suresi_saniye=yeni_sure)) == beklenen
+
+
+def test_kisa_orneklerde_mutlak_esik_gurultuyu_yutar():
+    temel = _sonuc(cozum_suresi_saniye=0.1, insa_suresi_saniye=0.1)
+    yeni = _sonuc(cozum_suresi_saniye=0.5, insa_suresi_saniye=0.5)  # x5 ama +0.4 sn
+
+    assert _olcutler(temel, yeni) == []
+    assert _olcutler(temel, yeni, min_sure_farki_saniye=0.1) == ["cozum_suresi_saniye", "insa_suresi_saniye"]
+
+
+def test_cozum_suresi_yalnizca_iki_taraf_optimalken_karsilastirilir():
+    temel = _sonuc(durum="FEASIBLE", cozum_suresi_saniye=4.0)
+    yeni = _sonuc(durum="FEASIBLE", cozum_suresi_saniye=60.0)
+
+    assert _olcutler(temel, yeni) == []
+
+
+@pytest.mark.parametrize("yeni_bellek, tolerans, beklenen", [
+    (119.0, 0.20, []),
+    (121.0, 0.20, ["tepe_bellek_mb"]),
+    (121.0, 0.25, []),
+])
+def test_bellek_toleransi(yeni_bellek, tolerans, beklenen):
+    assert _olcutler(_sonuc(), _sonuc(tepe_bellek_mb=yeni_bellek), bellek_toleransi=tolerans) == beklenen
+
+
+def test_durum_gerilemeleri():
+    assert _olcutler(_sonuc(), _sonuc(durum="COZUMSUZ", amac_degeri=None)) == ["durum"]
+    assert _olcutler(_sonuc(), _sonuc(durum="FEASIBLE")) == ["durum"]
+
+
+@pytest.mark.parametrize("uzanti", ["json", "csv"])
+def test_sonuc_dosyasi_gidis_donus(tmp_path, uzanti):
+    sonuclar = [_sonuc(), replace(_sonuc(), anahtar="x", durum="COZUMSUZ", amac_degeri=None, hata="zaman")]
+    yol = str(tmp_path / f"sonuc.{uzanti}")
+
+    sonuclari_yaz(sonuclar, yol)
+
+    assert sonuclari_oku(yol) == sonuclar
@@ -0,0 +1,104 @@
+"""plan_index.json: plan listesinin önbelleği ve geçersiz kılınması"""
+
+import json
+import os
+
+import storage
+from models import AylikPlan
+
+
+def _kaydet(yil: int, ay: int, sonuc=None) -> None:
+    assert storage.aylik_plani_kaydet(AylikPlan(yil=yil, ay=ay, sonuc=sonuc))
+
+
+def _indeks() -> dict:
+    with open(storage.PLAN_INDEX_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _indeksi_yaz(data: dict) -> None:
+    with open(storage.PLAN_INDEX_FILE, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def test_kayit_indeksi_gunceller(veri_dizini):
+    _kaydet(2026, 1, {"1": ["Dr A"]})
+    _kaydet(2026, 2)
+
+    indeks = _indeks()
+
+    assert indeks["surum"] == storage.PLAN_INDEX_SURUMU
+    assert set(indeks["planlar"]) == {"2026_01.json", "2026_02.json"}
+    ozet = indeks["planlar"]["2026_01.json"]
+    stat = (storage.SCHEDULES_DIR / "2026_01.json").stat()
+    assert (ozet["mtime_ns"], ozet["boyut"], ozet["sonuc_var"]) == (stat.st_mtime_ns, stat.st_size, True)
+    assert [(p["yil"], p["ay"], p["sonuc_var"]) for p in storage.kayitli_planlari_listele()] == [
+        (2026, 2, False), (2026, 1, True)
+    ]
+
+
+def test_degismeyen_dosya_indeksten_okunur(veri_dizini):
+    _kaydet(2026, 1)
+    indeks = _indeks()
+    indeks["planlar"]["2026_01.json"]["olusturma_tarihi"] = "indeksten"
+    _indeksi_yaz(indeks)
+
+    assert storage.kayitli_planlari_listele()[0]["olusturma_tarihi"] == "indeksten"
+
+
+def test_disaridan_degisen_dosya_yeniden_okunur(veri_dizini):
+    _kaydet(2026, 1)
+    yol = storage.SCHEDULES_DIR / "2026_01.json"
+    data = json.loads(yol.read_text(encoding="utf-8"))
+    data["sonuc"] = {"1": ["Dr A", "Dr B"]}
+    yol.write_text(json.dumps(data), encoding="utf-8")  # boyut değişir
+
+    assert storage.kayitli_planlari_listele()[0]["sonuc_var"] is True
+    assert _indeks()["planlar"]["2026_01.json"]["boyut"] == yol.stat().st_size
+
+
+def test_yalnizca_mtime_degisince_de_gecersiz_olur(veri_dizini):
+    _kaydet(2026, 1)
+    yol = storage.SCHEDULES_DIR / "2026_01.json"
+    indeks = _indeks()
+    indeks["planlar"]["2026_01.json"]["olusturma_tarihi"] = "eski"
+    _indeksi_yaz(indeks)
+    stat = yol.stat()
+    os.utime(yol, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert storage.kayitli_planlari_listele()[0]["olusturma_tarihi"] != "eski"
+    assert _indeks()["planlar"]["2026_01.json"]["mtime_ns"] == yol.stat().st_mtime_ns
+
+
+def test_silinen_dosya_indeksten_duser(veri_dizini):
+    _kaydet(2026, 1)
+    _kaydet(2026, 2)
+
+    (storage.SCHEDULES_DIR / "2026_02.json").unlink()  # dışarıdan silindi
+    assert [p["ay"] for p in storage.kayitli_planlari_listele()] == [1]
+    assert set(_indeks()["planlar"]) == {"2026_01.json"}
+
+    assert storage.plani_sil(2026, 1)
+    assert _indeks()["planlar"] == {}
+
+
+def test_bozuk_plan_gecersiz_olarak_onbelleklenir(veri_dizini):
+    _kaydet(2026, 1)
+    storage.veri_dizinini_hazirla()
+    (storage.SCHEDULES_DIR / "2026_03.json").write_text("{bozuk", encoding="utf-8")
+
+    assert [p["ay"] for p in storage.kayitli_planlari_listele()] == [1]
+    assert _indeks()["planlar"]["2026_03.json"]["gecersiz"] is True
+    assert [p["ay"] for p in storage.kayitli_planlari_listele()] == [1]
+
+
+def test_eski_surumlu_veya_bozuk_indeks_yeniden_kurulur(veri_dizini):
+    _kaydet(2026, 1)
+    _indeksi_yaz({"surum": storage.PLAN_INDEX_SURUMU + 1, "planlar": {"2026_01.json": {"yil": 1999}}})
+
+    assert [(p["yil"], p["ay"]) for p in storage.kayitli_planlari_listele()] == [(2026, 1)]
+    assert _indeks()["surum"] == storage.PLAN_INDEX_SURUMU
+
+    storage.PLAN_INDEX_FILE.write_text("bozuk", encoding="utf-8")
+    assert [(p["yil"], p["ay"]) for p in storage.kayitli_planlari_listele()] == [(2026, 1)]
+    assert "2026_01.json" in _indeks()["planlar"]
@@ -0,0 +1,102 @@
+"""Plan revizyon geçmişi: fark + tam kopya zinciri ve geri yükleme"""
+
+import copy
+import json
+
+import storage
+from models import AylikPlan
+
+
+ALANLAR = ("Yeşil", "Kırmızı")
+VARDIYALAR = ("Gündüz", "Gece")
+ISIMLER = [f"Dr {i}" for i in range(12)]
+
+
+def _baslangic_sonucu() -> dict:
+    """Boş hücreli, iki seviyeli 30 günlük sonuç"""
+    sonuc = {}
+    for g in range(1, 31):
+        sonuc[str(g)] = {
+            alan: {v: [ISIMLER[(g + i * 2 + j) % len(ISIMLER)]] for j, v in enumerate(VARDIYALAR)}
+            for i, alan in enumerate(ALANLAR)
+        }
+    sonuc["7"]["Kırmızı"]["Gece"] = []
+    return sonuc
+
+
+def _surumleri_kaydet(adet: int) -> list:
+    """Her revizyonda bir hücreyi değiştirerek adet kadar sürüm kaydeder; kaydedilen sonuçları döndürür"""
+    sonuc = _baslangic_sonucu()
+    surumler = []
+    for i in range(adet):
+        if i:
+            gun = str(i % 30 + 1)
+            sonuc[gun]["Yeşil"]["Gündüz"] = [ISIMLER[(i * 5) % len(ISIMLER)], ISIMLER[(i * 5 + 1) % len(ISIMLER)]]
+        plan = AylikPlan(yil=2026, ay=3, izinler={"Dr 1": [i + 1]}, sonuc=copy.deepcopy(sonuc), sonuc_alanlı=True)
+        assert storage.aylik_plani_kaydet(plan, aciklama=f"sürüm {i + 1}")
+        surumler.append((copy.deepcopy(sonuc), {"Dr 1": [i + 1]}))
+    return surumler
+
+
+def _ayni(a: dict, b: dict) -> bool:
+    """Sözlük sırası dahil karşılaştırma"""
+    return json.dumps(a, ensure_ascii=False) == json.dumps(b, ensure_ascii=False)
+
+
+def test_tam_kopya_araligi_ve_her_revizyon_geri_kurulur(arka_uc):
+    adet = storage.REVIZYON_TAM_ARALIGI + 3
+    surumler = _surumleri_kaydet(adet)
+
+    revizyonlar = storage.plan_revizyonlari(2026, 3)
+    assert [r["no"] for r in revizyonlar] == list(range(1, adet + 1))
+    tamlar = [r["no"] for r in revizyonlar if r["tur"] == "tam"]
+    assert tamlar == [1, storage.REVIZYON_TAM_ARALIGI + 1]
+    assert all(r["tur"] == "fark" for r in revizyonlar if r["no"] not in tamlar)
+
+    for no, (sonuc, izinler) in enumerate(surumler, start=1):
+        plan = storage.plan_revizyonu(2026, 3, no)
+        assert _ayni(plan.sonuc, sonuc), no
+        assert plan.izinler == izinler
+
+
+def test_tam_kopya_sinirinin_otesinden_geri_yukleme(arka_uc):
+    adet = storage.REVIZYON_TAM_ARALIGI + 3
+    surumler = _surumleri_kaydet(adet)
+    # Sınırın öncesindeki bir fark revizyonu, sonraki tam kopyanın üzerine geri yüklenir
+    hedef = storage.REVIZYON_TAM_ARALIGI - 1
+
+    assert storage.revizyonu_geri_yukle(2026, 3, hedef)
+
+    guncel = storage.aylik_plani_yukle(2026, 3)
+    assert _ayni(guncel.sonuc, surumler[hedef - 1][0])
+    assert guncel.izinler == surumler[hedef - 1][1]
+    revizyonlar = storage.plan_revizyonlari(2026, 3)
+    assert len(revizyonlar) == adet + 1
+    assert revizyonlar[-1]["ebeveyn"] == adet
+    assert _ayni(storage.plan_revizyonu(2026, 3, adet + 1).sonuc, surumler[hedef - 1][0])
+
+
+def test_revizyon_farki_sinir_boyunca(arka_uc):
+    adet = storage.REVIZYON_TAM_ARALIGI + 3
+    surumler = _surumleri_kaydet(adet)
+    eski_no, yeni_no = 2, adet
+
+    fark = storage.revizyon_farki(2026, 3, eski_no, yeni_no)
+
+    def satirlar(sonuc):
+        return {tuple(s) for s in storage._sonuc_satirlari(sonuc, True)}
+
+    eski, yeni = satirlar(surumler[eski_no - 1][0]), satirlar(surumler[yeni_no - 1][0])
+    assert {tuple(s) for s in fark["cikan"]} == eski - yeni
+    assert {tuple(s[:4]) for s in fark["eklenen"]} == yeni - eski
+    assert fark["degisen"]["izinler"] == [{"Dr 1": [eski_no]}, {"Dr 1": [yeni_no]}]
+    assert storage.revizyon_farki(2026, 3, 1, adet + 5) is None
+
+
+def test_degismeyen_plan_revizyon_eklemez(arka_uc):
+    _surumleri_kaydet(2)
+    plan = storage.aylik_plani_yukle(2026, 3)
+
+    assert storage.aylik_plani_kaydet(plan)
+
+    assert len(storage.plan_revizyonlari(2026, 3)) == 2
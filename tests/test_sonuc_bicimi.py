@@ -0,0 +1,91 @@
+"""Sütunlu sonuç biçimi: iç içe sonuç ↔ sütunlar gidiş-dönüşü"""
+
+import json
+
+import pytest
+
+from models import (
+    AylikPlan, SONUC_BICIM_SURUMU, sonuc_seviyesi, sonuc_sutunlu_mu,
+    sonucu_sutunlara_cevir, sutunlardan_sonuc
+)
+
+
+def _metin(sonuc: dict) -> str:
+    """Sözlük sırası dahil karşılaştırma için"""
+    return json.dumps(sonuc, ensure_ascii=False)
+
+
+SEVIYE_0 = {"1": ["Dr A", "Dr B"], "2": [], "3": ["Dr B"]}
+SEVIYE_1_ALAN = {"1": {"Yeşil": ["Dr A"], "Kırmızı": ["Dr B", "Dr C"]}, "2": {}, "3": {"Kırmızı": [], "Yeşil": ["Dr C"]}}
+SEVIYE_1_VARDIYA = {"1": {"Gündüz": ["Dr A"], "Gece": []}, "2": {"Gece": ["Dr B"], "Gündüz": ["Dr A"]}}
+SEVIYE_2 = {
+    "1": {"Yeşil": {"Gündüz": ["Dr A"], "Gece": ["Dr B"]}, "Kırmızı": {"Gündüz": ["Dr C"], "Gece": []}},
+    "2": {"Yeşil": {"Gündüz": ["Dr B"], "Gece": ["Dr A"]}, "Kırmızı": {"Gündüz": ["Dr C"], "Gece": ["Dr D"]}},
+    "3": {},
+    "4": {"Kırmızı": {}, "Yeşil": {"Gece": ["Dr A", "Dr C"], "Gündüz": []}},
+}
+
+
+@pytest.mark.parametrize("sonuc, alanli, seviye", [
+    (SEVIYE_0, False, 0),
+    (SEVIYE_1_ALAN, True, 1),
+    (SEVIYE_1_VARDIYA, False, 1),
+    (SEVIYE_2, True, 2),
+])
+def test_gidis_donus(sonuc, alanli, seviye):
+    veri = sonucu_sutunlara_cevir(sonuc, alanli)
+
+    assert sonuc_sutunlu_mu(veri)
+    assert veri["surum"] == SONUC_BICIM_SURUMU
+    assert veri["seviye"] == seviye == sonuc_seviyesi(sonuc)
+    assert _metin(sutunlardan_sonuc(veri)) == _metin(sonuc)
+    # JSON'a yazılıp okunduktan sonra da aynı sonuç
+    assert _metin(sutunlardan_sonuc(json.loads(json.dumps(veri)))) == _metin(sonuc)
+
+
+def test_int_gun_anahtarlari_str_olarak_doner():
+    sonuc = {1: ["Dr A"], 2: ["Dr B"]}
+
+    geri = sutunlardan_sonuc(sonucu_sutunlara_cevir(sonuc))
+
+    assert geri == {"1": ["Dr A"], "2": ["Dr B"]}
+
+
+def test_ortak_sablonda_gun_hucreleri_yazilmaz():
+    sonuc = {str(g): {"Yeşil": {"Gündüz": ["Dr A"], "Gece": ["Dr B"]}} for g in range(1, 31)}
+
+    veri = sonucu_sutunlara_cevir(sonuc, True)
+
+    assert veri["gun_hucreleri"] is None
+    assert veri["isimler"] == ["Dr A", "Dr B"]
+    assert len(veri["sayi"]) == 60
+
+
+def test_bos_sonuc():
+    veri = sonucu_sutunlara_cevir({})
+
+    assert sutunlardan_sonuc(veri) == {}
+
+
+def test_karisik_bicim_reddedilir():
+    with pytest.raises(ValueError):
+        sonucu_sutunlara_cevir({"1": ["Dr A"], "2": {"Yeşil": ["Dr B"]}})
+
+
+def test_bilinmeyen_surum_reddedilir():
+    veri = sonucu_sutunlara_cevir(SEVIYE_0)
+    veri["surum"] = SONUC_BICIM_SURUMU + 1
+
+    with pytest.raises(ValueError):
+        sutunlardan_sonuc(veri)
+
+
+def test_aylik_plan_sutunlu_yazar_iki_bicimi_okur():
+    plan = AylikPlan(yil=2026, ay=2, sonuc=SEVIYE_2, sonuc_alanlı=True)
+
+    data = plan.to_dict()
+
+    assert sonuc_sutunlu_mu(data["sonuc"])
+    assert _metin(AylikPlan.from_dict(data).sonuc) == _metin(SEVIYE_2)
+    eski = dict(data, sonuc=SEVIYE_2)  # eski iç içe biçimli kayıt
+    assert _metin(AylikPlan.from_dict(eski).sonuc) == _metin(SEVIYE_2)
@@ -0,0 +1,59 @@
+"""Çözücü süre bütçesi: sabit süre ve uyarlanır mod"""
+
+from dataclasses import replace
+
+import pytest
+
+from girdi import ARAC_SURE_POLITIKASI, config_olustur, senaryodan_solver_input
+from models import Ayarlar
+from scenarios import generate_quick_scenario
+from solver import NobetSolver, SolverConfig
+
+
+def _kurulu_solver(**config_alanlari) -> NobetSolver:
+    """Kolay senaryonun modeli kurulmuş çözücüsü (çözmeden)"""
+    solver_input = senaryodan_solver_input(generate_quick_scenario("easy", seed=3))
+    solver_input.config = replace(solver_input.config, **config_alanlari)
+    solver = NobetSolver(solver_input)
+    solver._modeli_kur()
+    return solver
+
+
+def test_varsayilan_config_uyarlanir_degil():
+    config = SolverConfig()
+
+    assert not config.uyarlanir_sure
+    assert config.durgunluk_saniye == 0
+
+
+@pytest.mark.parametrize("max_sure", [2.0, 600.0])
+def test_sabit_sure_max_sure_saniye_kullanir(max_sure):
+    solver = _kurulu_solver(max_sure_saniye=max_sure)
+
+    assert solver._sure_butcesi() == max_sure
+    assert solver._cp_solver_olustur().parameters.max_time_in_seconds == max_sure
+
+
+def test_uyarlanir_butce_sinirlar_icinde():
+    solver = _kurulu_solver(uyarlanir_sure=True, min_sure_saniye=3.0, uyarlanir_ust_sure_saniye=40.0)
+
+    butce = solver._sure_butcesi()
+
+    assert 3.0 <= butce <= 40.0
+
+
+def test_uyarlanir_butce_ust_sinira_kirpilir():
+    solver = _kurulu_solver(uyarlanir_sure=True, min_sure_saniye=1.0, sure_katsayisi=1e6,
+                            uyarlanir_ust_sure_saniye=12.0)
+
+    assert solver._sure_butcesi() == 12.0
+
+
+def test_arac_politikasi_yalnizca_istenince_uygulanir():
+    varsayilan = config_olustur(Ayarlar())
+    arac = config_olustur(Ayarlar(), arac_politikasi=True)
+
+    assert not varsayilan.uyarlanir_sure
+    assert arac.uyarlanir_sure == ARAC_SURE_POLITIKASI["uyarlanir_sure"]
+    assert arac.durgunluk_saniye == ARAC_SURE_POLITIKASI["durgunluk_saniye"]
+    assert arac.max_sure_saniye == varsayilan.max_sure_saniye
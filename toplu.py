@@ -0,0 +1,278 @@
+"""
+Nöbet Planlayıcı - Toplu (Çok Aylı) Çözüm
+
+Bir yılın birden fazla ayını process havuzunda paralel çözer ve sonuçları
+storage.aylik_plani_kaydet ile yazar.
+
+Paralel turda her ay yalnızca çözüm başlamadan önce bilinen veriyi (toplu
+çözüme girmeyen kayıtlı planlar) sabit veri olarak alır. Ardından aylar sırayla
+NobetSolver.onar ile kısa, süre sınırlı bir onarımdan geçer: her ay önceki ayın
+kesinleşmiş sonucunu (ay sınırı) ve o ana kadar çözülen ayların hafta sonu/tatil
+adalet devrini alır; yalnızca cuma/cumartesi/pazar/tatil günleri (ve 1. gün)
+serbest bırakılır. Onarılamayan ay başarısız sayılır.
+
+Kullanım:
+    python toplu.py 2026
+    python toplu.py 2026 --aylar 1-6 --isci 6 --sure 60
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional
+
+from models import Ayarlar, AylikPlan
+from solver import NobetSolver, SolverInput, sonuc_atamalari
+from storage import ayarlari_yukle_veya_varsayilan, aylik_plani_yukle, aylik_plani_yukle_veya_yeni, aylik_plani_kaydet
+from girdi import ADALET_ETIKETLERI, ARAC_SURE_POLITIKASI, solver_input_olustur, adalet_devri_hesapla, plan_tatilleri
+from utils import ay_gun_sayisi, gun_parse, gunleri_weekday_ile_filtrele
+
+# Adalet devri onarımında değişen atama başına ceza: hafta sonu/tatil farkındaki
+# bir birimlik iyileşme (w_tatil=200) iki değişiklikten (çıkar + ekle) ağır basmalı
+DEVIR_ONARIM_DEGISIKLIK_CEZASI = 50
+
+
+@dataclass
+class AySonucu:
+    """Toplu çözümde bir ayın sonucu"""
+    yil: int
+    ay: int
+    sonuc: Optional[Dict] = None
+    durum: str = ""
+    amac_degeri: Optional[float] = None
+    sure_saniye: float = 0.0
+    durma_nedeni: str = ""
+    sinir_onarimi: bool = False  # Paralel sonuçtaki ay sınırı çakışması onarıldı mı
+    hata: Optional[str] = None
+
+    @property
+    def basarili(self) -> bool:
+        return self.sonuc is not None
+
+
+def _ay_coz(solver_input: SolverInput) -> AySonucu:
+    """Process havuzunda tek bir ayı çözer (modül seviyesinde olmalı: pickle)"""
+    baslangic = time.perf_counter()
+    try:
+        solver = NobetSolver(solver_input)
+        sonuc = solver.coz()
+        return AySonucu(
+            yil=solver_input.yil,
+            ay=solver_input.ay,
+            sonuc=sonuc,
+            durum=solver.son_cozum.durum,
+            amac_degeri=solver.son_cozum.amac_degeri,
+            sure_saniye=time.perf_counter() - baslangic,
+            durma_nedeni=solver.rapor.cozum.durma_nedeni
+        )
+    except Exception as e:
+        return AySonucu(
+            yil=solver_input.yil,
+            ay=solver_input.ay,
+            durum="HATA",
+            sure_saniye=time.perf_counter() - baslangic,
+            hata=str(e)
+        )
+
+
+def _onceki_ay(yil: int, ay: int):
+    return (yil - 1, 12) if ay == 1 else (yil, ay - 1)
+
+
+def _sinir_cakisiyor(onceki_sonuc: Dict, onceki_gun_sayisi: int, sonuc: Dict) -> bool:
+    """Önceki ayın son günü ile bu ayın 1. günü aynı kişi nöbetçi mi"""
+    son_gun = {isim for gun, _, _, isim in sonuc_atamalari(onceki_sonuc) if gun == onceki_gun_sayisi}
+    ilk_gun = {isim for gun, _, _, isim in sonuc_atamalari(sonuc) if gun == 1}
+    return bool(son_gun & ilk_gun)
+
+
+def _devirle_onar(solver_input: SolverInput, ay_sonucu: AySonucu, plan: AylikPlan, thread_sayisi: int) -> Dict:
+    """
+    Paralel sonucu adalet devri ve ay sınırıyla onarır. Yalnızca adalet günleri ve
+    1. gün serbest bırakılır; her deneme onarim_sure_saniye ile sınırlıdır.
+    
+    Raises:
+        ValueError: Hiçbir denemede çözüm bulunamazsa
+    """
+    config = solver_input.config
+    solver_input.config = replace(
+        config,
+        thread_sayisi=thread_sayisi,
+        onarim_komsuluk_gun=0,
+        w_onarim_degisiklik=DEVIR_ONARIM_DEGISIKLIK_CEZASI,
+        # Tüm ayı serbest bırakan son deneme de kısa tutulur
+        max_sure_saniye=min(config.onarim_sure_saniye, config.max_sure_saniye),
+        uyarlanir_sure=False,
+        durgunluk_saniye=0.0
+    )
+    adalet_gunleri = {1} | plan_tatilleri(plan)
+    for wd in ADALET_ETIKETLERI.values():
+        adalet_gunleri.update(gunleri_weekday_ile_filtrele(plan.yil, plan.ay, wd))
+    solver = NobetSolver(solver_input)
+    sonuc = solver.onar(ay_sonucu.sonuc, degisen_gunler=adalet_gunleri)
+    ay_sonucu.durum = solver.son_cozum.durum
+    ay_sonucu.amac_degeri = solver.son_cozum.amac_degeri
+    ay_sonucu.durma_nedeni = solver.rapor.cozum.durma_nedeni
+    return sonuc
+
+
+def yili_coz(
+    yil: int,
+    aylar: Optional[List[int]] = None,
+    ayarlar: Optional[Ayarlar] = None,
+    isci_sayisi: Optional[int] = None,
+    max_sure_saniye: Optional[float] = None,
+    kaydet: bool = True,
+    uyarlanir_sure: Optional[bool] = None,
+    bosluk_esigi: float = 0.0,
+    durgunluk_saniye: Optional[float] = None
+) -> List[AySonucu]:
+    """
+    Bir yılın aylarını paralel çözer, ardından adalet devri ve ay sınırı için
+    sırayla onarır (deneme başına SolverConfig.onarim_sure_saniye, tüm çekirdekler).
+
+    Args:
+        yil: Yıl
+        aylar: Çözülecek aylar (varsayılan: 1-12)
+        ayarlar: Verilmezse kayıtlı ayarlar yüklenir
+        isci_sayisi: Process sayısı (varsayılan: min(ay sayısı, CPU sayısı))
+        max_sure_saniye: Ay başına süre sınırı (varsayılan: SolverConfig); uyarlanır
+            modda tahmin edilen bütçenin üst sınırıdır
+        kaydet: True ise başarılı aylar aylik_plani_kaydet ile yazılır
+        uyarlanir_sure: Ay başına süreyi model boyutundan tahmin et (varsayılan: SolverConfig)
+        bosluk_esigi: Göreli boşluk bu değerin altına inince dur (0: kapalı)
+        durgunluk_saniye: En iyi çözüm bu kadar süre iyileşmezse dur (0: kapalı, varsayılan: SolverConfig)
+
+    Returns:
+        Ay sırasına göre AySonucu listesi; adalet devri onarımı başarısız olan ay
+        sonuçsuz (durum "HATA") döner ve kaydedilmez
+    """
+    aylar = sorted(set(aylar or range(1, 13)))
+    ayarlar = ayarlar or ayarlari_yukle_veya_varsayilan()
+    cpu = os.cpu_count() or 1
+    isci_sayisi = isci_sayisi or min(len(aylar), cpu)
+    # Process'ler arasında çekirdekleri paylaştır
+    thread_sayisi = max(1, cpu // isci_sayisi)
+
+    planlar = {ay: aylik_plani_yukle_veya_yeni(yil, ay) for ay in aylar}
+
+    # Toplu çözüme girmeyen, yılın kayıtlı ayları (adalet devri kaynağı)
+    sabit = {ay: aylik_plani_yukle(yil, ay) for ay in range(1, aylar[-1]) if ay not in aylar}
+    sabit = {ay: p for ay, p in sabit.items() if p is not None and p.sonuc}
+
+    def devir_hesapla(ay: int, cozulmus: Dict[int, AylikPlan]):
+        """ay'dan önceki sabit ve çözülmüş ayların toplam adalet devri"""
+        onceki = {**sabit, **cozulmus}
+        return adalet_devri_hesapla(onceki[a] for a in sorted(onceki) if a < ay)
+
+    def girdi(ay: int, onceki_plan: Optional[AylikPlan], devir) -> SolverInput:
+        si = solver_input_olustur(ayarlar, planlar[ay], onceki_plan=onceki_plan, adalet_devri=devir)
+        si.config = replace(si.config, thread_sayisi=thread_sayisi, bosluk_esigi=bosluk_esigi)
+        if uyarlanir_sure is not None:
+            si.config = replace(si.config, uyarlanir_sure=uyarlanir_sure)
+        if durgunluk_saniye is not None:
+            si.config = replace(si.config, durgunluk_saniye=durgunluk_saniye)
+        if max_sure_saniye is not None:
+            si.config = replace(si.config, max_sure_saniye=max_sure_saniye)
+            if si.config.uyarlanir_sure:
+                si.config = replace(si.config, uyarlanir_ust_sure_saniye=max_sure_saniye)
+        return si
+
+    # 1) Paralel tur: önceki ay toplu çözümdeyse sınır verisi henüz bilinmiyor
+    girdiler = []
+    for ay in aylar:
+        onceki_yil, onceki_ay = _onceki_ay(yil, ay)
+        onceki_plan = None if onceki_ay in aylar and onceki_yil == yil else aylik_plani_yukle(onceki_yil, onceki_ay)
+        girdiler.append(girdi(ay, onceki_plan, devir_hesapla(ay, {})))
+
+    with ProcessPoolExecutor(max_workers=isci_sayisi) as havuz:
+        sonuclar = {s.ay: s for s in havuz.map(_ay_coz, girdiler)}
+
+    # 2) Sıralı tur: ilk aydan sonraki her ay, önceki ayın kesin sonucu ve o ana
+    # kadar çözülen ayların adalet devriyle onarılır (yalnızca adalet günleri serbest)
+    cozulmus: Dict[int, AylikPlan] = {}
+    for i, ay in enumerate(aylar):
+        ay_sonucu = sonuclar[ay]
+        if i > 0:
+            onceki_yil, onceki_ay = _onceki_ay(yil, ay)
+            if onceki_ay in aylar:
+                onceki = sonuclar[onceki_ay]
+                onceki_plan = AylikPlan(yil=onceki_yil, ay=onceki_ay, sonuc=onceki.sonuc) if onceki.basarili else None
+            else:
+                onceki_plan = aylik_plani_yukle(onceki_yil, onceki_ay)
+            cakisma = bool(
+                ayarlar.ardisik_yasak and ay_sonucu.basarili and onceki_plan is not None and onceki_plan.sonuc
+                and _sinir_cakisiyor(onceki_plan.sonuc, ay_gun_sayisi(onceki_yil, onceki_ay), ay_sonucu.sonuc)
+            )
+            if ay_sonucu.basarili:
+                baslangic = time.perf_counter()
+                try:
+                    ay_sonucu.sonuc = _devirle_onar(
+                        girdi(ay, onceki_plan, devir_hesapla(ay, cozulmus)), ay_sonucu, planlar[ay], cpu
+                    )
+                    ay_sonucu.sinir_onarimi = cakisma
+                except Exception as e:
+                    ay_sonucu.sonuc = None
+                    ay_sonucu.durum = "HATA"
+                    ay_sonucu.hata = f"Adalet devriyle onarılamadı: {e}"
+                ay_sonucu.sure_saniye += time.perf_counter() - baslangic
+
+        if ay_sonucu.basarili:
+            plan = planlar[ay]
+            plan.sonuc = {str(k): v for k, v in ay_sonucu.sonuc.items()}
+            plan.sonuc_alanlı = any(a.aktif for a in ayarlar.alanlar)
+            cozulmus[ay] = plan
+            if kaydet:
+                plan.olusturma_tarihi = None
+                aylik_plani_kaydet(plan, aciklama="toplu çözüm")
+
+    return [sonuclar[ay] for ay in aylar]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Bir yılın nöbet planlarını paralel çözer.")
+    parser.add_argument("yil", type=int, help="Yıl (ör. 2026)")
+    parser.add_argument("--aylar", default="1-12", help="Çözülecek aylar, ör. '1-6, 9' (varsayılan: 1-12)")
+    parser.add_argument("--isci", type=int, default=None, help="Process sayısı (varsayılan: CPU sayısı)")
+    parser.add_argument("--sure", type=float, default=None, help="Ay başına süre sınırı (saniye)")
+    parser.add_argument("--kaydetme", action="store_true", help="Sonuçları diske yazma")
+    parser.add_argument("--uyarlanir", action=argparse.BooleanOptionalAction,
+                        default=ARAC_SURE_POLITIKASI["uyarlanir_sure"],
+                        help="Ay başına süreyi model boyutundan tahmin et (--sure üst sınır olur)")
+    parser.add_argument("--bosluk", type=float, default=0.0, help="Göreli boşluk eşiğinde dur, ör. 0.01")
+    parser.add_argument("--durgunluk", type=float, default=ARAC_SURE_POLITIKASI["durgunluk_saniye"],
+                        help="En iyi çözüm bu kadar saniye iyileşmezse dur (0: kapalı)")
+    args = parser.parse_args(argv)
+
+    aylar = sorted(gun_parse(args.aylar, 12))
+    try:
+        ayarlar = ayarlari_yukle_veya_varsayilan()
+    except Exception as e:
+        print(f"Kayıtlı ayarlar okunamadı: {e}")
+        return 2
+    baslangic = time.perf_counter()
+    sonuclar = yili_coz(
+        args.yil, aylar,
+        ayarlar=ayarlar,
+        isci_sayisi=args.isci,
+        max_sure_saniye=args.sure,
+        kaydet=not args.kaydetme,
+        uyarlanir_sure=args.uyarlanir,
+        bosluk_esigi=args.bosluk,
+        durgunluk_saniye=args.durgunluk
+    )
+    for s in sonuclar:
+        if s.basarili:
+            onarim = " (ay sınırı onarıldı)" if s.sinir_onarimi else ""
+            print(f"{s.yil}-{s.ay:02d}: {s.durum} ({s.durma_nedeni}) | amaç {s.amac_degeri:,.0f} | "
+                  f"{s.sure_saniye:.1f} sn{onarim}")
+        else:
+            print(f"{s.yil}-{s.ay:02d}: ÇÖZÜLEMEDİ | {s.hata}")
+    print(f"Toplam: {time.perf_counter() - baslangic:.1f} sn")
+    return 0 if all(s.basarili for s in sonuclar) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())